@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'ordonnancement des requêtes SonarQube : latence p95 des appels
+interactifs sans charge de fond, puis avec des tâches de fond (préchargement,
+sondage) qui envoient des requêtes en continu.
+
+Le serveur SonarQube est simulé : latence fixe et capacité bornée (nombre de
+requêtes traitées simultanément). Sans priorité, toutes les requêtes partagent
+les mêmes places ; avec PriorityScheduler, le fond ne prend que la capacité
+inoccupée.
+
+Usage: python scripts/benchmark_priority_scheduling.py [--requests N] [--latency S]
+"""
+
+import sys
+import time
+import argparse
+import threading
+from collections import deque
+from pathlib import Path
+from unittest.mock import Mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.api.base import SonarQubeAPIBase  # noqa: E402
+from src.api.scheduler import PriorityScheduler, priority_scope, INTERACTIVE, BACKGROUND  # noqa: E402
+from src.config import SonarQubeConfig  # noqa: E402
+
+
+class SimulatedSonarQube:
+    """Session factice : latence fixe, capacity requêtes traitées à la fois, les autres en file (FIFO)."""
+
+    def __init__(self, latency: float, capacity: int):
+        self.latency = latency
+        self._free = capacity
+        self._waiters = deque()
+        self._lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        with self._lock:
+            if self._free and not self._waiters:
+                self._free -= 1
+                turn = None
+            else:
+                turn = threading.Event()
+                self._waiters.append(turn)
+        if turn is not None:
+            turn.wait()
+        time.sleep(self.latency)
+        with self._lock:
+            if self._waiters:
+                self._waiters.popleft().set()
+            else:
+                self._free += 1
+        response = Mock()
+        response.json.return_value = {'component': {}}
+        return response
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[max(-(-len(values) * p // 100) - 1, 0)]
+
+
+def measure(scheduler: PriorityScheduler, latency: float, capacity: int, requests: int,
+            clients: int, background_threads: int, background_priority: str = BACKGROUND):
+    """
+    Latences (secondes) des requêtes interactives de clients threads, avec
+    background_threads tâches de fond en boucle pendant la mesure.
+    """
+    config = SonarQubeConfig(url="https://sonar.example.com", token="t", negative_cache_ttl=0)
+    api = SonarQubeAPIBase(config, scheduler=scheduler)
+    api._session = SimulatedSonarQube(latency, capacity)
+    stop = threading.Event()
+    latencies = []
+    lock = threading.Lock()
+
+    def background():
+        with priority_scope(background_priority):
+            while not stop.is_set():
+                api._get('/api/project_analyses/search', {'project': 'P', 'ps': 1})
+
+    def interactive():
+        for _ in range(requests // clients):
+            start = time.perf_counter()
+            api._get('/api/measures/component', {'component': 'P'})
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    workers = [threading.Thread(target=background, daemon=True) for _ in range(background_threads)]
+    for thread in workers:
+        thread.start()
+    time.sleep(latency * 2)
+    callers = [threading.Thread(target=interactive) for _ in range(clients)]
+    for thread in callers:
+        thread.start()
+    for thread in callers:
+        thread.join()
+    stop.set()
+    for thread in workers:
+        thread.join()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de l'ordonnancement interactif / fond")
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.01)
+    parser.add_argument('--capacity', type=int, default=4, help="Requêtes traitées simultanément par SonarQube")
+    parser.add_argument('--clients', type=int, default=2)
+    parser.add_argument('--background', type=int, default=8, help="Tâches de fond en boucle")
+    args = parser.parse_args()
+
+    # Sans priorité : le fond passe par les mêmes places que les appels interactifs
+    unbounded = args.capacity + args.background
+    scenarios = [
+        ("sans charge de fond", PriorityScheduler(args.capacity, 2), 0, BACKGROUND),
+        ("fond, sans priorité", PriorityScheduler(unbounded, 2), args.background, INTERACTIVE),
+        ("fond, avec priorité", PriorityScheduler(args.capacity, 2), args.background, BACKGROUND),
+    ]
+    print(f"{args.requests} requêtes interactives ({args.clients} clients), latence {args.latency * 1000:.0f} ms, "
+          f"capacité SonarQube {args.capacity}")
+    for label, scheduler, background, priority in scenarios:
+        latencies = measure(scheduler, args.latency, args.capacity, args.requests, args.clients,
+                            background, priority)
+        print(f"  {label:<22} p50 {percentile(latencies, 50) * 1000:6.1f} ms   "
+              f"p95 {percentile(latencies, 95) * 1000:6.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark du format de sortie des résultats sur une page de 500 issues.
+
+Compare le format actuel (to_json indenté puis enveloppe JSON-RPC ASCII)
+au format compact (colonnes, tables partagées, sans valeurs nulles).
+
+Usage: python scripts/benchmark_result_format.py [--issues N] [--iterations N]
+"""
+
+import sys
+import json
+import timeit
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.commands.base import CommandResult  # noqa: E402
+from src.models import Issue  # noqa: E402
+
+
+def make_page(count: int) -> CommandResult:
+    """Page d'issues représentative : peu de fichiers et de règles, messages en français."""
+    issues = [
+        Issue.from_api_response({
+            'key': f'AYx{i:06d}', 'rule': f'dart:S{100 + i % 12}', 'severity': ['MAJOR', 'MINOR', 'CRITICAL'][i % 3],
+            'component': f'mon-projet:lib/src/feature_{i % 40}/écran_détail.dart', 'project': 'mon-projet',
+            'line': 10 + i, 'message': 'Définir une constante au lieu de dupliquer ce littéral « défaut » 3 fois.',
+            'type': 'CODE_SMELL', 'status': 'OPEN', 'effort': '10min', 'debt': '10min', 'tags': [],
+            'textRange': {'startLine': 10 + i, 'endLine': 10 + i, 'startOffset': 4, 'endOffset': 21},
+            'creationDate': '2025-10-01T10:00:00+0200', 'updateDate': '2025-10-02T10:00:00+0200',
+        })
+        for i in range(count)
+    ]
+    return CommandResult(
+        success=True,
+        data={'total': count, 'p': 1, 'ps': count, 'issues': issues},
+        metadata={'total': count, 'project': 'mon-projet', 'filter': 'all'}
+    )
+
+
+def current_output(result: CommandResult) -> bytes:
+    text = result.to_json()
+    return json.dumps({'result': {'content': [{'type': 'text', 'text': text}]}}, ensure_ascii=True).encode('utf-8')
+
+
+def compact_output(result: CommandResult) -> bytes:
+    text = result.to_json(compact=True)
+    return json.dumps({'result': {'content': [{'type': 'text', 'text': text}]}}, ensure_ascii=False).encode('utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du format de sortie")
+    parser.add_argument('--issues', type=int, default=500)
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+
+    result = make_page(args.issues)
+    print(f"Page de {args.issues} issues, {args.iterations} itérations")
+    baseline = None
+    for name, fn in (('actuel', current_output), ('compact', compact_output)):
+        size = len(fn(result))
+        best = min(timeit.repeat(lambda: fn(result), number=args.iterations, repeat=3)) / args.iterations
+        baseline = baseline or size
+        print(f"  {name:<8} {size:>9} octets ({size / baseline:6.1%})  {best * 1000:8.2f} ms/encodage")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark du démarrage du serveur MCP (stdio).
+
+- Temps d'import par module (`python -X importtime`), modules les plus coûteux
+- Chargement du registre des outils : YAML compilé, puis artefact en cache
+- Temps jusqu'à la première réponse à initialize, puis à tools/list, mesuré sur
+  un processus sonarqube_mcp_server.py réel ; comparé au budget de démarrage
+
+Usage: python scripts/benchmark_startup.py [--runs N] [--top N] [--budget-ms MS]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Budget de temps jusqu'à la réponse à initialize (démarrage de l'interpréteur inclus)
+STARTUP_BUDGET_MS = 250
+
+# Modules qui ne doivent pas être chargés avant le premier appel d'outil
+DEFERRED_MODULES = ('requests', 'urllib3', 'yaml', 'http.server')
+
+
+def server_env(log_dir: str) -> dict:
+    env = dict(os.environ)
+    env.update({
+        'SONARQUBE_URL': 'http://127.0.0.1:9',
+        'SONARQUBE_TOKEN': 'benchmark',
+        'SONARQUBE_LOG_DIR': log_dir,
+        'SONARQUBE_LOG_LEVEL': 'WARNING',
+    })
+    return env
+
+
+def import_times(env: dict) -> list:
+    """Retourne [(module, propre µs, cumulé µs)] pour l'import du serveur."""
+    code = "import sonarqube_mcp_server, src.mcp.server"
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        rows.append((name.strip(), int(own), int(cumulative)))
+    return rows
+
+
+def registry_load_times(env: dict, cache_dir: str) -> tuple:
+    """Mesure (ms) le chargement du registre sans artefact (YAML), puis avec l'artefact compilé."""
+    code = (
+        "import time\n"
+        "from src.mcp.tools_registry import MCPToolsRegistry\n"
+        "start = time.perf_counter()\n"
+        f"MCPToolsRegistry(cache_file={str(Path(cache_dir) / 'tools.json')!r})\n"
+        "print((time.perf_counter() - start) * 1000)\n"
+    )
+    return tuple(
+        float(subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=env,
+                             capture_output=True, text=True, check=True).stdout)
+        for _ in range(2)
+    )
+
+
+def time_to_responses(env: dict) -> tuple:
+    """Lance le serveur, mesure (ms) jusqu'aux réponses à initialize puis tools/list."""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, 'sonarqube_mcp_server.py'], cwd=ROOT, env=env,
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    try:
+        process.stdin.write(b'{"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}}\n')
+        process.stdin.flush()
+        assert json.loads(process.stdout.readline())['id'] == 1
+        initialized = time.perf_counter()
+        process.stdin.write(b'{"jsonrpc": "2.0", "id": 2, "method": "tools/list"}\n')
+        process.stdin.flush()
+        assert json.loads(process.stdout.readline())['id'] == 2
+        listed = time.perf_counter()
+    finally:
+        process.stdin.close()
+        process.wait(10)
+    return (initialized - start) * 1000, (listed - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du démarrage du serveur MCP")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--budget-ms', type=float, default=STARTUP_BUDGET_MS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        env = server_env(log_dir)
+
+        rows = import_times(env)
+        loaded = {name for name, _, _ in rows}
+        print(f"Imports du serveur : {len(rows)} modules")
+        print(f"  {'module':<45} {'propre':>9} {'cumulé':>9}")
+        for name, own, cumulative in sorted(rows, key=lambda r: r[2], reverse=True)[:args.top]:
+            print(f"  {name:<45} {own / 1000:7.1f}ms {cumulative / 1000:7.1f}ms")
+        eager = [m for m in DEFERRED_MODULES if m in loaded]
+        print(f"  Modules différés chargés à l'import : {', '.join(eager) or 'aucun'}")
+
+        yaml_ms, cached_ms = registry_load_times(env, log_dir)
+        print(f"Registre des outils : YAML {yaml_ms:.1f} ms, artefact compilé {cached_ms:.1f} ms")
+
+        samples = [time_to_responses(env) for _ in range(args.runs)]
+        initialize_ms = statistics.median(s[0] for s in samples)
+        tools_list_ms = statistics.median(s[1] for s in samples)
+
+    print(f"Démarrage ({args.runs} lancements, médiane)")
+    print(f"  réponse initialize : {initialize_ms:7.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"  réponse tools/list : {tools_list_ms:7.1f} ms")
+    if initialize_ms > args.budget_ms or eager:
+        print("  Budget de démarrage dépassé")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark du transport stdio : rejeu de 10 000 messages à travers des pipes.
+
+Compare l'ancienne boucle (lecture `for line in stdin` texte, écriture `print()`
+puis `flush()`) au découpage binaire (MessageReader / MessageWriter). Chaque
+message est décodé puis une réponse est réencodée, comme dans le serveur.
+
+Usage: python scripts/benchmark_stdio_framing.py [--messages N] [--large-every N]
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.mcp.framing import MessageReader, MessageWriter  # noqa: E402
+
+
+def make_messages(count: int, large_every: int) -> bytes:
+    """Requêtes tools/call, avec un message de 2 Mo toutes les large_every requêtes."""
+    lines = []
+    for i in range(count):
+        arguments = {'project_key': 'mon-projet', 'file_key': f'lib/src/écran_{i}.dart'}
+        if large_every and i % large_every == 0:
+            arguments['content'] = 'é' * (1024 * 1024)
+        request = {'jsonrpc': '2.0', 'id': i, 'method': 'tools/call',
+                   'params': {'name': 'sonarqube_source_lines', 'arguments': arguments}}
+        lines.append(json.dumps(request, ensure_ascii=False))
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def response_for(request):
+    return {'jsonrpc': '2.0', 'id': request['id'],
+            'result': {'content': [{'type': 'text', 'text': 'Qualité « OK » ' * 20}]}}
+
+
+def text_loop(stdin, stdout):
+    """Ancienne boucle : couche texte, print() + flush() par message."""
+    for line in stdin:
+        request = json.loads(line)
+        print(json.dumps(response_for(request), ensure_ascii=True), file=stdout)
+        stdout.flush()
+
+
+def binary_loop(stdin, stdout, ensure_ascii=False):
+    """Nouvelle boucle : octets UTF-8, une écriture par message."""
+    reader, writer = MessageReader(stdin), MessageWriter(stdout)
+    for line in reader:
+        request = json.loads(line.decode('utf-8'))
+        writer.write(json.dumps(response_for(request), ensure_ascii=ensure_ascii))
+
+
+def replay(payload: bytes, mode: str):
+    """Rejoue payload à travers deux pipes ; retourne (durée, octets écrits)."""
+    in_r, in_w = os.pipe()
+    out_r, out_w = os.pipe()
+    received = []
+
+    def feed():
+        with os.fdopen(in_w, 'wb') as f:
+            f.write(payload)
+
+    def drain():
+        with os.fdopen(out_r, 'rb') as f:
+            received.append(len(f.read()))
+
+    threads = [threading.Thread(target=feed), threading.Thread(target=drain)]
+    for thread in threads:
+        thread.start()
+
+    start = time.perf_counter()
+    stdin = os.fdopen(in_r, 'rb')
+    stdout = os.fdopen(out_w, 'wb')
+    if mode == 'texte':
+        text_loop(io.TextIOWrapper(stdin, encoding='utf-8'), io.TextIOWrapper(stdout, encoding='utf-8'))
+    else:
+        binary_loop(stdin, stdout, ensure_ascii=mode == 'binaire-ascii')
+    stdout.close()
+    elapsed = time.perf_counter() - start
+    for thread in threads:
+        thread.join()
+    return elapsed, received[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du transport stdio")
+    parser.add_argument('--messages', type=int, default=10000)
+    parser.add_argument('--large-every', type=int, default=0,
+                        help="Insérer un message de 2 Mo toutes les N requêtes (0 = aucun)")
+    args = parser.parse_args()
+
+    payload = make_messages(args.messages, args.large_every)
+    print(f"Rejeu de {args.messages} messages ({len(payload) / 1024:.0f} Ko en entrée)")
+    # binaire-ascii : même JSON que l'ancienne boucle, seul le découpage change
+    for mode in ('texte', 'binaire-ascii', 'binaire'):
+        elapsed, written = min(replay(payload, mode) for _ in range(3))
+        per_message = elapsed / args.messages * 1e6
+        print(f"  {mode:<14} {elapsed * 1000:8.1f} ms  {per_message:6.1f} µs/message  {written / 1024:8.0f} Ko écrits")
+
+
+if __name__ == '__main__':
+    main()
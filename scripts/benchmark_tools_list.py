@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark de la réponse tools/list.
+
+Compare la construction à chaque requête (schémas reconstruits depuis le YAML
+puis sérialisés) à la réponse pré-encodée par le registre.
+
+Usage: python scripts/benchmark_tools_list.py [--iterations N]
+"""
+
+import sys
+import json
+import timeit
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.mcp.server import MCPServer  # noqa: E402
+from src.mcp.tools_registry import MCPToolsRegistry  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark de tools/list")
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    registry = MCPToolsRegistry()
+    request = {'jsonrpc': '2.0', 'id': 1, 'method': 'tools/list'}
+
+    def rebuilt():
+        tools = [registry._build_tool_schema(desc) for desc in registry.descriptions.values()]
+        return json.dumps({'result': {'tools': tools}, 'id': 1, 'jsonrpc': '2.0'}, ensure_ascii=True)
+
+    def pre_encoded():
+        return MCPServer._encode_result(request, registry.get_tools_list_json())
+
+    assert json.loads(rebuilt()) == json.loads(pre_encoded())
+
+    print(f"tools/list : {len(registry.get_tool_names())} outils, "
+          f"{len(pre_encoded())} octets, {args.iterations} itérations")
+    for name, fn in (('reconstruit', rebuilt), ('pré-encodé', pre_encoded)):
+        best = min(timeit.repeat(fn, number=args.iterations, repeat=5)) / args.iterations
+        print(f"  {name:<12} {best * 1e6:10.2f} µs/requête")
+
+
+if __name__ == '__main__':
+    main()
@@ -17,8 +17,6 @@ if sys.platform == 'win32' and hasattr(sys.stdout, 'buffer') and sys.stdout.isat
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
 from src.config import SonarQubeConfig
-from src.api import SonarQubeAPI
-from src.commands import CommandHandler
 
 
 # Configuration du logging
@@ -168,7 +166,19 @@ def main():
         # Initialiser la configuration
         config = SonarQubeConfig.from_env(config_file=args.config)
         
+        # Démon partagé : connexions et caches conservés entre les invocations
+        if config.daemon_enabled:
+            from src.mcp.daemon import run_cli, DaemonUnavailableError
+            try:
+                success, output = run_cli(config, args.command, args.args, args.config)
+                print(output)
+                return 0 if success else 1
+            except DaemonUnavailableError as e:
+                logging.getLogger(__name__).warning(f"Démon partagé indisponible, exécution locale: {e}")
+        
         # Initialiser l'API et le gestionnaire de commandes
+        from src.api import SonarQubeAPI
+        from src.commands import CommandHandler
         api = SonarQubeAPI(config)
         handler = CommandHandler(api, config)
         
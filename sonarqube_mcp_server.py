@@ -14,7 +14,6 @@ from pathlib import Path
 from datetime import datetime
 
 from src.config import SonarQubeConfig
-from src.mcp import MCPServer
 
 
 class TokenSanitizingFilter(logging.Filter):
@@ -66,7 +65,8 @@ def setup_logging():
         level=getattr(logging, log_level, logging.INFO),
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         handlers=[
-            logging.FileHandler(log_file),
+            # Fichier ouvert au premier message écrit
+            logging.FileHandler(log_file, delay=True),
             logging.StreamHandler(sys.stderr)
         ]
     )
@@ -80,24 +80,73 @@ def apply_token_filter():
         handler.addFilter(token_filter)
 
 
-# Configuration du logging
-log_file_path = setup_logging()
-apply_token_filter()
 logger = logging.getLogger(__name__)
-logger.info(f"Logs écrits dans: {log_file_path}")
+
+
+def run_daemon(argv):
+    """Lance le démon partagé (démarré par les shims, voir src/mcp/daemon.py)."""
+    import argparse
+    from src.mcp.daemon import SharedDaemon
+    
+    parser = argparse.ArgumentParser(description="Démon SonarQube MCP partagé")
+    parser.add_argument('--daemon', action='store_true')
+    parser.add_argument('--socket', required=True)
+    parser.add_argument('--idle-timeout', type=float, default=1800)
+    args = parser.parse_args(argv)
+    
+    daemon = SharedDaemon(args.socket, args.idle_timeout)
+    if not daemon.bind():
+        logger.info(f"Démon déjà actif sur {args.socket}")
+        return
+    daemon.serve_forever()
 
 
 def main():
-    """Point d'entrée principal du serveur MCP."""
+    """
+    Point d'entrée principal du serveur MCP.
+    
+    Le logging est configuré ici et non à l'import du module : importer ce
+    fichier (tests, outils) ne crée ni dossier ni fichier de logs. Les modules
+    lourds (requests, PyYAML, transport HTTP) ne sont chargés qu'au premier usage.
+    
+    Avec SONARQUBE_DAEMON=true, le processus relaie stdin/stdout vers le démon
+    partagé (démarré si besoin) au lieu de créer son propre serveur.
+    """
+    # Configuration du logging
+    log_file_path = setup_logging()
+    apply_token_filter()
+    logger.info(f"Logs écrits dans: {log_file_path}")
+    
+    if '--daemon' in sys.argv[1:]:
+        try:
+            run_daemon(sys.argv[1:])
+        except Exception as e:
+            logger.error(f"Impossible de démarrer le démon: {e}", exc_info=True)
+            sys.exit(1)
+        return
+    
     try:
         logger.info("Démarrage du serveur MCP SonarQube v4.0.0")
         
         # Charger la configuration
         config = SonarQubeConfig.from_env()
         
+        if config.daemon_enabled and config.transport == 'stdio':
+            from src.mcp.daemon import relay_stdio, DaemonUnavailableError
+            try:
+                relay_stdio(config)
+                return
+            except DaemonUnavailableError as e:
+                logger.warning(f"Démon partagé indisponible, serveur local: {e}")
+        
         # Créer et lancer le serveur
+        from src.mcp.server import MCPServer
         server = MCPServer(config)
-        server.run()
+        if config.transport == 'http':
+            from src.mcp.http_transport import MCPHTTPTransport
+            MCPHTTPTransport(server, config.http_host, config.http_port).serve_forever()
+        else:
+            server.run()
     
     except Exception as e:
         logger.error(f"Impossible de démarrer le serveur: {e}", exc_info=True)
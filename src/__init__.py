@@ -8,9 +8,21 @@ dans les IDEs alimentés par l'IA.
 __version__ = "4.0.0"
 __author__ = "SonarQube MCP Contributors"
 
-from .config import SonarQubeConfig
-from .api import SonarQubeAPI
-from .commands import CommandHandler
+import importlib
+
+# Imports différés : `import src.config` ne charge pas l'API (requests) ni les commandes
+_EXPORTS = {
+    "SonarQubeConfig": ".config",
+    "SonarQubeAPI": ".api",
+    "CommandHandler": ".commands",
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "SonarQubeConfig",
@@ -1,6 +1,13 @@
 """API SonarQube - Point d'entrée unifié."""
 
 from .base import SonarQubeAPIBase, SonarQubeAPIError
+from .cache import AnalysisTracker, NegativeCache, SourceLinesCache
+from .disk_cache import DiskCache, create_disk_cache
+from .metrics import RequestMetrics
+from .scheduler import PriorityScheduler, priority_scope, INTERACTIVE, BACKGROUND
+from .progress import (
+    ProgressReporter, progress_scope, CancellationToken, RequestCancelledError, cancellation_scope
+)
 from .issues import IssuesAPI
 from .measures import MeasuresAPI
 from .security import SecurityAPI
@@ -9,6 +16,7 @@ from .users import UsersAPI
 from .rules import RulesAPI
 
 from ..config import SonarQubeConfig
+from ..utils import lazy_property
 from typing import Optional, List, Dict, Any
 from ..models import IssueType, Severity, HotspotStatus
 
@@ -27,16 +35,47 @@ class SonarQubeAPI:
         >>> measures = api.measures.get_component('X')
         >>> # Ancienne API (compatibilité)
         >>> issues = api.search_issues(project_keys=['X'])
+    
+    Les clients par domaine (et leur session HTTP) sont créés au premier usage.
     """
     
     def __init__(self, config: SonarQubeConfig):
         self.config = config
-        self.issues = IssuesAPI(config)
-        self.measures = MeasuresAPI(config)
-        self.security = SecurityAPI(config)
-        self.projects = ProjectsAPI(config)
-        self.users = UsersAPI(config)
-        self.rules = RulesAPI(config)
+        self.analysis_tracker = AnalysisTracker(config.analysis_check_interval)
+        self.negative_cache = NegativeCache(config.negative_cache_ttl)
+        self.analysis_tracker.add_listener(self.negative_cache.invalidate_project)
+        self.disk_cache = create_disk_cache(config)
+        self.request_metrics = RequestMetrics()
+        self.scheduler = PriorityScheduler(config.interactive_concurrency, config.background_concurrency)
+    
+    def _client(self, api_class: type):
+        """Crée un client de domaine partageant les caches, les métriques et l'ordonnanceur."""
+        return api_class(self.config, self.analysis_tracker, self.negative_cache, self.disk_cache,
+                         self.request_metrics, self.scheduler)
+    
+    @lazy_property
+    def issues(self) -> IssuesAPI:
+        return self._client(IssuesAPI)
+    
+    @lazy_property
+    def measures(self) -> MeasuresAPI:
+        return self._client(MeasuresAPI)
+    
+    @lazy_property
+    def security(self) -> SecurityAPI:
+        return self._client(SecurityAPI)
+    
+    @lazy_property
+    def projects(self) -> ProjectsAPI:
+        return self._client(ProjectsAPI)
+    
+    @lazy_property
+    def users(self) -> UsersAPI:
+        return self._client(UsersAPI)
+    
+    @lazy_property
+    def rules(self) -> RulesAPI:
+        return self._client(RulesAPI)
     
     # Méthodes de compatibilité (déléguent aux nouveaux modules)
     
@@ -92,6 +131,20 @@ class SonarQubeAPI:
 __all__ = [
     'SonarQubeAPI',
     'SonarQubeAPIError',
+    'AnalysisTracker',
+    'NegativeCache',
+    'DiskCache',
+    'RequestMetrics',
+    'PriorityScheduler',
+    'priority_scope',
+    'INTERACTIVE',
+    'BACKGROUND',
+    'SourceLinesCache',
+    'ProgressReporter',
+    'progress_scope',
+    'CancellationToken',
+    'RequestCancelledError',
+    'cancellation_scope',
     'IssuesAPI',
     'MeasuresAPI',
     'SecurityAPI',
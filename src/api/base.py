@@ -1,12 +1,19 @@
 """Classe de base pour l'API SonarQube."""
 
-import requests
+import time
 import logging
-from typing import Dict, Any, Optional
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import threading
+from typing import Dict, Any, Optional, TYPE_CHECKING
 
 from ..config import SonarQubeConfig
+from .cache import AnalysisTracker, NegativeCache
+from .disk_cache import DiskCache, create_disk_cache, make_cache_key
+from .progress import current_reporter, extract_paging, check_cancelled
+from .metrics import RequestMetrics
+from .scheduler import PriorityScheduler, current_priority
+
+if TYPE_CHECKING:
+    import requests
 
 
 logger = logging.getLogger(__name__)
@@ -25,24 +32,80 @@ class SonarQubeAPIError(Exception):
 class SonarQubeAPIBase:
     """Classe de base pour tous les clients API."""
     
-    def __init__(self, config: SonarQubeConfig):
+    # Endpoints GET soumis au cache négatif : endpoint -> (paramètre identifiant,
+    # liste dont l'absence d'éléments signifie "introuvable" ou None)
+    NEGATIVE_CACHE_ENDPOINTS = {
+        '/api/sources/lines': ('key', 'sources'),
+        '/api/rules/show': ('key', None),
+        '/api/duplications/show': ('key', None),
+        '/api/components/search_projects': ('q', 'components'),
+        '/api/users/search': ('q', 'users'),
+        '/api/qualitygates/project_status': ('projectKey', None),
+        '/api/project_analyses/search': ('project', None),
+        '/api/measures/component': ('component', None),
+    }
+    
+    # Endpoints GET dont les réponses volumineuses sont conservées sur disque :
+    # endpoint -> paramètre désignant le projet/composant (pour la clé d'analyse).
+    # Pas /api/issues/search : transitions, assignations et commentaires changent
+    # les issues sans nouvelle analyse
+    DISK_CACHE_ENDPOINTS = {
+        '/api/sources/lines': 'key',
+        '/api/components/tree': 'component',
+    }
+    
+    # Nombre maximal d'éléments accessibles par pagination (limite des recherches SonarQube)
+    MAX_PAGINATED_ITEMS = 10000
+    
+    def __init__(self, config: SonarQubeConfig, analysis_tracker: Optional[AnalysisTracker] = None,
+                 negative_cache: Optional[NegativeCache] = None, disk_cache: Optional[DiskCache] = None,
+                 request_metrics: Optional[RequestMetrics] = None,
+                 scheduler: Optional[PriorityScheduler] = None):
         """
         Initialise le client API.
         
         Args:
             config: Configuration SonarQube
+            analysis_tracker: Suivi des analyses partagé entre clients (optionnel)
+            negative_cache: Cache des réponses "introuvable" partagé entre clients (optionnel)
+            disk_cache: Cache disque partagé entre clients (optionnel, créé selon la config sinon)
+            request_metrics: Latences et erreurs par endpoint partagées entre clients (optionnel)
+            scheduler: Places de requêtes par classe partagées entre clients (optionnel)
         """
         self.config = config
-        self.session = self._create_session()
+        self.analysis_tracker = analysis_tracker or AnalysisTracker(config.analysis_check_interval)
+        if negative_cache is None:
+            negative_cache = NegativeCache(config.negative_cache_ttl)
+            self.analysis_tracker.add_listener(negative_cache.invalidate_project)
+        self.negative_cache = negative_cache
+        self.disk_cache = disk_cache if disk_cache is not None else create_disk_cache(config)
+        self.request_metrics = request_metrics or RequestMetrics()
+        self.scheduler = scheduler or PriorityScheduler(config.interactive_concurrency,
+                                                        config.background_concurrency)
+        self._session: Optional['requests.Session'] = None
+        self._session_lock = threading.Lock()
         self.logger = logging.getLogger(self.__class__.__name__)
     
-    def _create_session(self) -> requests.Session:
+    @property
+    def session(self) -> 'requests.Session':
+        """Session HTTP, créée au premier appel (requests n'est importé qu'à ce moment)."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+    
+    def _create_session(self) -> 'requests.Session':
         """
         Crée une session HTTP avec retry logic et authentification.
         
         Returns:
             Session requests configurée
         """
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
         session = requests.Session()
         
         # Configuration de l'authentification (token comme username, password vide)
@@ -55,7 +118,8 @@ class SonarQubeAPIBase:
             status_forcelist=[429, 500, 502, 503, 504],
             allowed_methods=["GET", "POST", "PUT", "DELETE"]
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Pool dimensionné pour les appels d'outils concurrents (transport HTTP multi-clients)
+        adapter = HTTPAdapter(max_retries=retry_strategy, pool_maxsize=max(10, self.config.tool_workers))
         session.mount("http://", adapter)
         session.mount("https://", adapter)
         
@@ -77,41 +141,205 @@ class SonarQubeAPIBase:
         
         Raises:
             SonarQubeAPIError: En cas d'erreur HTTP
+            RequestCancelledError: Si l'appel du thread courant a été annulé
         """
+        import requests
+        
         url = f"{self.config.url}{endpoint}"
+        negative_key = self._negative_cache_key(method, endpoint, params)
         
-        try:
-            self.logger.debug(f"{method} {url} - params: {params}")
-            
-            response = self.session.request(
-                method=method,
-                url=url,
-                params=params,
-                json=json,
-                timeout=self.config.timeout,
-                verify=self.config.verify_ssl
-            )
-            
-            response.raise_for_status()
-            return response.json()
-            
-        except requests.exceptions.HTTPError as e:
-            self.logger.error(f"HTTP error: {e}")
-            raise SonarQubeAPIError(
-                status_code=e.response.status_code,
-                message=str(e),
-                response_text=e.response.text
-            )
-        except requests.exceptions.RequestException as e:
-            self.logger.error(f"Request error: {e}")
-            raise SonarQubeAPIError(
-                status_code=0,
-                message=f"Erreur de connexion: {str(e)}"
-            )
+        if negative_key:
+            cached = self.negative_cache.get(endpoint, negative_key)
+            if isinstance(cached, SonarQubeAPIError):
+                self.logger.debug(f"{method} {url} - introuvable (cache négatif)")
+                raise SonarQubeAPIError(cached.status_code, cached.message, cached.response_text)
+            if cached is not None:
+                return dict(cached)
+        
+        disk_key = self._disk_cache_key(method, endpoint, params)
+        if disk_key:
+            cached = self.disk_cache.get(disk_key)
+            if cached is not None:
+                self.logger.debug(f"{method} {url} - servi par le cache disque")
+                return cached
+        
+        # Appel annulé par le client : pages et requêtes restantes non envoyées
+        check_cancelled()
+        
+        # Place de la classe du thread (appel interactif ou travail de fond)
+        with self.scheduler.slot(current_priority()):
+            start = time.monotonic()
+            failed = True
+            try:
+                self.logger.debug(f"{method} {url} - params: {params}")
+                
+                response = self.session.request(
+                    method=method,
+                    url=url,
+                    params=params,
+                    json=json,
+                    timeout=self.config.timeout,
+                    verify=self.config.verify_ssl
+                )
+                
+                response.raise_for_status()
+                data = response.json()
+                failed = False
+                
+                if negative_key and self._is_empty_result(endpoint, data):
+                    self.negative_cache.put(endpoint, negative_key, data)
+                elif disk_key:
+                    self.disk_cache.put(disk_key, data)
+                return data
+                
+            except requests.exceptions.HTTPError as e:
+                self.logger.error(f"HTTP error: {e}")
+                error = SonarQubeAPIError(
+                    status_code=e.response.status_code,
+                    message=str(e),
+                    response_text=e.response.text
+                )
+                if negative_key and error.status_code == 404:
+                    self.negative_cache.put(endpoint, negative_key, error)
+                raise error
+            except requests.exceptions.RequestException as e:
+                self.logger.error(f"Request error: {e}")
+                raise SonarQubeAPIError(
+                    status_code=0,
+                    message=f"Erreur de connexion: {str(e)}"
+                )
+            finally:
+                self.request_metrics.record(endpoint, time.monotonic() - start, failed)
+    
+    def _negative_cache_key(self, method: str, endpoint: str, params: Optional[Dict]) -> Optional[str]:
+        """
+        Calcule l'identifiant de cache négatif d'une requête.
+        
+        Les autres paramètres (hors numéro de page) complètent l'identifiant : une
+        plage de lignes vide (from/to au-delà de la fin du fichier) ne masque pas
+        les autres plages du même fichier.
+        
+        Returns:
+            Identifiant (ex: clé de fichier, suivie de ?from=..&to=..) ou None si la
+            requête n'est pas éligible
+        """
+        if method != "GET" or not self.negative_cache.enabled or not params:
+            return None
+        spec = self.NEGATIVE_CACHE_ENDPOINTS.get(endpoint)
+        if spec is None or params.get('p', 1) != 1:
+            return None
+        identifier = params.get(spec[0])
+        if not identifier:
+            return None
+        extra = sorted(
+            f"{name}={value}" for name, value in params.items()
+            if name not in (spec[0], 'p') and value is not None
+        )
+        return f"{identifier}?{'&'.join(extra)}" if extra else str(identifier)
+    
+    def _disk_cache_key(self, method: str, endpoint: str, params: Optional[Dict]) -> Optional[str]:
+        """
+        Calcule la clé de cache disque d'une requête.
+        
+        La dernière analyse du projet (revérifiée au plus une fois par
+        analysis_check_interval secondes) fait partie de la clé : une nouvelle
+        analyse rend les anciennes entrées inaccessibles. Une requête dont le
+        projet ou la dernière analyse est inconnu n'est pas mise en cache.
+        L'empreinte du token fait aussi partie de la clé (dossier partagé).
+        
+        Returns:
+            Clé ou None si la requête n'est pas éligible
+        """
+        if method != "GET" or self.disk_cache is None:
+            return None
+        project_param = self.DISK_CACHE_ENDPOINTS.get(endpoint)
+        if project_param is None:
+            return None
+        component = str((params or {}).get(project_param) or '')
+        if not component or ',' in component:
+            return None
+        revision = self.get_analysis_revision(component.split(':', 1)[0])
+        if revision is None:
+            return None
+        return make_cache_key(self.config.url, endpoint, params, revision, self.config.token)
+    
+    def get_analysis_revision(self, project_key: str) -> Optional[str]:
+        """
+        Récupère la clé de la dernière analyse d'un projet.
+        
+        Revérifiée au plus une fois par analysis_check_interval secondes.
+        
+        Args:
+            project_key: Clé du projet
+        
+        Returns:
+            Clé de la dernière analyse ou None si inconnue
+        """
+        if self.analysis_tracker.needs_check(project_key):
+            try:
+                response = self._get('/api/project_analyses/search', {'project': project_key, 'ps': 1})
+                analyses = response.get('analyses') or []
+                self.analysis_tracker.observe(project_key, analyses[0].get('key') if analyses else None)
+            except SonarQubeAPIError as e:
+                self.logger.debug(f"Impossible de vérifier la dernière analyse de {project_key}: {e}")
+        return self.analysis_tracker.revision(project_key)
+    
+    def _is_empty_result(self, endpoint: str, data: Any) -> bool:
+        """Indique si une réponse correspond à un résultat vide ("introuvable")."""
+        list_key = self.NEGATIVE_CACHE_ENDPOINTS[endpoint][1]
+        return list_key is not None and isinstance(data, dict) and not data.get(list_key)
     
     def _get(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
-        """Effectue une requête GET."""
-        return self._request("GET", endpoint, params=params)
+        """Effectue une requête GET (l'avancement des réponses paginées est signalé au suivi actif)."""
+        data = self._request("GET", endpoint, params=params)
+        reporter = current_reporter()
+        if reporter is not None:
+            paging = extract_paging(data)
+            if paging:
+                reporter.page_fetched(endpoint, paging, self.MAX_PAGINATED_ITEMS)
+        return data
+    
+    def _get_all_pages(self, endpoint: str, params: Dict[str, Any], items_key: str) -> Dict[str, Any]:
+        """
+        Récupère toutes les pages d'un endpoint paginé.
+        
+        Chaque page est transmise au suivi actif (résultats partiels) dès sa réception.
+        
+        Args:
+            endpoint: Endpoint de l'API
+            params: Paramètres de requête (p est géré ici)
+            items_key: Nom de la liste d'éléments dans la réponse (ex: 'issues')
+        
+        Returns:
+            Réponse de la première page contenant tous les éléments
+        """
+        page_size = params.get('ps') or self.config.page_size
+        result = None
+        items = []
+        page = 1
+        while True:
+            data = self._get(endpoint, {**params, 'p': page, 'ps': page_size})
+            page_items = data.get(items_key) or []
+            reporter = current_reporter()
+            if reporter is not None and page_items:
+                reporter.partial(items_key, page_items, len(items))
+            items.extend(page_items)
+            if result is None:
+                result = data
+            
+            paging = extract_paging(data)
+            total = min(paging[2], self.MAX_PAGINATED_ITEMS) if paging else len(items)
+            if not page_items or len(items) >= total:
+                break
+            page += 1
+        
+        result = dict(result)
+        result[items_key] = items
+        if 'paging' in result:
+            result['paging'] = {**result['paging'], 'pageIndex': 1, 'pageSize': len(items)}
+        if 'ps' in result:
+            result['p'], result['ps'] = 1, len(items)
+        return result
     
     def _post(self, endpoint: str, params: Optional[Dict] = None, 
               json: Optional[Dict] = None) -> Dict[str, Any]:
@@ -0,0 +1,428 @@
+"""Caches en mémoire pour l'API SonarQube."""
+
+import re
+import html
+import time
+import threading
+import logging
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Callable, Tuple
+
+from .scheduler import priority_scope, BACKGROUND
+
+
+logger = logging.getLogger(__name__)
+
+_MARKUP_RE = re.compile(r'<[^>]+>')
+
+
+def strip_code_markup(code: str) -> str:
+    """
+    Convertit le HTML de coloration syntaxique de /api/sources/lines en texte brut.
+
+    Args:
+        code: Code HTML (ex: '<span class="k">var</span> x = 1;')
+
+    Returns:
+        Code en texte brut (ex: 'var x = 1;')
+    """
+    if not code:
+        return ''
+    return html.unescape(_MARKUP_RE.sub('', code))
+
+
+def compact_source_line(line: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compacte une ligne de source (code en texte brut, colonnes couverture et SCM conservées).
+
+    Args:
+        line: Ligne brute renvoyée par /api/sources/lines
+
+    Returns:
+        Ligne compactée
+    """
+    compact = {k: v for k, v in line.items() if v is not None}
+    if 'code' in compact:
+        compact['code'] = strip_code_markup(compact['code'])
+    return compact
+
+
+class AnalysisTracker:
+    """
+    Suivi de la dernière analyse connue de chaque projet.
+
+    Partagé entre les clients API : les caches s'abonnent via add_listener()
+    et sont invalidés dès qu'une nouvelle analyse est observée.
+    """
+
+    def __init__(self, check_interval: float = 60.0):
+        """
+        Initialise le tracker.
+
+        Args:
+            check_interval: Délai (secondes) avant de revérifier la dernière analyse d'un projet
+        """
+        self.check_interval = check_interval
+        self._revisions: Dict[str, Optional[str]] = {}
+        self._checked_at: Dict[str, float] = {}
+        self._listeners: List[Callable[[str], None]] = []
+        self._lock = threading.Lock()
+
+    def revision(self, project_key: str) -> Optional[str]:
+        """Retourne la clé de la dernière analyse connue du projet (ou None)."""
+        with self._lock:
+            return self._revisions.get(project_key)
+
+    def needs_check(self, project_key: str) -> bool:
+        """Indique si la dernière analyse du projet doit être revérifiée."""
+        with self._lock:
+            checked_at = self._checked_at.get(project_key)
+        return checked_at is None or time.monotonic() - checked_at >= self.check_interval
+
+    def observe(self, project_key: str, analysis_key: Optional[str]) -> bool:
+        """
+        Enregistre la dernière analyse observée pour un projet.
+
+        Args:
+            project_key: Clé du projet
+            analysis_key: Clé de la dernière analyse (None si aucune)
+
+        Returns:
+            True si une nouvelle analyse a été détectée (listeners notifiés)
+        """
+        with self._lock:
+            known = project_key in self._revisions
+            previous = self._revisions.get(project_key)
+            self._revisions[project_key] = analysis_key
+            self._checked_at[project_key] = time.monotonic()
+            listeners = list(self._listeners)
+
+        changed = known and previous != analysis_key
+        if changed:
+            logger.info(f"Nouvelle analyse détectée pour {project_key}: {analysis_key}")
+            for listener in listeners:
+                try:
+                    listener(project_key)
+                except Exception as e:
+                    logger.error(f"Erreur lors de l'invalidation du cache pour {project_key}: {e}")
+        return changed
+
+    def add_listener(self, callback: Callable[[str], None]):
+        """
+        Abonne un callback appelé avec la clé du projet à chaque nouvelle analyse.
+
+        Args:
+            callback: Fonction callback(project_key)
+        """
+        with self._lock:
+            self._listeners.append(callback)
+
+
+class SourceLinesCache:
+    """
+    Cache LRU des fichiers sources, borné par le nombre total de lignes.
+
+    Chaque entrée contient le fichier complet (lignes compactées), indexée
+    par (file_key, analyse) : toute plage de lignes est servie localement.
+    """
+
+    def __init__(self, max_lines: int = 200000):
+        """
+        Initialise le cache.
+
+        Args:
+            max_lines: Nombre total de lignes conservées (0 désactive le cache)
+        """
+        self.max_lines = max_lines
+        self._entries: "OrderedDict[Tuple[str, Optional[str]], List[Dict[str, Any]]]" = OrderedDict()
+        self._total_lines = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Indique si le cache est actif."""
+        return self.max_lines > 0
+
+    def get(self, file_key: str, revision: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Récupère les lignes d'un fichier en cache.
+
+        Args:
+            file_key: Clé du fichier
+            revision: Clé de l'analyse
+
+        Returns:
+            Lignes du fichier ou None si absent
+        """
+        key = (file_key, revision)
+        with self._lock:
+            lines = self._entries.get(key)
+            if lines is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return lines
+
+    def put(self, file_key: str, revision: Optional[str], lines: List[Dict[str, Any]]):
+        """
+        Ajoute un fichier au cache en évinçant les moins récemment utilisés.
+
+        Args:
+            file_key: Clé du fichier
+            revision: Clé de l'analyse
+            lines: Lignes compactées du fichier
+        """
+        if not self.enabled or len(lines) > self.max_lines:
+            return
+
+        key = (file_key, revision)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_lines -= len(previous)
+            self._entries[key] = lines
+            self._total_lines += len(lines)
+
+            while self._total_lines > self.max_lines:
+                _, evicted = self._entries.popitem(last=False)
+                self._total_lines -= len(evicted)
+                self.evictions += 1
+
+    def invalidate_project(self, project_key: str):
+        """Supprime toutes les entrées des fichiers d'un projet."""
+        prefix = f"{project_key}:"
+        with self._lock:
+            for key in [k for k in self._entries if k[0].startswith(prefix)]:
+                self._total_lines -= len(self._entries.pop(key))
+
+    def clear(self):
+        """Vide le cache."""
+        with self._lock:
+            self._entries.clear()
+            self._total_lines = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Retourne les statistiques du cache."""
+        with self._lock:
+            return {
+                'files': len(self._entries),
+                'lines': self._total_lines,
+                'max_lines': self.max_lines,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+class StaleWhileRevalidateCache:
+    """
+    Cache "stale-while-revalidate".
+
+    La dernière valeur connue est renvoyée immédiatement avec son âge ; au-delà
+    de refresh_after elle est rafraîchie en tâche de fond, au-delà de
+    max_staleness le rafraîchissement devient bloquant.
+    """
+
+    def __init__(self, refresh_after: float = 10.0, max_staleness: float = 300.0, name: str = "swr"):
+        """
+        Initialise le cache.
+
+        Args:
+            refresh_after: Âge (secondes) déclenchant un rafraîchissement en arrière-plan
+            max_staleness: Âge maximum (secondes) avant rafraîchissement bloquant (0 désactive le cache)
+            name: Nom utilisé pour les threads de rafraîchissement et les logs
+        """
+        self.refresh_after = refresh_after
+        self.max_staleness = max_staleness
+        self.name = name
+        self._entries: Dict[Any, Tuple[Any, float]] = {}
+        self._refreshing: set = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.background_refreshes = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Indique si le cache est actif."""
+        return self.max_staleness > 0
+
+    def get(self, key: Any, loader: Callable[[], Any]) -> Tuple[Any, float]:
+        """
+        Récupère une valeur, en la chargeant si absente ou trop ancienne.
+
+        Args:
+            key: Clé de l'entrée
+            loader: Fonction de chargement de la valeur (appel API)
+
+        Returns:
+            Tuple (valeur, âge en secondes)
+
+        Raises:
+            Exception: Toute exception levée par loader lors d'un chargement bloquant
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+        if entry is not None:
+            value, loaded_at = entry
+            age = time.monotonic() - loaded_at
+            if age < self.max_staleness:
+                with self._lock:
+                    self.hits += 1
+                if age >= self.refresh_after:
+                    self._refresh_async(key, loader)
+                return value, age
+
+        with self._lock:
+            self.misses += 1
+        value = loader()
+        self._store(key, value)
+        return value, 0.0
+
+    def _store(self, key: Any, value: Any):
+        """Enregistre une valeur fraîchement chargée."""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+
+    def _refresh_async(self, key: Any, loader: Callable[[], Any]):
+        """Lance un rafraîchissement en arrière-plan (un seul à la fois par clé)."""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            self.background_refreshes += 1
+
+        thread = threading.Thread(target=self._refresh, args=(key, loader), name=f"{self.name}-refresh")
+        thread.daemon = True
+        thread.start()
+
+    def _refresh(self, key: Any, loader: Callable[[], Any]):
+        """Rafraîchit une entrée (travail de fond) ; en cas d'erreur la valeur précédente est conservée."""
+        try:
+            with priority_scope(BACKGROUND):
+                value = loader()
+            self._store(key, value)
+        except Exception as e:
+            logger.warning(f"Rafraîchissement en arrière-plan échoué pour {key}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def invalidate(self, key: Any):
+        """Supprime une entrée (prochain accès bloquant)."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Vide le cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Retourne les statistiques du cache."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'refreshing': len(self._refreshing),
+                'hits': self.hits,
+                'misses': self.misses,
+                'background_refreshes': self.background_refreshes,
+            }
+
+
+class NegativeCache:
+    """
+    Cache à courte durée de vie des réponses "introuvable" (404 ou résultat vide).
+
+    Les entrées sont indexées par (endpoint, identifiant) afin que les essais
+    répétés sur une clé inexistante reviennent instantanément.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 1000):
+        """
+        Initialise le cache.
+
+        Args:
+            ttl: Durée de vie (secondes) d'une entrée (0 désactive le cache)
+            max_entries: Nombre maximum d'entrées conservées
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Indique si le cache est actif."""
+        return self.ttl > 0
+
+    def get(self, endpoint: str, identifier: str) -> Optional[Any]:
+        """
+        Récupère une entrée négative non expirée.
+
+        Args:
+            endpoint: Endpoint de l'API
+            identifier: Identifiant demandé (clé de fichier, de règle, etc.)
+
+        Returns:
+            Erreur ou réponse vide mise en cache, None si absente
+        """
+        key = (endpoint, identifier)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self.hits += 1
+            return value
+
+    def put(self, endpoint: str, identifier: str, value: Any):
+        """
+        Enregistre une réponse négative.
+
+        Args:
+            endpoint: Endpoint de l'API
+            identifier: Identifiant demandé
+            value: Erreur (SonarQubeAPIError) ou réponse vide
+        """
+        if not self.enabled:
+            return
+        key = (endpoint, identifier)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_project(self, project_key: str):
+        """Supprime les entrées concernant un projet ou ses fichiers."""
+        prefixes = (f"{project_key}:", f"{project_key}?")
+        with self._lock:
+            for key in [k for k in self._entries if k[1] == project_key or k[1].startswith(prefixes)]:
+                del self._entries[key]
+
+    def clear(self):
+        """Vide le cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Retourne les statistiques du cache."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+            }
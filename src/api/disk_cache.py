@@ -0,0 +1,280 @@
+"""Cache disque compressé des réponses de l'API SonarQube."""
+
+import os
+import json
+import lzma
+import zlib
+import time
+import struct
+import hashlib
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# En-tête d'une entrée : magic (4 octets) + codec (1 octet) + date d'écriture (double)
+_MAGIC = b'SQC1'
+_HEADER = struct.Struct('>4sBd')
+_CODECS = {
+    'zlib': (1, lambda data: zlib.compress(data, 6), zlib.decompress),
+    'lzma': (2, lzma.compress, lzma.decompress),
+}
+_DECOMPRESSORS = {codec_id: decompress for codec_id, _, decompress in _CODECS.values()}
+
+
+def make_cache_key(server_url: str, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                   revision: Optional[str] = None, token: Optional[str] = None) -> str:
+    """
+    Calcule la clé d'une réponse à partir du serveur, de l'endpoint et des paramètres normalisés.
+
+    Args:
+        server_url: URL du serveur SonarQube
+        endpoint: Endpoint de l'API (ex: /api/sources/lines)
+        params: Paramètres de requête (ordre et valeurs None ignorés)
+        revision: Clé de l'analyse associée (optionnel)
+        token: Token d'authentification : seule son empreinte entre dans la clé, deux
+               tokens ne lisent jamais les réponses l'un de l'autre (optionnel)
+
+    Returns:
+        Empreinte hexadécimale SHA-256
+    """
+    normalized_endpoint = '/' + endpoint.strip('/')
+    normalized_params = sorted(
+        (str(k), str(v)) for k, v in (params or {}).items() if v is not None
+    )
+    token_fingerprint = hashlib.sha256(token.encode('utf-8')).hexdigest() if token else None
+    raw = json.dumps([server_url.rstrip('/'), normalized_endpoint, normalized_params, revision, token_fingerprint])
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def create_disk_cache(config) -> Optional["DiskCache"]:
+    """
+    Crée le cache disque décrit par la configuration.
+
+    Args:
+        config: Configuration SonarQube
+
+    Returns:
+        Cache disque ou None s'il est désactivé (disk_cache_max_bytes à 0) ou indisponible
+    """
+    if config.disk_cache_max_bytes <= 0:
+        return None
+    try:
+        return DiskCache(
+            config.disk_cache_dir,
+            max_bytes=config.disk_cache_max_bytes,
+            compression=config.disk_cache_compression,
+            ttl=config.disk_cache_ttl
+        )
+    except OSError as e:
+        logger.warning(f"Cache disque indisponible ({config.disk_cache_dir}): {e}")
+        return None
+
+
+class DiskCache:
+    """
+    Stockage disque des réponses JSON, compressées (zlib ou lzma).
+
+    - Taille totale bornée avec éviction LRU (date de dernier accès du fichier)
+    - Écritures atomiques (fichier temporaire + os.replace), sûres entre processus
+    - Statistiques : taux de succès, taux de compression, évictions
+    """
+
+    SUFFIX = '.sqc'
+
+    def __init__(self, directory: str, max_bytes: int, compression: str = 'zlib', ttl: float = 3600):
+        """
+        Initialise le cache disque.
+
+        Args:
+            directory: Dossier de stockage (créé si besoin)
+            max_bytes: Taille totale maximale en octets
+            compression: Algorithme de compression ('zlib' ou 'lzma')
+            ttl: Durée de validité (secondes) d'une entrée
+
+        Raises:
+            ValueError: Si l'algorithme de compression est inconnu
+        """
+        if compression not in _CODECS:
+            raise ValueError(f"Compression inconnue: {compression} (attendu: {', '.join(_CODECS)})")
+
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.compression = compression
+        self.ttl = ttl
+        self._codec_id, self._compress, _ = _CODECS[compression]
+        self._lock = threading.Lock()
+        self._total_bytes = sum(size for _, size, _ in self._scan())
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.raw_bytes_written = 0
+        self.stored_bytes_written = 0
+
+    def _path(self, key: str) -> Path:
+        """Chemin du fichier d'une entrée."""
+        return self.directory / f"{key}{self.SUFFIX}"
+
+    def _scan(self) -> List[Tuple[Path, int, float]]:
+        """Liste les entrées présentes sur disque : (chemin, taille, date d'accès)."""
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not entry.name.endswith(self.SUFFIX):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((Path(entry.path), stat.st_size, stat.st_mtime))
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Lit une entrée.
+
+        Args:
+            key: Clé calculée par make_cache_key()
+
+        Returns:
+            Réponse JSON désérialisée ou None si absente, expirée ou illisible
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                blob = f.read()
+            magic, codec_id, written_at = _HEADER.unpack_from(blob)
+            if magic != _MAGIC or codec_id not in _DECOMPRESSORS:
+                raise ValueError("en-tête invalide")
+            if time.time() - written_at > self.ttl:
+                self._discard(path)
+                self._count_miss()
+                return None
+            data = json.loads(_DECOMPRESSORS[codec_id](blob[_HEADER.size:]).decode('utf-8'))
+        except FileNotFoundError:
+            self._count_miss()
+            return None
+        except Exception as e:
+            logger.warning(f"Entrée de cache disque illisible {path.name}: {e}")
+            self._discard(path)
+            self._count_miss()
+            return None
+
+        # Date de modification = date du dernier accès, utilisée pour l'éviction LRU
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key: str, data: Any):
+        """
+        Écrit une entrée de manière atomique puis applique la limite de taille.
+
+        Args:
+            key: Clé calculée par make_cache_key()
+            data: Réponse JSON sérialisable
+        """
+        raw = json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        blob = _HEADER.pack(_MAGIC, self._codec_id, time.time()) + self._compress(raw)
+        if len(blob) > self.max_bytes:
+            return
+
+        path = self._path(key)
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-', suffix='.part')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(blob)
+                # Entrée remplacée : sa taille ne compte plus
+                try:
+                    replaced = path.stat().st_size
+                except OSError:
+                    replaced = 0
+                os.replace(tmp_path, path)
+            except BaseException:
+                self._discard(Path(tmp_path))
+                raise
+        except OSError as e:
+            logger.warning(f"Écriture du cache disque échouée: {e}")
+            return
+
+        with self._lock:
+            self.writes += 1
+            self.raw_bytes_written += len(raw)
+            self.stored_bytes_written += len(blob)
+            self._total_bytes += len(blob) - replaced
+            over_limit = self._total_bytes > self.max_bytes
+
+        if over_limit:
+            self._evict()
+
+    def _evict(self):
+        """Supprime les entrées les moins récemment utilisées jusqu'à repasser sous la limite."""
+        # Le scan fait foi : d'autres processus peuvent écrire dans le même dossier
+        entries = sorted(self._scan(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if self._discard(path):
+                evicted += 1
+            total -= size
+
+        with self._lock:
+            self._total_bytes = total
+            self.evictions += evicted
+
+    def _discard(self, path: Path) -> bool:
+        """Supprime un fichier en ignorant les suppressions concurrentes."""
+        try:
+            path.unlink()
+            return True
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            logger.warning(f"Suppression du cache disque échouée {path.name}: {e}")
+            return False
+
+    def _count_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def clear(self):
+        """Supprime toutes les entrées."""
+        for path, _, _ in self._scan():
+            self._discard(path)
+        with self._lock:
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Retourne les statistiques du cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'compression': self.compression,
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0,
+                'writes': self.writes,
+                'compression_ratio': (
+                    round(self.raw_bytes_written / self.stored_bytes_written, 2)
+                    if self.stored_bytes_written else 0.0
+                ),
+                'evictions': self.evictions,
+            }
@@ -19,8 +19,13 @@ class IssuesAPI(SonarQubeAPIBase):
                rules: Optional[List[str]] = None,
                tags: Optional[List[str]] = None,
                page: int = 1,
-               page_size: Optional[int] = None) -> Dict[str, Any]:
-        """Recherche des issues avec filtres multiples."""
+               page_size: Optional[int] = None,
+               all_pages: bool = False) -> Dict[str, Any]:
+        """
+        Recherche des issues avec filtres multiples.
+        
+        all_pages=True récupère toutes les pages (dans la limite de 10 000 issues).
+        """
         params = {
             'p': page,
             'ps': page_size or self.config.page_size
@@ -46,14 +51,23 @@ class IssuesAPI(SonarQubeAPIBase):
         if tags:
             params['tags'] = ','.join(tags)
         
-        response = self._get('/api/issues/search', params)
+        if all_pages:
+            response = self._get_all_pages('/api/issues/search', params, 'issues')
+        else:
+            response = self._get('/api/issues/search', params)
         
         # Convertir en objets Issue
         if 'issues' in response:
             response['issues'] = [Issue.from_api_response(issue) for issue in response['issues']]
         
         return response
-    
+
+    def get(self, issue_key: str) -> Optional[Issue]:
+        """Récupère une issue par sa clé (None si introuvable)."""
+        response = self._get('/api/issues/search', {'issues': issue_key, 'additionalFields': '_all'})
+        issues = response.get('issues', [])
+        return Issue.from_api_response(issues[0]) if issues else None
+
     def get_changelog(self, issue_key: str) -> Dict[str, Any]:
         """Récupère l'historique d'une issue."""
         return self._get('/api/issues/changelog', {'issue': issue_key})
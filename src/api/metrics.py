@@ -0,0 +1,108 @@
+"""Métriques d'exécution : nombre d'appels, erreurs et latences par endpoint ou par outil."""
+
+import os
+import sys
+import threading
+from collections import deque
+from typing import Dict, Any, Optional
+
+
+class RequestMetrics:
+    """
+    Compteurs et latences par nom (endpoint SonarQube, outil MCP).
+
+    Les percentiles sont calculés sur les window derniers appels de chaque nom
+    (mémoire bornée) ; les compteurs couvrent toute la vie du processus.
+    """
+
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self, window: int = 512):
+        """
+        Initialise les métriques.
+
+        Args:
+            window: Nombre de latences conservées par nom pour les percentiles
+        """
+        self.window = window
+        self._calls: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+        self._latencies: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float, error: bool = False):
+        """
+        Enregistre un appel.
+
+        Args:
+            name: Endpoint ou outil
+            seconds: Durée de l'appel
+            error: L'appel a échoué
+        """
+        with self._lock:
+            self._calls[name] = self._calls.get(name, 0) + 1
+            if error:
+                self._errors[name] = self._errors.get(name, 0) + 1
+            latencies = self._latencies.get(name)
+            if latencies is None:
+                latencies = self._latencies[name] = deque(maxlen=self.window)
+            latencies.append(seconds)
+
+    def count(self, name: str) -> int:
+        """Nombre d'appels enregistrés pour un nom."""
+        with self._lock:
+            return self._calls.get(name, 0)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Retourne les métriques par nom.
+
+        Returns:
+            Dictionnaire nom → {'calls', 'errors', 'error_rate', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'}
+        """
+        with self._lock:
+            entries = [(name, calls, self._errors.get(name, 0), sorted(self._latencies[name]))
+                       for name, calls in self._calls.items()]
+
+        snapshot = {}
+        for name, calls, errors, latencies in sorted(entries):
+            stats = {'calls': calls, 'errors': errors, 'error_rate': round(errors / calls, 3)}
+            for percentile in self.PERCENTILES:
+                stats[f'p{percentile}_ms'] = self._percentile_ms(latencies, percentile)
+            stats['max_ms'] = round(latencies[-1] * 1000, 1)
+            snapshot[name] = stats
+        return snapshot
+
+    @staticmethod
+    def _percentile_ms(latencies: list, percentile: int) -> float:
+        """Percentile (rang le plus proche) d'une liste triée, en millisecondes."""
+        index = max(-(-len(latencies) * percentile // 100) - 1, 0)
+        return round(latencies[index] * 1000, 1)
+
+
+def process_stats() -> Dict[str, Optional[int]]:
+    """
+    Retourne l'occupation du processus.
+
+    Returns:
+        {'threads', 'rss_bytes', 'max_rss_bytes'} ; la mémoire vaut None si
+        elle n'est pas mesurable sur la plateforme
+    """
+    rss = max_rss = None
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            rss = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kio sous Linux, octets sous macOS
+        max_rss = max_rss if sys.platform == 'darwin' else max_rss * 1024
+    except ImportError:
+        pass
+    return {
+        'threads': threading.active_count(),
+        'rss_bytes': rss,
+        'max_rss_bytes': max_rss,
+    }
@@ -0,0 +1,203 @@
+"""Suivi des appels longs : avancement (pages récupérées, résultats partiels) et annulation."""
+
+import math
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Callable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+def extract_paging(data: Any) -> Optional[Tuple[int, int, int]]:
+    """
+    Extrait la pagination d'une réponse SonarQube.
+
+    Gère le format `paging` ({pageIndex, pageSize, total}) et l'ancien format
+    à plat (p, ps, total) de /api/issues/search.
+
+    Args:
+        data: Réponse JSON désérialisée
+
+    Returns:
+        Tuple (page, taille de page, total d'éléments) ou None si la réponse n'est pas paginée
+    """
+    if not isinstance(data, dict):
+        return None
+    paging = data.get('paging')
+    if isinstance(paging, dict) and 'total' in paging:
+        return paging.get('pageIndex', 1), paging.get('pageSize') or 0, paging['total']
+    if 'total' in data and 'ps' in data:
+        return data.get('p', 1), data['ps'] or 0, data['total']
+    return None
+
+
+class ProgressReporter:
+    """
+    Reçoit l'avancement d'un appel d'outil.
+
+    - page_fetched() est appelé par la couche API après chaque page paginée
+    - partial() transmet un lot d'éléments dès sa réception (si demandé par le client)
+    """
+
+    def __init__(self, on_progress: Callable[[int, Optional[int], str], None],
+                 on_partial: Optional[Callable[[str, List[Any], int], None]] = None):
+        """
+        Initialise le suivi.
+
+        Args:
+            on_progress: Appelé avec (pages récupérées, pages attendues ou None, message)
+            on_partial: Appelé avec (clé de la liste, éléments, position du premier élément) (optionnel)
+        """
+        self.on_progress = on_progress
+        self.on_partial = on_partial
+        self.pages = 0
+        self.total_pages: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def page_fetched(self, endpoint: str, paging: Tuple[int, int, int], max_items: Optional[int] = None):
+        """
+        Signale une page récupérée.
+
+        Args:
+            endpoint: Endpoint de l'API
+            paging: Pagination extraite de la réponse (page, taille de page, total)
+            max_items: Nombre maximal d'éléments récupérables (ex: limite de 10 000 de SonarQube)
+        """
+        _, page_size, total = paging
+        if max_items is not None:
+            total = min(total, max_items)
+        with self._lock:
+            self.pages += 1
+            if page_size:
+                expected = max(math.ceil(total / page_size), 1)
+                self.total_pages = max(expected, self.pages)
+            pages, total_pages = self.pages, self.total_pages
+        self._emit(self.on_progress, pages, total_pages, f"{endpoint}: page {pages}/{total_pages or '?'}")
+
+    def partial(self, key: str, items: List[Any], offset: int):
+        """
+        Transmet un lot d'éléments reçus.
+
+        Args:
+            key: Nom de la liste (ex: 'issues')
+            items: Éléments du lot
+            offset: Position du premier élément dans le résultat complet
+        """
+        if self.on_partial:
+            self._emit(self.on_partial, key, items, offset)
+
+    @staticmethod
+    def _emit(callback: Callable, *args: Any):
+        # Une erreur d'envoi (client déconnecté) ne doit pas interrompre l'appel
+        try:
+            callback(*args)
+        except Exception as e:
+            logger.warning(f"Envoi de l'avancement échoué: {e}")
+
+
+def current_reporter() -> Optional[ProgressReporter]:
+    """Retourne le suivi actif dans le thread courant."""
+    return getattr(_local, 'reporter', None)
+
+
+@contextmanager
+def progress_scope(reporter: Optional[ProgressReporter]):
+    """
+    Active un suivi d'avancement pour les appels API du thread courant.
+
+    Args:
+        reporter: Suivi à activer (None : aucun suivi)
+    """
+    previous = current_reporter()
+    _local.reporter = reporter
+    try:
+        yield reporter
+    finally:
+        _local.reporter = previous
+
+
+class RequestCancelledError(Exception):
+    """Exception levée dans un appel annulé par le client (notifications/cancelled)."""
+    pass
+
+
+class CancellationToken:
+    """
+    Annulation d'un appel en cours.
+
+    La couche API vérifie le jeton actif avant chaque requête HTTP (check_cancelled) :
+    les pages restantes et les requêtes parallèles ne sont pas envoyées.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._callbacks: List[Callable[[], Any]] = []
+        self._lock = threading.Lock()
+        self.reason: Optional[str] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: Optional[str] = None):
+        """Annule l'appel et exécute les rappels enregistrés (une seule fois)."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def add_callback(self, callback: Callable[[], Any]):
+        """Enregistre un rappel exécuté à l'annulation (immédiatement si déjà annulé)."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def raise_if_cancelled(self):
+        """
+        Raises:
+            RequestCancelledError: Si l'appel a été annulé
+        """
+        if self._event.is_set():
+            raise RequestCancelledError(f"Requête annulée{f': {self.reason}' if self.reason else ''}")
+
+
+def current_cancellation() -> Optional[CancellationToken]:
+    """Retourne le jeton d'annulation actif dans le thread courant."""
+    return getattr(_local, 'cancellation', None)
+
+
+def check_cancelled():
+    """
+    Vérifie que l'appel du thread courant n'a pas été annulé.
+
+    Raises:
+        RequestCancelledError: Si l'appel a été annulé
+    """
+    token = current_cancellation()
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+@contextmanager
+def cancellation_scope(token: Optional[CancellationToken]):
+    """
+    Active un jeton d'annulation pour les appels API du thread courant.
+
+    Args:
+        token: Jeton à activer (None : appel non annulable)
+    """
+    previous = current_cancellation()
+    _local.cancellation = token
+    try:
+        yield token
+    finally:
+        _local.cancellation = previous
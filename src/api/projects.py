@@ -1,13 +1,34 @@
 """API SonarQube - Endpoints Projects & Quality Gates."""
 
 from typing import List, Optional, Dict, Any
-from .base import SonarQubeAPIBase
+from .base import SonarQubeAPIBase, SonarQubeAPIError
+from .cache import (
+    AnalysisTracker, NegativeCache, SourceLinesCache, StaleWhileRevalidateCache, compact_source_line
+)
+from .disk_cache import DiskCache
+from .metrics import RequestMetrics
+from .scheduler import PriorityScheduler
+from ..config import SonarQubeConfig
 from ..models import Project
 
 
 class ProjectsAPI(SonarQubeAPIBase):
     """Client pour les endpoints Projects."""
     
+    def __init__(self, config: SonarQubeConfig, analysis_tracker: Optional[AnalysisTracker] = None,
+                 negative_cache: Optional[NegativeCache] = None, disk_cache: Optional[DiskCache] = None,
+                 request_metrics: Optional[RequestMetrics] = None,
+                 scheduler: Optional[PriorityScheduler] = None):
+        super().__init__(config, analysis_tracker, negative_cache, disk_cache, request_metrics, scheduler)
+        self.source_cache = SourceLinesCache(config.source_cache_max_lines)
+        self.quality_gate_cache = StaleWhileRevalidateCache(
+            refresh_after=config.quality_gate_refresh_after,
+            max_staleness=config.quality_gate_max_staleness,
+            name="quality-gate"
+        )
+        self.analysis_tracker.add_listener(self.source_cache.invalidate_project)
+        self.analysis_tracker.add_listener(self.quality_gate_cache.invalidate)
+    
     def search(self, query: Optional[str] = None, page: int = 1, page_size: Optional[int] = None) -> List[Project]:
         """Recherche des projets."""
         params = {
@@ -29,8 +50,32 @@ class ProjectsAPI(SonarQubeAPIBase):
         return projects[0] if projects else None
     
     def get_quality_gate_status(self, project_key: str) -> Dict[str, Any]:
-        """Récupère le statut du Quality Gate d'un projet."""
-        return self._get('/api/qualitygates/project_status', {'projectKey': project_key})
+        """
+        Récupère le statut du Quality Gate d'un projet.
+        
+        Le dernier statut connu est renvoyé immédiatement (clé 'cache' avec son
+        âge) et rafraîchi en arrière-plan ; au-delà de quality_gate_max_staleness
+        le rafraîchissement est bloquant.
+        
+        Args:
+            project_key: Clé du projet
+        
+        Returns:
+            Réponse de /api/qualitygates/project_status
+        """
+        def load() -> Dict[str, Any]:
+            return self._get('/api/qualitygates/project_status', {'projectKey': project_key})
+        
+        if not self.quality_gate_cache.enabled:
+            return load()
+        
+        status, age = self.quality_gate_cache.get(project_key, load)
+        result = dict(status)
+        result['cache'] = {
+            'age_seconds': round(age, 1),
+            'stale': age >= self.quality_gate_cache.refresh_after
+        }
+        return result
     
     def get_component_tree(self, component_key: str, qualifiers: Optional[List[str]] = None,
                            page: int = 1, page_size: Optional[int] = None) -> Dict[str, Any]:
@@ -47,11 +92,8 @@ class ProjectsAPI(SonarQubeAPIBase):
         return self._get('/api/components/tree', params)
     
     def get_component_sources(self, component_key: str, from_line: int = 1, to_line: Optional[int] = None) -> Dict[str, Any]:
-        """Récupère le code source d'un composant."""
-        params = {'key': component_key, 'from': from_line}
-        if to_line:
-            params['to'] = to_line
-        return self._get('/api/sources/lines', params)
+        """[Compatibility] Récupère le code source d'un composant (voir get_source_lines)."""
+        return self.get_source_lines(component_key, from_line, to_line)
     
     def get_server_version(self) -> str:
         """Récupère la version du serveur SonarQube."""
@@ -73,7 +115,17 @@ class ProjectsAPI(SonarQubeAPIBase):
             params['from'] = from_date
         if to_date:
             params['to'] = to_date
-        return self._get('/api/project_analyses/search', params)
+        response = self._get('/api/project_analyses/search', params)
+        
+        # Les analyses sont triées par date décroissante : la première page
+        # non bornée donne la dernière analyse du projet (une page filtrée ou
+        # vide ne dit rien de la dernière analyse)
+        if page == 1 and not from_date and not to_date:
+            analyses = response.get('analyses') or []
+            if analyses:
+                self.analysis_tracker.observe(project_key, analyses[0].get('key'))
+        
+        return response
     
     def get_duplications(self, file_key: str) -> Dict[str, Any]:
         """Récupère les duplications de code d'un fichier."""
@@ -81,9 +133,52 @@ class ProjectsAPI(SonarQubeAPIBase):
     
     def get_source_lines(self, file_key: str, from_line: int = 1, 
                          to_line: Optional[int] = None) -> Dict[str, Any]:
-        """Récupère le code source annoté d'un fichier."""
-        params = {'key': file_key, 'from': from_line}
-        if to_line:
-            params['to'] = to_line
-        return self._get('/api/sources/lines', params)
+        """
+        Récupère le code source annoté d'un fichier.
+        
+        Le fichier complet est téléchargé une seule fois par analyse puis
+        chaque plage de lignes est servie depuis le cache.
+        
+        Args:
+            file_key: Clé du fichier (ex: project:src/main.dart)
+            from_line: Première ligne (incluse)
+            to_line: Dernière ligne (incluse, None pour la fin du fichier)
+        
+        Returns:
+            Dictionnaire {'sources': [...]} avec le code en texte brut
+        
+        Raises:
+            SonarQubeAPIError: Plage invalide (400, comme le serveur) : from_line
+                après to_line ou au-delà de la fin du fichier
+        """
+        if to_line and from_line > to_line:
+            raise SonarQubeAPIError(400, f"Plage de lignes invalide: {from_line} > {to_line}")
+        if not self.source_cache.enabled:
+            params = {'key': file_key, 'from': from_line}
+            if to_line:
+                params['to'] = to_line
+            response = self._get('/api/sources/lines', params)
+            return {'sources': [compact_source_line(line) for line in response.get('sources', [])]}
+        
+        revision = self._get_file_revision(file_key)
+        lines = self.source_cache.get(file_key, revision)
+        if lines is None:
+            response = self._get('/api/sources/lines', {'key': file_key})
+            lines = [compact_source_line(line) for line in response.get('sources', [])]
+            self.source_cache.put(file_key, revision, lines)
+        
+        start = max(from_line, 1) - 1
+        if start and start >= len(lines):
+            raise SonarQubeAPIError(400, f"Ligne {from_line} au-delà de la fin du fichier ({len(lines)} lignes)")
+        return {'sources': lines[start:to_line] if to_line else lines[start:]}
+    
+    def _get_file_revision(self, file_key: str) -> Optional[str]:
+        """Récupère la dernière analyse du projet contenant le fichier."""
+        if ':' in file_key:
+            project_key = file_key.split(':', 1)[0]
+        elif self.config.default_project:
+            project_key = self.config.default_project.key
+        else:
+            return None
+        return self.get_analysis_revision(project_key)
 
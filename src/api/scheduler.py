@@ -0,0 +1,116 @@
+"""Ordonnancement des requêtes SonarQube : appels interactifs prioritaires sur le travail de fond."""
+
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator
+
+INTERACTIVE = 'interactive'
+BACKGROUND = 'background'
+
+_local = threading.local()
+
+
+def current_priority() -> str:
+    """Classe des requêtes du thread courant (INTERACTIVE par défaut)."""
+    return getattr(_local, 'priority', INTERACTIVE)
+
+
+@contextmanager
+def priority_scope(priority: str) -> Iterator[None]:
+    """
+    Rattache les requêtes SonarQube du thread courant à une classe.
+
+    Args:
+        priority: INTERACTIVE (appels d'outils) ou BACKGROUND (préchargement,
+                  rafraîchissements, sondage des abonnements)
+    """
+    previous = getattr(_local, 'priority', INTERACTIVE)
+    _local.priority = priority
+    try:
+        yield
+    finally:
+        _local.priority = previous
+
+
+class PriorityScheduler:
+    """
+    Places de requêtes HTTP par classe, devant la session SonarQube.
+
+    - Chaque classe a sa propre limite de requêtes simultanées
+    - Une requête de fond attend tant qu'un appel interactif attend une place, et
+      ne démarre que dans la capacité inoccupée (interactives + fond < interactive_limit) :
+      un appel interactif passe devant toutes les requêtes de fond en attente
+    - La place est reprise entre deux requêtes : un travail de fond paginé cède
+      la main page par page
+    """
+
+    def __init__(self, interactive_limit: int = 8, background_limit: int = 2):
+        """
+        Initialise l'ordonnanceur.
+
+        Args:
+            interactive_limit: Requêtes interactives simultanées (capacité totale)
+            background_limit: Requêtes de fond simultanées
+        """
+        self.limits = {INTERACTIVE: interactive_limit, BACKGROUND: background_limit}
+        self._active = {INTERACTIVE: 0, BACKGROUND: 0}
+        self._waiting = {INTERACTIVE: 0, BACKGROUND: 0}
+        self._started = {INTERACTIVE: 0, BACKGROUND: 0}
+        self._delayed = {INTERACTIVE: 0, BACKGROUND: 0}
+        self._wait_seconds = {INTERACTIVE: 0.0, BACKGROUND: 0.0}
+        self._condition = threading.Condition()
+
+    def _can_start(self, priority: str) -> bool:
+        """Une place est libre pour la classe (à appeler sous self._condition)."""
+        if priority == INTERACTIVE:
+            return self._active[INTERACTIVE] < self.limits[INTERACTIVE]
+        return (self._waiting[INTERACTIVE] == 0
+                and self._active[BACKGROUND] < self.limits[BACKGROUND]
+                and self._active[INTERACTIVE] + self._active[BACKGROUND] < self.limits[INTERACTIVE])
+
+    @contextmanager
+    def slot(self, priority: str = INTERACTIVE) -> Iterator[None]:
+        """
+        Occupe une place pour la durée d'une requête HTTP.
+
+        Args:
+            priority: INTERACTIVE ou BACKGROUND (autre valeur : INTERACTIVE)
+        """
+        if priority not in self.limits:
+            priority = INTERACTIVE
+        with self._condition:
+            if not self._can_start(priority):
+                start = time.monotonic()
+                self._waiting[priority] += 1
+                self._delayed[priority] += 1
+                try:
+                    while not self._can_start(priority):
+                        self._condition.wait()
+                finally:
+                    self._waiting[priority] -= 1
+                    self._wait_seconds[priority] += time.monotonic() - start
+            self._active[priority] += 1
+            self._started[priority] += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._active[priority] -= 1
+                # Plusieurs attentes peuvent être débloquées (classes différentes)
+                self._condition.notify_all()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Retourne les compteurs par classe."""
+        with self._condition:
+            return {
+                priority: {
+                    'limit': self.limits[priority],
+                    'active': self._active[priority],
+                    'waiting': self._waiting[priority],
+                    'started': self._started[priority],
+                    'delayed': self._delayed[priority],
+                    'wait_s': round(self._wait_seconds[priority], 3),
+                }
+                for priority in (INTERACTIVE, BACKGROUND)
+            }
@@ -11,6 +11,7 @@ from .users import UsersCommands
 
 from ..api import SonarQubeAPI
 from ..config import SonarQubeConfig
+from ..utils import lazy_property
 
 
 logger = logging.getLogger(__name__)
@@ -19,7 +20,7 @@ logger = logging.getLogger(__name__)
 class CommandHandler:
     """
     Gestionnaire principal des commandes.
-    Délègue aux sous-groupes spécialisés.
+    Délègue aux sous-groupes spécialisés, créés à la première commande.
     """
     
     def __init__(self, api: SonarQubeAPI, config: SonarQubeConfig):
@@ -32,16 +33,31 @@ class CommandHandler:
         """
         self.api = api
         self.config = config
-        
-        # Initialiser les groupes de commandes
-        self.issues = IssuesCommands(api, config)
-        self.measures = MeasuresCommands(api, config)
-        self.security = SecurityCommands(api, config)
-        self.projects = ProjectsCommands(api, config)
-        self.users = UsersCommands(api, config)
-        
-        # Enregistrer toutes les commandes
-        self.commands = self._register_commands()
+    
+    @lazy_property
+    def issues(self) -> IssuesCommands:
+        return IssuesCommands(self.api, self.config)
+    
+    @lazy_property
+    def measures(self) -> MeasuresCommands:
+        return MeasuresCommands(self.api, self.config)
+    
+    @lazy_property
+    def security(self) -> SecurityCommands:
+        return SecurityCommands(self.api, self.config)
+    
+    @lazy_property
+    def projects(self) -> ProjectsCommands:
+        return ProjectsCommands(self.api, self.config)
+    
+    @lazy_property
+    def users(self) -> UsersCommands:
+        return UsersCommands(self.api, self.config)
+    
+    @lazy_property
+    def commands(self) -> Dict[str, Any]:
+        """Table des commandes (construite au premier appel)."""
+        return self._register_commands()
     
     def _register_commands(self) -> Dict[str, Any]:
         """Enregistre toutes les commandes disponibles."""
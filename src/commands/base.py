@@ -7,6 +7,7 @@ from dataclasses import dataclass
 
 from ..api import SonarQubeAPI, SonarQubeAPIError
 from ..config import SonarQubeConfig
+from .compact import encode_compact
 
 
 logger = logging.getLogger(__name__)
@@ -24,8 +25,16 @@ class CommandResult:
     error: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
     
-    def to_json(self) -> str:
-        """Convertit le résultat en JSON."""
+    def to_json(self, compact: bool = False) -> str:
+        """
+        Convertit le résultat en JSON.
+        
+        Args:
+            compact: Format compact (sans indentation ni valeurs nulles, listes en colonnes,
+                     voir commands/compact.py)
+        """
+        if compact:
+            return json.dumps(encode_compact(self.to_dict()), separators=(',', ':'), ensure_ascii=False)
         result = {
             'success': self.success,
             'data': self.data
@@ -0,0 +1,182 @@
+"""
+Format de sortie compact des résultats de commandes.
+
+- JSON sans indentation, caractères non ASCII conservés
+- Valeurs nulles et listes vides supprimées
+- Listes d'issues, de hotspots et de mesures en colonnes, les composants et
+  règles étant remplacés par un index dans des tables partagées
+"""
+
+import dataclasses
+from datetime import datetime
+from enum import Enum
+from functools import lru_cache
+from typing import Dict, Any, List
+
+# Listes encodées en colonnes
+COLUMNAR_KEYS = frozenset({'issues', 'hotspots', 'measures'})
+
+# Champs remplacés par un index : champ -> table partagée
+TABLE_FIELDS = {
+    'component': 'components',
+    'rule': 'rules',
+    'ruleKey': 'rules',
+}
+
+
+def to_plain(value: Any) -> Any:
+    """
+    Convertit une valeur en types JSON natifs, sans valeurs nulles ni listes vides.
+
+    Les dataclasses (Issue, Hotspot...) deviennent des dictionnaires, les Enum leur
+    valeur et les dates leur représentation ISO 8601.
+    """
+    kind = type(value)
+    if kind in _SCALARS:
+        return value
+    if kind is dict:
+        plain = {}
+        for key, item in value.items():
+            if type(item) not in _SCALARS:
+                item = to_plain(item)
+                if item == [] or item == {}:
+                    continue
+            if item is not None:
+                plain[key] = item
+        return plain
+    if kind is list or kind is tuple:
+        return [to_plain(item) for item in value]
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return to_plain({name: getattr(value, name) for name in _field_names(kind)})
+    if isinstance(value, dict):
+        return to_plain(dict(value))
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+_SCALARS = frozenset({str, int, float, bool, type(None)})
+
+
+@lru_cache(maxsize=None)
+def _field_names(kind: type) -> tuple:
+    return tuple(f.name for f in dataclasses.fields(kind))
+
+
+class _Tables:
+    """Tables partagées (valeur -> index) d'un résultat."""
+
+    def __init__(self):
+        self._indexes: Dict[str, Dict[str, int]] = {}
+
+    def index(self, table: str, value: Any) -> Any:
+        if not isinstance(value, str):
+            return value
+        indexes = self._indexes.setdefault(table, {})
+        if value not in indexes:
+            indexes[value] = len(indexes)
+        return indexes[value]
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        return {name: list(indexes) for name, indexes in self._indexes.items()}
+
+
+def _columnar(rows: List[Dict[str, Any]], tables: _Tables) -> Dict[str, Any]:
+    """Encode une liste de dictionnaires en colonnes."""
+    columns: List[str] = []
+    seen = set()
+    for row in rows:
+        for key in row:
+            if key not in seen:
+                seen.add(key)
+                columns.append(key)
+
+    refs = {column: TABLE_FIELDS[column] for column in columns if column in TABLE_FIELDS}
+    encoded_rows = []
+    for row in rows:
+        encoded = []
+        for column in columns:
+            value = row.get(column)
+            if column in refs and value is not None:
+                value = tables.index(refs[column], value)
+            encoded.append(value)
+        encoded_rows.append(encoded)
+
+    block = {'columns': columns, 'rows': encoded_rows}
+    if refs:
+        block['refs'] = refs
+    return block
+
+
+def _encode(value: Any, tables: _Tables) -> Any:
+    if isinstance(value, dict):
+        encoded = {}
+        for key, item in value.items():
+            if (key in COLUMNAR_KEYS and isinstance(item, list) and item
+                    and all(isinstance(row, dict) for row in item)):
+                encoded[key] = _columnar(item, tables)
+            else:
+                encoded[key] = _encode(item, tables)
+        return encoded
+    if isinstance(value, list):
+        return [_encode(item, tables) for item in value]
+    return value
+
+
+def encode_compact(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Encode un résultat de commande au format compact.
+
+    Args:
+        result: Résultat (CommandResult.to_dict())
+
+    Returns:
+        Résultat compact ; les tables partagées sont dans la clé 'tables'
+    """
+    tables = _Tables()
+    encoded = _encode(to_plain(result), tables)
+    shared = tables.to_dict()
+    if shared:
+        encoded['tables'] = shared
+    return encoded
+
+
+def decode_compact(encoded: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reconstitue un résultat compact (listes en colonnes → listes de dictionnaires).
+
+    Args:
+        encoded: Résultat produit par encode_compact()
+
+    Returns:
+        Résultat sans valeurs nulles ni listes vides
+    """
+    tables = encoded.get('tables', {})
+
+    def decode(value: Any) -> Any:
+        if isinstance(value, dict):
+            if set(value) - {'refs'} == {'columns', 'rows'}:
+                refs = value.get('refs', {})
+                rows = []
+                for row in value['rows']:
+                    item = {}
+                    for column, cell in zip(value['columns'], row):
+                        if cell is None:
+                            continue
+                        if column in refs and isinstance(cell, int):
+                            cell = tables[refs[column]][cell]
+                        item[column] = cell
+                    rows.append(item)
+                return rows
+            return {k: decode(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [decode(item) for item in value]
+        return value
+
+    decoded = decode(encoded)
+    decoded.pop('tables', None)
+    return decoded
@@ -126,6 +126,7 @@ class IssuesCommands(BaseCommands):
         - search-issues <project_key> "" -> issues non assignées (assignee vide)
         - search-issues <project_key> <assignee> <status> -> filtrer par statut (OPEN, CONFIRMED, FALSE_POSITIVE, ACCEPTED, FIXED, IN_SANDBOX)
         - search-issues <project_key> <assignee> <status1,status2,...> -> filtrer par plusieurs statuts (séparés par des virgules)
+        - search-issues <project_key> <assignee> <statuts> all -> toutes les pages (export complet, 10 000 issues max)
         """
         if not args:
             return self._error("Usage: search-issues <project_key> [assignee] [status1,status2,...]")
@@ -155,16 +156,17 @@ class IssuesCommands(BaseCommands):
                         invalid_status = str(e).split("'")[1] if "'" in str(e) else status_arg
                         return self._error(f"Statut invalide: {invalid_status}. Valeurs valides: OPEN, CONFIRMED, FALSE_POSITIVE, ACCEPTED, FIXED, IN_SANDBOX")
             
+            all_pages = len(args) >= 4 and args[3] == 'all'
             result = self.api.search_issues(
-                project_keys=[project_key],
-                assignees=assignees,
-                statuses=statuses
+                project_keys=[project_key], assignees=assignees, statuses=statuses, all_pages=all_pages
             )
             
             metadata = {
                 'total': result.get('total', 0),
                 'project': project_key
             }
+            if all_pages:
+                metadata['all_pages'] = True
             
             if assignees is not None:
                 if assignees == ['']:
@@ -6,9 +6,8 @@ et les paramètres multi-projets.
 """
 
 import os
-import yaml
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Mapping
 from dataclasses import dataclass, field
 
 
@@ -47,6 +46,67 @@ class SonarQubeConfig:
     page_size: int = 500
     verify_ssl: bool = True
     
+    # Cache
+    source_cache_max_lines: int = 200000
+    analysis_check_interval: int = 60
+    # Intervalle de sondage des projets abonnés (resources/subscribe)
+    subscription_poll_interval: int = 30
+    # Durée de validité (secondes) des ressources lues, par type (project, file, issue, rule)
+    resource_cache_ttls: Dict[str, float] = field(default_factory=dict)
+    quality_gate_refresh_after: int = 10
+    quality_gate_max_staleness: int = 300
+    negative_cache_ttl: int = 30
+    disk_cache_max_bytes: int = 0
+    disk_cache_dir: str = str(Path.home() / '.sonarqube_mcp' / 'cache')
+    disk_cache_compression: str = "zlib"
+    disk_cache_ttl: int = 3600
+    
+    # Serveur MCP
+    max_concurrent_requests: int = 8
+    # Requêtes SonarQube simultanées par classe : appels d'outils / travail de fond
+    # (préchargement, rafraîchissements, sondage des abonnements) dans la capacité inoccupée
+    interactive_concurrency: int = 8
+    background_concurrency: int = 2
+    # File d'entrée : requêtes lentes admises (en cours + en attente) et limites par méthode
+    max_pending_requests: int = 64
+    admission_limits: Dict[str, float] = field(default_factory=dict)
+    # Taille maximale d'un message JSON-RPC reçu sur stdin (octets)
+    max_message_bytes: int = 16 * 1024 * 1024
+    tool_workers: int = 8
+    tool_queue_size: int = 64
+    # Surcharges par outil des valeurs déclarées dans tools_descriptions.yaml (secondes)
+    tool_timeouts: Dict[str, float] = field(default_factory=dict)
+    tool_latency_budgets: Dict[str, float] = field(default_factory=dict)
+    # Mémoïsation des résultats d'outils : surcharges des cache_ttl déclarés (secondes, 0 = jamais)
+    tool_cache_ttls: Dict[str, float] = field(default_factory=dict)
+    tool_cache_max_bytes: int = 16 * 1024 * 1024
+    
+    # Découpage des résultats volumineux (curseurs)
+    result_page_items: int = 100
+    cursor_ttl: int = 300
+    cursor_max_bytes: int = 32 * 1024 * 1024
+    # Format des résultats d'outils : "standard" (JSON indenté) ou "compact" (colonnes, tables partagées)
+    result_format: str = "standard"
+    
+    # Transport : "stdio" (un client) ou "http" (streamable HTTP, plusieurs clients)
+    transport: str = "stdio"
+    http_host: str = "127.0.0.1"
+    http_port: int = 8765
+    http_session_ttl: int = 3600
+    # Origines navigateur acceptées en plus des origines locales (ex: https://ide.example.com)
+    http_allowed_origins: List[str] = field(default_factory=list)
+    # Secret partagé (Authorization: Bearer), obligatoire sur une adresse non locale
+    http_auth_token: Optional[str] = None
+    
+    # Démon local partagé (socket Unix) : clients API et caches communs aux IDE et au CLI
+    daemon_enabled: bool = False
+    daemon_socket: str = str(Path.home() / '.sonarqube_mcp' / 'daemon.sock')
+    daemon_idle_timeout: int = 1800
+    
+    # Préchargement au démarrage du serveur MCP
+    warmup_enabled: bool = False
+    warmup_ttl: int = 120
+    
     # Métadonnées MCP
     quality_audience: str = "assistant"
     quality_priority: float = 0.8
@@ -69,15 +129,43 @@ class SonarQubeConfig:
             raise ValueError("SONARQUBE_TOKEN est requis")
         if not self.url.startswith(('http://', 'https://')):
             raise ValueError("SONARQUBE_URL doit commencer par http:// ou https://")
+        if self.max_concurrent_requests < 1:
+            raise ValueError("SONARQUBE_MAX_CONCURRENT_REQUESTS doit être supérieur ou égal à 1")
+        if self.interactive_concurrency < 1 or self.background_concurrency < 1:
+            raise ValueError(
+                "SONARQUBE_INTERACTIVE_CONCURRENCY et SONARQUBE_BACKGROUND_CONCURRENCY doivent être supérieurs ou égaux à 1"
+            )
+        if self.max_pending_requests < 1:
+            raise ValueError("SONARQUBE_MAX_PENDING_REQUESTS doit être supérieur ou égal à 1")
+        if any(value < 1 for value in self.admission_limits.values()):
+            raise ValueError("SONARQUBE_ADMISSION_LIMITS : les limites doivent être supérieures ou égales à 1")
+        if self.subscription_poll_interval < 1:
+            raise ValueError("SONARQUBE_SUBSCRIPTION_POLL_INTERVAL doit être supérieur ou égal à 1")
+        if self.max_message_bytes < 1024:
+            raise ValueError("SONARQUBE_MAX_MESSAGE_BYTES doit être supérieur ou égal à 1024")
+        if self.tool_workers < 1 or self.tool_queue_size < 1:
+            raise ValueError("SONARQUBE_TOOL_WORKERS et SONARQUBE_TOOL_QUEUE_SIZE doivent être supérieurs ou égaux à 1")
+        if self.disk_cache_compression not in ('zlib', 'lzma'):
+            raise ValueError("SONARQUBE_DISK_CACHE_COMPRESSION doit valoir 'zlib' ou 'lzma'")
+        if self.result_format not in ('standard', 'compact'):
+            raise ValueError("SONARQUBE_RESULT_FORMAT doit valoir 'standard' ou 'compact'")
+        if self.transport not in ('stdio', 'http'):
+            raise ValueError("SONARQUBE_TRANSPORT doit valoir 'stdio' ou 'http'")
+        if any(value < 0 for value in self.resource_cache_ttls.values()):
+            raise ValueError("SONARQUBE_RESOURCE_CACHE_TTLS : les durées doivent être positives ou nulles")
+        if any(value <= 0 for value in self.tool_timeouts.values()):
+            raise ValueError("SONARQUBE_TOOL_TIMEOUTS : les timeouts doivent être strictement positifs")
     
     @classmethod
-    def from_env(cls, config_file: Optional[str] = None) -> "SonarQubeConfig":
+    def from_env(cls, config_file: Optional[str] = None,
+                 environ: Optional[Mapping[str, str]] = None) -> "SonarQubeConfig":
         """
         Crée une configuration à partir des variables d'environnement
         et optionnellement d'un fichier de configuration.
         
         Args:
             config_file: Chemin vers un fichier config.yaml (optionnel)
+            environ: Variables d'environnement à utiliser (défaut: os.environ ; démon partagé)
         
         Returns:
             Instance de SonarQubeConfig configurée
@@ -87,37 +175,79 @@ class SonarQubeConfig:
             FileNotFoundError: Si le fichier de config spécifié n'existe pas
         """
         # Charger depuis les variables d'environnement
-        url = os.getenv('SONARQUBE_URL')
+        getenv = (os.environ if environ is None else environ).get
+        url = getenv('SONARQUBE_URL')
         if not url:
             raise ValueError(
                 "SONARQUBE_URL est requis dans l'environnement. "
                 "Définissez-le avec: export SONARQUBE_URL='https://votre-sonarqube.com'"
             )
         
-        token = os.getenv('SONARQUBE_TOKEN', '')
+        token = getenv('SONARQUBE_TOKEN', '')
         
         config_data = {
             'url': url,
             'token': token,
-            'timeout': int(os.getenv('SONARQUBE_TIMEOUT', '30')),
-            'max_retries': int(os.getenv('SONARQUBE_MAX_RETRIES', '3')),
-            'page_size': int(os.getenv('SONARQUBE_PAGE_SIZE', '500')),
-            'verify_ssl': os.getenv('SONARQUBE_VERIFY_SSL', 'true').lower() == 'true',
-            'quality_audience': os.getenv('SONARQUBE_QUALITY_AUDIENCE', 'assistant'),
-            'quality_priority': float(os.getenv('SONARQUBE_QUALITY_PRIORITY', '0.8')),
-            'security_audience': os.getenv('SONARQUBE_SECURITY_AUDIENCE', 'assistant'),
-            'security_priority': float(os.getenv('SONARQUBE_SECURITY_PRIORITY', '0.9')),
-            'metadata_enabled': os.getenv('SONARQUBE_METADATA_ENABLED', 'true').lower() == 'true',
+            'timeout': int(getenv('SONARQUBE_TIMEOUT', '30')),
+            'max_retries': int(getenv('SONARQUBE_MAX_RETRIES', '3')),
+            'page_size': int(getenv('SONARQUBE_PAGE_SIZE', '500')),
+            'verify_ssl': getenv('SONARQUBE_VERIFY_SSL', 'true').lower() == 'true',
+            'quality_audience': getenv('SONARQUBE_QUALITY_AUDIENCE', 'assistant'),
+            'quality_priority': float(getenv('SONARQUBE_QUALITY_PRIORITY', '0.8')),
+            'security_audience': getenv('SONARQUBE_SECURITY_AUDIENCE', 'assistant'),
+            'security_priority': float(getenv('SONARQUBE_SECURITY_PRIORITY', '0.9')),
+            'metadata_enabled': getenv('SONARQUBE_METADATA_ENABLED', 'true').lower() == 'true',
+            'source_cache_max_lines': int(getenv('SONARQUBE_SOURCE_CACHE_MAX_LINES', '200000')),
+            'analysis_check_interval': int(getenv('SONARQUBE_ANALYSIS_CHECK_INTERVAL', '60')),
+            'subscription_poll_interval': int(getenv('SONARQUBE_SUBSCRIPTION_POLL_INTERVAL', '30')),
+            'resource_cache_ttls': cls._parse_tool_limits(getenv('SONARQUBE_RESOURCE_CACHE_TTLS', '')),
+            'quality_gate_refresh_after': int(getenv('SONARQUBE_QUALITY_GATE_REFRESH_AFTER', '10')),
+            'quality_gate_max_staleness': int(getenv('SONARQUBE_QUALITY_GATE_MAX_STALENESS', '300')),
+            'negative_cache_ttl': int(getenv('SONARQUBE_NEGATIVE_CACHE_TTL', '30')),
+            'disk_cache_max_bytes': int(getenv('SONARQUBE_DISK_CACHE_MAX_BYTES', '0')),
+            'disk_cache_dir': getenv('SONARQUBE_DISK_CACHE_DIR',
+                                        str(Path.home() / '.sonarqube_mcp' / 'cache')),
+            'disk_cache_compression': getenv('SONARQUBE_DISK_CACHE_COMPRESSION', 'zlib'),
+            'disk_cache_ttl': int(getenv('SONARQUBE_DISK_CACHE_TTL', '3600')),
+            'max_concurrent_requests': int(getenv('SONARQUBE_MAX_CONCURRENT_REQUESTS', '8')),
+            'max_pending_requests': int(getenv('SONARQUBE_MAX_PENDING_REQUESTS', '64')),
+            'interactive_concurrency': int(getenv('SONARQUBE_INTERACTIVE_CONCURRENCY', '8')),
+            'background_concurrency': int(getenv('SONARQUBE_BACKGROUND_CONCURRENCY', '2')),
+            'admission_limits': cls._parse_tool_limits(getenv('SONARQUBE_ADMISSION_LIMITS', '')),
+            'max_message_bytes': int(getenv('SONARQUBE_MAX_MESSAGE_BYTES', str(16 * 1024 * 1024))),
+            'tool_workers': int(getenv('SONARQUBE_TOOL_WORKERS', '8')),
+            'tool_queue_size': int(getenv('SONARQUBE_TOOL_QUEUE_SIZE', '64')),
+            'tool_timeouts': cls._parse_tool_limits(getenv('SONARQUBE_TOOL_TIMEOUTS', '')),
+            'tool_latency_budgets': cls._parse_tool_limits(getenv('SONARQUBE_TOOL_LATENCY_BUDGETS', '')),
+            'tool_cache_ttls': cls._parse_tool_limits(getenv('SONARQUBE_TOOL_CACHE_TTLS', '')),
+            'tool_cache_max_bytes': int(getenv('SONARQUBE_TOOL_CACHE_MAX_BYTES', str(16 * 1024 * 1024))),
+            'result_page_items': int(getenv('SONARQUBE_RESULT_PAGE_ITEMS', '100')),
+            'cursor_ttl': int(getenv('SONARQUBE_CURSOR_TTL', '300')),
+            'cursor_max_bytes': int(getenv('SONARQUBE_CURSOR_MAX_BYTES', str(32 * 1024 * 1024))),
+            'result_format': getenv('SONARQUBE_RESULT_FORMAT', 'standard').lower(),
+            'transport': getenv('SONARQUBE_TRANSPORT', 'stdio').lower(),
+            'http_host': getenv('SONARQUBE_HTTP_HOST', '127.0.0.1'),
+            'http_port': int(getenv('SONARQUBE_HTTP_PORT', '8765')),
+            'http_session_ttl': int(getenv('SONARQUBE_HTTP_SESSION_TTL', '3600')),
+            'http_allowed_origins': [
+                origin.strip() for origin in getenv('SONARQUBE_HTTP_ALLOWED_ORIGINS', '').split(',') if origin.strip()
+            ],
+            'http_auth_token': getenv('SONARQUBE_HTTP_AUTH_TOKEN') or None,
+            'daemon_enabled': getenv('SONARQUBE_DAEMON', 'false').lower() == 'true',
+            'daemon_socket': getenv('SONARQUBE_DAEMON_SOCKET', str(Path.home() / '.sonarqube_mcp' / 'daemon.sock')),
+            'daemon_idle_timeout': int(getenv('SONARQUBE_DAEMON_IDLE_TIMEOUT', '1800')),
+            'warmup_enabled': getenv('SONARQUBE_WARMUP', 'false').lower() == 'true',
+            'warmup_ttl': int(getenv('SONARQUBE_WARMUP_TTL', '120')),
         }
         
         # Charger le projet par défaut depuis l'environnement
-        default_project_key = os.getenv('SONARQUBE_PROJECT_KEY')
+        default_project_key = getenv('SONARQUBE_PROJECT_KEY')
         if default_project_key:
             config_data['default_project'] = ProjectConfig(
                 key=default_project_key,
-                name=os.getenv('SONARQUBE_PROJECT_NAME'),
-                branch=os.getenv('SONARQUBE_PROJECT_BRANCH', 'main'),
-                assignee=os.getenv('SONARQUBE_USER'),
+                name=getenv('SONARQUBE_PROJECT_NAME'),
+                branch=getenv('SONARQUBE_PROJECT_BRANCH', 'main'),
+                assignee=getenv('SONARQUBE_USER'),
             )
         
         # Charger depuis le fichier de configuration si fourni
@@ -127,6 +257,31 @@ class SonarQubeConfig:
         
         return cls(**config_data)
     
+    @staticmethod
+    def _parse_tool_limits(value: str) -> Dict[str, float]:
+        """
+        Analyse une liste de limites par outil.
+        
+        Args:
+            value: Chaîne au format "outil=secondes,outil2=secondes" (ou type=secondes)
+        
+        Returns:
+            Dictionnaire outil (ou type de ressource) → secondes
+        
+        Raises:
+            ValueError: Si une entrée est mal formée
+        """
+        limits = {}
+        for entry in value.split(','):
+            entry = entry.strip()
+            if not entry:
+                continue
+            name, sep, seconds = entry.partition('=')
+            if not sep or not name.strip():
+                raise ValueError(f"Limite d'outil invalide: '{entry}' (attendu: outil=secondes)")
+            limits[name.strip()] = float(seconds)
+        return limits
+    
     @staticmethod
     def _load_config_file(config_file: str) -> Dict[str, Any]:
         """
@@ -146,6 +301,8 @@ class SonarQubeConfig:
         if not config_path.exists():
             raise FileNotFoundError(f"Fichier de configuration non trouvé : {config_file}")
         
+        import yaml
+        
         with open(config_path, 'r', encoding='utf-8') as f:
             config = yaml.safe_load(f)
         
@@ -197,6 +354,43 @@ class SonarQubeConfig:
             'max_retries': self.max_retries,
             'page_size': self.page_size,
             'verify_ssl': self.verify_ssl,
+            'source_cache_max_lines': self.source_cache_max_lines,
+            'analysis_check_interval': self.analysis_check_interval,
+            'subscription_poll_interval': self.subscription_poll_interval,
+            'resource_cache_ttls': dict(self.resource_cache_ttls),
+            'quality_gate_refresh_after': self.quality_gate_refresh_after,
+            'quality_gate_max_staleness': self.quality_gate_max_staleness,
+            'negative_cache_ttl': self.negative_cache_ttl,
+            'disk_cache_max_bytes': self.disk_cache_max_bytes,
+            'disk_cache_dir': self.disk_cache_dir,
+            'disk_cache_compression': self.disk_cache_compression,
+            'disk_cache_ttl': self.disk_cache_ttl,
+            'max_concurrent_requests': self.max_concurrent_requests,
+            'max_pending_requests': self.max_pending_requests,
+            'interactive_concurrency': self.interactive_concurrency,
+            'background_concurrency': self.background_concurrency,
+            'admission_limits': dict(self.admission_limits),
+            'max_message_bytes': self.max_message_bytes,
+            'tool_workers': self.tool_workers,
+            'tool_queue_size': self.tool_queue_size,
+            'tool_timeouts': dict(self.tool_timeouts),
+            'tool_latency_budgets': dict(self.tool_latency_budgets),
+            'tool_cache_ttls': dict(self.tool_cache_ttls),
+            'tool_cache_max_bytes': self.tool_cache_max_bytes,
+            'result_page_items': self.result_page_items,
+            'cursor_ttl': self.cursor_ttl,
+            'cursor_max_bytes': self.cursor_max_bytes,
+            'result_format': self.result_format,
+            'transport': self.transport,
+            'http_host': self.http_host,
+            'http_port': self.http_port,
+            'http_session_ttl': self.http_session_ttl,
+            'http_allowed_origins': list(self.http_allowed_origins),
+            'daemon_enabled': self.daemon_enabled,
+            'daemon_socket': self.daemon_socket,
+            'daemon_idle_timeout': self.daemon_idle_timeout,
+            'warmup_enabled': self.warmup_enabled,
+            'warmup_ttl': self.warmup_ttl,
             'default_project': self.default_project.__dict__ if self.default_project else None,
             'projects': {k: v.__dict__ for k, v in self.projects.items()},
         }
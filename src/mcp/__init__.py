@@ -1,9 +1,22 @@
 """Module MCP (Model Context Protocol) pour SonarQube."""
 
-from .server import MCPServer
-from .tools_registry import MCPToolsRegistry
+import importlib
 
-__all__ = ['MCPServer', 'MCPToolsRegistry']
+# Imports différés : le transport HTTP (http.server) n'est chargé qu'en mode http
+_EXPORTS = {
+    'MCPServer': '.server',
+    'MCPToolsRegistry': '.tools_registry',
+    'MCPHTTPTransport': '.http_transport',
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ['MCPServer', 'MCPToolsRegistry', 'MCPHTTPTransport']
 
 
 
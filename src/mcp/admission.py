@@ -0,0 +1,105 @@
+"""Admission des requêtes entrantes : file bornée et limites par méthode."""
+
+import threading
+from typing import Dict, Any, Optional, Iterable
+
+# Code d'erreur JSON-RPC (plage serveur -32000..-32099) renvoyé quand une requête est refusée
+OVERLOADED = -32001
+
+
+class AdmissionController:
+    """
+    File d'entrée bornée des requêtes lentes (tools/call, resources/read, batch...).
+
+    - max_pending requêtes admises au plus (en cours + en attente), toutes méthodes
+    - Limite propre à chaque méthode ; les méthodes sans limite déclarée partagent
+      la limite '*'
+    - Une requête refusée n'est pas mise en attente : l'appelant répond aussitôt
+      par une erreur OVERLOADED
+    - Les méthodes exemptées (ping, initialize, tools/list...) sont toujours admises
+    """
+
+    DEFAULT_LIMITS = {'tools/call': 48, 'resources/read': 16, 'batch': 8, '*': 8}
+
+    def __init__(self, max_pending: int = 64, limits: Optional[Dict[str, float]] = None,
+                 exempt: Iterable[str] = ()):
+        """
+        Initialise l'admission.
+
+        Args:
+            max_pending: Nombre maximal de requêtes admises simultanément
+            limits: Surcharges des limites par méthode ('*' : autres méthodes)
+            exempt: Méthodes toujours admises, non comptées
+        """
+        self.max_pending = max_pending
+        self.limits = dict(self.DEFAULT_LIMITS)
+        self.limits.update({method: int(limit) for method, limit in (limits or {}).items()})
+        self.exempt = frozenset(exempt)
+        self._pending: Dict[str, int] = {}
+        self._admitted: Dict[str, int] = {}
+        self._rejected: Dict[str, int] = {}
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def _bucket(self, method: Optional[str]) -> str:
+        """Compteur d'une méthode (les noms viennent du client : seules les méthodes déclarées ont le leur)."""
+        return method if method in self.limits else '*'
+
+    def try_acquire(self, method: Optional[str]) -> bool:
+        """
+        Admet une requête si la file et la limite de sa méthode le permettent.
+
+        Returns:
+            True si la requête est admise (release() à appeler à la fin du traitement)
+        """
+        if method in self.exempt:
+            return True
+        bucket = self._bucket(method)
+        with self._lock:
+            pending = self._pending.get(bucket, 0)
+            if self._total >= self.max_pending or pending >= self.limits[bucket]:
+                self._rejected[bucket] = self._rejected.get(bucket, 0) + 1
+                return False
+            self._pending[bucket] = pending + 1
+            self._admitted[bucket] = self._admitted.get(bucket, 0) + 1
+            self._total += 1
+            return True
+
+    def release(self, method: Optional[str]):
+        """Libère la place d'une requête admise."""
+        if method in self.exempt:
+            return
+        bucket = self._bucket(method)
+        with self._lock:
+            self._pending[bucket] -= 1
+            self._total -= 1
+
+    def limit_data(self, method: Optional[str]) -> Dict[str, Any]:
+        """Détails joints à l'erreur OVERLOADED (champ error.data)."""
+        bucket = self._bucket(method)
+        with self._lock:
+            return {
+                'method': method,
+                'pending': self._pending.get(bucket, 0),
+                'limit': self.limits[bucket],
+                'max_pending': self.max_pending,
+            }
+
+    def stats(self) -> Dict[str, Any]:
+        """Retourne les compteurs d'admission (par méthode et au total)."""
+        with self._lock:
+            buckets = sorted(set(self._admitted) | set(self._rejected))
+            return {
+                'pending': self._total,
+                'max_pending': self.max_pending,
+                'rejected': sum(self._rejected.values()),
+                'methods': {
+                    bucket: {
+                        'pending': self._pending.get(bucket, 0),
+                        'limit': self.limits[bucket],
+                        'admitted': self._admitted.get(bucket, 0),
+                        'rejected': self._rejected.get(bucket, 0),
+                    }
+                    for bucket in buckets
+                },
+            }
@@ -0,0 +1,440 @@
+"""
+Démon local partagé (socket Unix).
+
+Un seul processus possède les clients API, les connexions HTTP et les caches ;
+les shims stdio (sonarqube_mcp_server.py) et le CLI (sonarqube_cli.py) lui
+transmettent leurs requêtes et le démarrent s'il n'est pas lancé.
+
+Protocole : une ligne JSON d'ouverture (mode, variables SONARQUBE_* du client,
+fichier de configuration), puis
+- mode "mcp" : le flux JSON-RPC du client, relayé tel quel dans les deux sens
+- mode "cli" : la commande et ses arguments ; le démon répond par une ligne
+  {"success", "output"} puis ferme la connexion
+
+Chaque jeu de variables (URL, token, options) a son propre MCPServer : deux
+tokens ne partagent ni client API, ni cache mémoire, ni cache disque.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import hashlib
+import logging
+import threading
+import subprocess
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple
+
+from ..config import SonarQubeConfig
+from .framing import MessageReader, MessageWriter
+
+logger = logging.getLogger(__name__)
+
+ENV_PREFIX = 'SONARQUBE_'
+# Réglages du processus démon (logs), seules variables SONARQUBE_* qui lui sont transmises
+DAEMON_ENV = ('SONARQUBE_LOG_DIR', 'SONARQUBE_LOG_LEVEL')
+ROOT = Path(__file__).resolve().parents[2]
+
+
+class DaemonUnavailableError(OSError):
+    """Exception levée quand le démon ne peut être ni joint ni démarré."""
+    pass
+
+
+def is_supported() -> bool:
+    """Sockets Unix disponibles sur la plateforme."""
+    return hasattr(socket, 'AF_UNIX')
+
+
+def client_environ(environ: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Variables SONARQUBE_* transmises au démon (configuration du client)."""
+    environ = os.environ if environ is None else environ
+    return {name: value for name, value in environ.items() if name.startswith(ENV_PREFIX)}
+
+
+def tenant_key(environ: Dict[str, str], config_file: Optional[str] = None) -> str:
+    """
+    Identifiant de l'état partagé par les clients de même configuration.
+
+    Le token fait partie de l'empreinte : deux tokens ne partagent jamais un état.
+    """
+    stamp = None
+    if config_file:
+        try:
+            stamp = os.stat(config_file).st_mtime_ns
+        except OSError:
+            pass
+    raw = json.dumps([sorted(environ.items()), config_file, stamp])
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def connect(config: SonarQubeConfig, autostart: bool = True, timeout: float = 5.0) -> socket.socket:
+    """
+    Se connecte au démon, en le démarrant s'il n'écoute pas.
+
+    Args:
+        config: Configuration du client (chemin du socket, délai d'inactivité)
+        autostart: Démarrer le démon s'il est absent
+        timeout: Attente maximale (secondes) du démarrage
+
+    Raises:
+        DaemonUnavailableError: Si le démon ne répond pas
+    """
+    if not is_supported():
+        raise DaemonUnavailableError("Sockets Unix indisponibles sur cette plateforme")
+    path = os.path.expanduser(config.daemon_socket)
+    try:
+        return _connect(path)
+    except OSError as e:
+        if not autostart:
+            raise DaemonUnavailableError(f"Démon injoignable: {e}")
+
+    start_daemon(config)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return _connect(path)
+        except OSError as e:
+            if time.monotonic() >= deadline:
+                raise DaemonUnavailableError(f"Démon non démarré après {timeout}s: {e}")
+            time.sleep(0.02)
+
+
+def _connect(path: str) -> socket.socket:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def daemon_environ(environ: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Environnement du processus démon : celui du client sans ses variables SONARQUBE_*.
+
+    Le démon sert plusieurs configurations, chacune transmise à la connexion ;
+    hériter du token du premier client l'exposerait aux suivants.
+    """
+    environ = os.environ if environ is None else environ
+    return {name: value for name, value in environ.items()
+            if not name.startswith(ENV_PREFIX) or name in DAEMON_ENV}
+
+
+def start_daemon(config: SonarQubeConfig):
+    """Lance le démon dans un processus détaché (sa sortie est écrite dans les logs)."""
+    logger.info(f"Démarrage du démon partagé sur {config.daemon_socket}")
+    subprocess.Popen(
+        [sys.executable, str(ROOT / 'sonarqube_mcp_server.py'), '--daemon',
+         '--socket', os.path.expanduser(config.daemon_socket), '--idle-timeout', str(config.daemon_idle_timeout)],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        env=daemon_environ(), start_new_session=True, close_fds=True
+    )
+
+
+def _hello(sock: socket.socket, mode: str, config_file: Optional[str], **extra: Any):
+    """Envoie la ligne d'ouverture d'une connexion."""
+    hello = {
+        'mode': mode,
+        'environ': client_environ(),
+        'config_file': str(Path(config_file).resolve()) if config_file else None,
+    }
+    hello.update(extra)
+    sock.sendall(json.dumps(hello).encode('utf-8') + b'\n')
+
+
+def run_cli(config: SonarQubeConfig, command: str, args: List[str],
+            config_file: Optional[str] = None) -> Tuple[bool, str]:
+    """
+    Exécute une commande CLI dans le démon.
+
+    Returns:
+        Tuple (succès, résultat JSON à afficher)
+
+    Raises:
+        DaemonUnavailableError: Si le démon ne répond pas
+    """
+    sock = connect(config)
+    try:
+        _hello(sock, 'cli', config_file, command=command, args=args)
+        line = sock.makefile('rb').readline()
+    finally:
+        sock.close()
+    if not line:
+        raise DaemonUnavailableError("Connexion fermée par le démon")
+    reply = json.loads(line)
+    if 'error' in reply:
+        raise ValueError(reply['error'])
+    return reply['success'], reply['output']
+
+
+def relay_stdio(config: SonarQubeConfig, stdin=None, stdout=None):
+    """
+    Relaie le flux JSON-RPC de stdin/stdout vers le démon jusqu'à la fin de stdin.
+
+    Raises:
+        DaemonUnavailableError: Si le démon ne répond pas
+    """
+    stdin = stdin if stdin is not None else sys.stdin.buffer
+    stdout = stdout if stdout is not None else sys.stdout.buffer
+    sock = connect(config)
+    _hello(sock, 'mcp', None)
+
+    def upstream():
+        try:
+            while True:
+                chunk = stdin.read1(65536)
+                if not chunk:
+                    break
+                sock.sendall(chunk)
+        except OSError as e:
+            logger.debug(f"Relais vers le démon interrompu: {e}")
+        finally:
+            # Fin de stdin : le démon termine les requêtes en cours puis ferme
+            try:
+                sock.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass
+
+    thread = threading.Thread(target=upstream, name="mcp-relay", daemon=True)
+    thread.start()
+    try:
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            stdout.write(chunk)
+            stdout.flush()
+    finally:
+        sock.close()
+
+
+class SharedDaemon:
+    """
+    Démon à l'écoute sur un socket Unix.
+
+    - Un MCPServer par configuration cliente (tenant_key), créé à la première connexion
+    - Le cache disque de chaque configuration est placé dans son propre sous-dossier
+    - Un seul démon par socket (verrou sur <socket>.lock) ; un socket orphelin est remplacé
+    - Serveur d'une configuration sans connexion depuis tenant_idle_timeout secondes
+      arrêté et retiré (0 = jamais)
+    - Arrêt après idle_timeout secondes sans connexion (0 = jamais)
+    """
+
+    def __init__(self, socket_path: str, idle_timeout: float = 1800, tenant_idle_timeout: float = 600):
+        """
+        Initialise le démon.
+
+        Args:
+            socket_path: Chemin du socket Unix
+            idle_timeout: Inactivité (secondes) avant arrêt
+            tenant_idle_timeout: Inactivité (secondes) d'une configuration avant arrêt de son serveur
+        """
+        self.socket_path = os.path.expanduser(socket_path)
+        self.idle_timeout = idle_timeout
+        self.tenant_idle_timeout = tenant_idle_timeout
+        self._servers: Dict[str, Any] = {}
+        # Connexions ouvertes et dernier usage de chaque configuration (éviction)
+        self._tenant_connections: Dict[str, int] = {}
+        self._tenant_last_used: Dict[str, float] = {}
+        self._servers_lock = threading.Lock()
+        self._connections = 0
+        self._last_activity = time.monotonic()
+        self._activity_lock = threading.Lock()
+        self._listener: Optional[socket.socket] = None
+        self._lock_file = None
+        self._stopped = threading.Event()
+
+    def bind(self) -> bool:
+        """
+        Prend le verrou du socket et commence l'écoute.
+
+        Returns:
+            False si un autre démon possède déjà le socket
+        """
+        import fcntl
+
+        path = Path(self.socket_path)
+        path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        self._lock_file = open(f"{self.socket_path}.lock", 'w')
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self._lock_file.close()
+            self._lock_file = None
+            return False
+
+        # Socket d'un démon arrêté sans nettoyage
+        if path.exists():
+            path.unlink()
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            listener.bind(self.socket_path)
+        finally:
+            os.umask(old_umask)
+        listener.listen(64)
+        listener.settimeout(1.0)
+        self._listener = listener
+        logger.info(f"Démon à l'écoute sur {self.socket_path}")
+        return True
+
+    def serve_forever(self):
+        """Accepte les connexions jusqu'à l'arrêt ou au délai d'inactivité."""
+        try:
+            while not self._stopped.is_set():
+                try:
+                    conn, _ = self._listener.accept()
+                except socket.timeout:
+                    self.evict_idle_tenants()
+                    if self._idle_expired():
+                        logger.info("Arrêt du démon (inactivité)")
+                        break
+                    continue
+                except OSError:
+                    if self._stopped.is_set():
+                        break
+                    raise
+                with self._activity_lock:
+                    self._connections += 1
+                threading.Thread(target=self._handle, args=(conn,), name="mcp-daemon-conn", daemon=True).start()
+                self.evict_idle_tenants()
+        finally:
+            self.shutdown()
+
+    def _idle_expired(self) -> bool:
+        with self._activity_lock:
+            return (self.idle_timeout > 0 and self._connections == 0
+                    and time.monotonic() - self._last_activity > self.idle_timeout)
+
+    def server_for(self, environ: Dict[str, str], config_file: Optional[str] = None):
+        """
+        Serveur MCP d'une configuration cliente (créé au premier usage).
+
+        Raises:
+            ValueError: Si la configuration est invalide
+        """
+        return self._open_tenant(environ, config_file, connect=False)[1]
+
+    def _open_tenant(self, environ: Dict[str, str], config_file: Optional[str],
+                     connect: bool = True) -> Tuple[str, Any]:
+        """Serveur d'une configuration et sa clé ; avec connect, compte une connexion ouverte."""
+        from .server import MCPServer
+
+        key = tenant_key(environ, config_file)
+        with self._servers_lock:
+            server = self._servers.get(key)
+            if server is None:
+                config = SonarQubeConfig.from_env(config_file, environ=environ)
+                config.disk_cache_dir = str(Path(config.disk_cache_dir) / key[:16])
+                server = self._servers[key] = MCPServer(config)
+                logger.info(f"Nouvelle configuration cliente ({len(self._servers)} au total)")
+            if connect:
+                self._tenant_connections[key] = self._tenant_connections.get(key, 0) + 1
+            self._tenant_last_used[key] = time.monotonic()
+            return key, server
+
+    def _close_tenant(self, key: str):
+        """Fin d'une connexion à une configuration."""
+        with self._servers_lock:
+            # Configuration déjà retirée par l'arrêt du démon
+            if key in self._tenant_connections:
+                self._tenant_connections[key] -= 1
+                self._tenant_last_used[key] = time.monotonic()
+
+    def evict_idle_tenants(self) -> int:
+        """
+        Arrête les serveurs des configurations sans connexion depuis tenant_idle_timeout.
+
+        Returns:
+            Nombre de serveurs arrêtés
+        """
+        if self.tenant_idle_timeout <= 0:
+            return 0
+        now = time.monotonic()
+        with self._servers_lock:
+            expired = [key for key in self._servers
+                       if not self._tenant_connections.get(key)
+                       and now - self._tenant_last_used.get(key, now) > self.tenant_idle_timeout]
+            servers = [self._servers.pop(key) for key in expired]
+            for key in expired:
+                self._tenant_connections.pop(key, None)
+                self._tenant_last_used.pop(key, None)
+        for server in servers:
+            self._stop_server(server)
+        if servers:
+            logger.info(f"{len(servers)} configuration(s) cliente(s) inactive(s) retirée(s) "
+                        f"({len(self._servers)} restante(s))")
+        return len(servers)
+
+    @staticmethod
+    def _stop_server(server):
+        """Arrête les threads de fond et le pool d'outils d'un serveur."""
+        server.subscriptions.shutdown()
+        server.resources.shutdown()
+        server.tool_executor.shutdown(wait=False)
+
+    def _handle(self, conn: socket.socket):
+        """Traite une connexion (shim stdio ou CLI)."""
+        key = None
+        try:
+            reader = MessageReader(conn.makefile('rb'))
+            writer = MessageWriter(conn.makefile('wb'))
+            line = reader.read_message()
+            if not line:
+                return
+            hello = json.loads(line.decode('utf-8'))
+            try:
+                key, server = self._open_tenant(hello.get('environ') or {}, hello.get('config_file'))
+            except (ValueError, FileNotFoundError) as e:
+                writer.write(json.dumps({'error': str(e)}, ensure_ascii=False))
+                return
+            if hello.get('mode') == 'cli':
+                self._serve_cli(server, hello, writer)
+            else:
+                # Flux JSON-RPC d'un shim stdio : même dispatch que le mode stdio
+                server.serve(reader, writer)
+        except Exception as e:
+            logger.error(f"Erreur de connexion au démon: {e}", exc_info=True)
+        finally:
+            if key is not None:
+                self._close_tenant(key)
+            # Les fichiers de makefile() gardent le descripteur ouvert : fermer explicitement
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            conn.close()
+            with self._activity_lock:
+                self._connections -= 1
+                self._last_activity = time.monotonic()
+
+    @staticmethod
+    def _serve_cli(server, hello: Dict[str, Any], writer: MessageWriter):
+        """Exécute une commande CLI avec le gestionnaire de commandes partagé."""
+        result = server.command_handler.execute(hello.get('command'), hello.get('args') or [])
+        writer.write(json.dumps({'success': result.success, 'output': result.to_json()}, ensure_ascii=False))
+
+    def shutdown(self):
+        """Arrête l'écoute et les serveurs des configurations clientes."""
+        self._stopped.set()
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+        with self._servers_lock:
+            servers = list(self._servers.values())
+            self._servers.clear()
+            self._tenant_connections.clear()
+            self._tenant_last_used.clear()
+        for server in servers:
+            self._stop_server(server)
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
@@ -0,0 +1,209 @@
+"""Pool de threads borné pour l'exécution des outils MCP."""
+
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorSaturatedError(Exception):
+    """Exception levée lorsque la file d'attente du pool reste pleine."""
+    pass
+
+
+class BoundedExecutor:
+    """
+    Pool de threads réutilisables avec file d'attente bornée.
+
+    - submit() bloque quand la file est pleine (backpressure) puis lève
+      ExecutorSaturatedError après block_timeout
+    - Un travail abandonné (timeout) continue de tourner : il est compté comme
+      "leaked" et un thread de remplacement est démarré, dans la limite de max_leaked
+    """
+
+    def __init__(self, max_workers: int = 8, max_queued: int = 64, max_leaked: Optional[int] = None,
+                 name: str = "mcp-tool"):
+        """
+        Initialise le pool.
+
+        Args:
+            max_workers: Nombre de threads permanents
+            max_queued: Taille maximale de la file d'attente
+            max_leaked: Nombre maximal de threads de remplacement (défaut: max_workers)
+            name: Préfixe des noms de threads
+        """
+        self.max_workers = max_workers
+        self.max_leaked = max_workers if max_leaked is None else max_leaked
+        self.name = name
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queued)
+        self._lock = threading.Lock()
+        self._threads: Set[threading.Thread] = set()
+        self._abandoned: Set[Future] = set()
+        self._active = 0
+        self._shutdown = False
+        self._thread_counter = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def submit(self, fn: Callable[..., Any], *args: Any, block_timeout: Optional[float] = None) -> Future:
+        """
+        Soumet un travail au pool.
+
+        Args:
+            fn: Fonction à exécuter
+            *args: Arguments de la fonction
+            block_timeout: Attente maximale (secondes) d'une place dans la file (None = illimitée)
+
+        Returns:
+            Future du résultat
+
+        Raises:
+            ExecutorSaturatedError: Si la file est restée pleine pendant block_timeout
+            RuntimeError: Si le pool est arrêté
+        """
+        if self._shutdown:
+            raise RuntimeError("Pool arrêté")
+
+        future: Future = Future()
+        self._ensure_workers()
+        try:
+            self._queue.put((future, fn, args), timeout=block_timeout)
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+            raise ExecutorSaturatedError(
+                f"File d'attente pleine ({self._queue.maxsize} travaux en attente)"
+            )
+        return future
+
+    def abandon(self, future: Future):
+        """
+        Abandonne un travail dont le résultat n'est plus attendu (timeout).
+
+        Un travail encore en file est annulé ; un travail en cours est compté
+        comme "leaked" et un thread de remplacement préserve la capacité du pool.
+
+        Args:
+            future: Future retournée par submit()
+        """
+        if future.cancel():
+            return
+
+        with self._lock:
+            if future.done() or future in self._abandoned:
+                return
+            self._abandoned.add(future)
+            replacement = None
+            if len(self._threads) < self.max_workers + self.max_leaked:
+                replacement = self._new_worker()
+
+        if replacement:
+            replacement.start()
+        else:
+            logger.warning(f"{self.name}: limite de threads de remplacement atteinte ({self.max_leaked})")
+
+    def _ensure_workers(self):
+        """Démarre les threads permanents manquants."""
+        with self._lock:
+            missing = self.max_workers - len(self._threads)
+            threads = [self._new_worker() for _ in range(max(missing, 0))]
+        for thread in threads:
+            thread.start()
+
+    def _new_worker(self) -> threading.Thread:
+        """Crée un thread de travail (à appeler sous self._lock, à démarrer ensuite)."""
+        self._thread_counter += 1
+        thread = threading.Thread(target=self._worker, name=f"{self.name}-{self._thread_counter}")
+        thread.daemon = True
+        self._threads.add(thread)
+        return thread
+
+    def _worker(self):
+        """Boucle d'un thread : exécute les travaux de la file."""
+        current = threading.current_thread()
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            future, fn, args = item
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            with self._lock:
+                self._active += 1
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self.completed += 1
+                    retire = future in self._abandoned and len(self._threads) > self.max_workers
+                    self._abandoned.discard(future)
+                    if retire:
+                        self._threads.discard(current)
+            if retire:
+                # Thread excédentaire (remplacé pendant le travail abandonné)
+                return
+
+        with self._lock:
+            self._threads.discard(current)
+
+    def stats(self) -> Dict[str, int]:
+        """Retourne les compteurs du pool."""
+        with self._lock:
+            return {
+                'workers': len(self._threads),
+                'active': self._active,
+                'queued': self._queue.qsize(),
+                'leaked': len(self._abandoned),
+                'completed': self.completed,
+                'rejected': self.rejected,
+            }
+
+    def shutdown(self, wait: bool = True, timeout: Optional[float] = None):
+        """
+        Arrête le pool.
+
+        Avec wait, les travaux en file sont exécutés avant l'arrêt des threads ; sans
+        wait, ils sont annulés. Ne bloque jamais sur une file pleine dont les threads
+        sont occupés (travaux bloqués) : les travaux en file sont alors annulés.
+
+        Args:
+            wait: Attendre la fin des travaux en file et des threads
+            timeout: Attente maximale (secondes) par thread, utile si des travaux ont été abandonnés
+        """
+        self._shutdown = True
+        with self._lock:
+            threads = list(self._threads)
+        if not wait:
+            self._cancel_queued()
+        for _ in threads:
+            while True:
+                try:
+                    if wait:
+                        self._queue.put(None, timeout=timeout)
+                    else:
+                        self._queue.put_nowait(None)
+                    break
+                except queue.Full:
+                    # Threads occupés : libérer la file pour les signaux d'arrêt
+                    self._cancel_queued()
+        if wait:
+            for thread in threads:
+                thread.join(timeout)
+
+    def _cancel_queued(self):
+        """Vide la file d'attente et annule les travaux qui n'ont pas démarré."""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not None:
+                item[0].cancel()
@@ -0,0 +1,123 @@
+"""Découpage des messages JSON-RPC du transport stdio (une ligne UTF-8 par message)."""
+
+import io
+import os
+import threading
+from typing import BinaryIO, Optional, Union
+
+
+class MessageTooLargeError(ValueError):
+    """Exception levée pour une ligne dépassant la taille maximale autorisée."""
+
+    def __init__(self, size: int, max_bytes: int):
+        super().__init__(f"Message de plus de {max_bytes} octets ignoré ({size} octets lus)")
+        self.size = size
+        self.max_bytes = max_bytes
+
+
+class MessageReader:
+    """
+    Lit les messages sur un flux binaire (sys.stdin.buffer).
+
+    Les lignes sont lues par blocs bornés : une ligne trop longue est consommée
+    jusqu'à son terme sans être conservée en mémoire, puis signalée.
+    """
+
+    CHUNK_BYTES = 1024 * 1024
+
+    def __init__(self, stream: BinaryIO, max_bytes: int = 16 * 1024 * 1024):
+        """
+        Initialise la lecture.
+
+        Args:
+            stream: Flux binaire d'entrée
+            max_bytes: Taille maximale d'un message (octets, fin de ligne exclue)
+        """
+        self.stream = stream
+        self.max_bytes = max_bytes
+
+    def read_message(self) -> Optional[bytes]:
+        """
+        Lit le message suivant.
+
+        Returns:
+            Ligne lue (octets UTF-8, fin de ligne incluse) ou None en fin de flux
+
+        Raises:
+            MessageTooLargeError: Si la ligne dépasse max_bytes (elle est ignorée)
+        """
+        line = self.stream.readline(self.max_bytes + 1)
+        if not line:
+            return None
+        if len(line) <= self.max_bytes or line.endswith(b'\n'):
+            return line
+
+        # Ligne trop longue : consommer la suite sans la conserver
+        size = len(line)
+        while True:
+            chunk = self.stream.readline(self.CHUNK_BYTES)
+            size += len(chunk)
+            if not chunk or chunk.endswith(b'\n'):
+                raise MessageTooLargeError(size, self.max_bytes)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> bytes:
+        line = self.read_message()
+        if line is None:
+            raise StopIteration
+        return line
+
+
+class MessageWriter:
+    """
+    Écrit les messages sur un flux binaire (sys.stdout.buffer).
+
+    Chaque message est encodé en UTF-8 avec sa fin de ligne puis écrit en un seul
+    appel système directement sur le descripteur (sans double tampon ni flush) ;
+    les écritures sont sérialisées entre threads.
+    """
+
+    def __init__(self, stream: BinaryIO):
+        """
+        Initialise l'écriture.
+
+        Args:
+            stream: Flux binaire de sortie
+        """
+        self.stream = stream
+        self._lock = threading.Lock()
+        self._fd = self._fileno(stream)
+        self.messages = 0
+        self.bytes_written = 0
+
+    def write(self, data: Union[str, bytes]):
+        """
+        Écrit un message déjà encodé en JSON.
+
+        Args:
+            data: Message JSON (texte ou octets UTF-8, sans fin de ligne)
+        """
+        payload = (data + '\n').encode('utf-8') if isinstance(data, str) else data + b'\n'
+        with self._lock:
+            if self._fd is None:
+                self.stream.write(payload)
+                self.stream.flush()
+            else:
+                view = memoryview(payload)
+                while view:
+                    view = view[os.write(self._fd, view):]
+            self.messages += 1
+            self.bytes_written += len(payload)
+
+    @staticmethod
+    def _fileno(stream: BinaryIO) -> Optional[int]:
+        """Descripteur du flux (None pour un flux en mémoire)."""
+        try:
+            fd = stream.fileno()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            return None
+        # Vider le tampon avant d'écrire directement sur le descripteur
+        stream.flush()
+        return fd
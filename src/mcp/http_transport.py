@@ -0,0 +1,461 @@
+"""Transport HTTP « streamable » du serveur MCP : un processus, plusieurs clients."""
+
+import json
+import time
+import queue
+import logging
+import secrets
+import threading
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional, List, Callable
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+SESSION_HEADER = 'Mcp-Session-Id'
+
+# Origines acceptées (protection contre le DNS rebinding)
+_LOCAL_HOSTS = frozenset({'localhost', '127.0.0.1', '::1'})
+
+
+@dataclass
+class HTTPSession:
+    """Session d'un client du transport HTTP."""
+
+    session_id: str
+    client_info: Dict[str, Any] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.monotonic)
+    last_seen: float = field(default_factory=time.monotonic)
+    requests: int = 0
+    # Messages initiés par le serveur, diffusés sur le flux SSE ouvert par GET
+    outbox: "queue.Queue" = field(default_factory=queue.Queue)
+    closed: bool = False
+
+    def send(self, message: Dict[str, Any]):
+        """
+        Met en file un message serveur → client (notification).
+
+        Raises:
+            ConnectionError: Si la session est fermée ou expirée (l'abonné est alors retiré)
+        """
+        if self.closed:
+            raise ConnectionError(f"Session {self.session_id} fermée")
+        self.outbox.put(message)
+
+
+class SessionManager:
+    """Sessions des clients HTTP, expirées après une période d'inactivité."""
+
+    def __init__(self, ttl: float = 3600, max_sessions: int = 1000):
+        """
+        Initialise le gestionnaire.
+
+        Args:
+            ttl: Inactivité maximale (secondes) avant expiration d'une session
+            max_sessions: Nombre maximal de sessions simultanées
+        """
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._sessions: Dict[str, HTTPSession] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.expired = 0
+
+    def create(self, client_info: Optional[Dict[str, Any]] = None) -> HTTPSession:
+        """
+        Crée une session (à la requête initialize).
+
+        Args:
+            client_info: clientInfo transmis par le client
+
+        Returns:
+            Nouvelle session
+        """
+        session = HTTPSession(session_id=secrets.token_hex(16), client_info=client_info or {})
+        with self._lock:
+            self._purge_expired()
+            if len(self._sessions) >= self.max_sessions:
+                # Libérer la session la moins récemment utilisée
+                oldest = min(self._sessions.values(), key=lambda s: s.last_seen)
+                self._remove(oldest.session_id)
+            self._sessions[session.session_id] = session
+            self.created += 1
+        logger.info(f"Session HTTP ouverte: {session.session_id} ({session.client_info.get('name', 'client inconnu')})")
+        return session
+
+    def get(self, session_id: Optional[str]) -> Optional[HTTPSession]:
+        """
+        Récupère une session active et met à jour sa date d'activité.
+
+        Args:
+            session_id: Identifiant transmis dans l'en-tête Mcp-Session-Id
+
+        Returns:
+            Session ou None si inconnue ou expirée
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            now = time.monotonic()
+            if now - session.last_seen > self.ttl:
+                self._remove(session_id)
+                self.expired += 1
+                return None
+            session.last_seen = now
+            session.requests += 1
+            return session
+
+    def close(self, session_id: Optional[str]) -> bool:
+        """
+        Termine une session.
+
+        Returns:
+            True si la session existait
+        """
+        with self._lock:
+            return self._remove(session_id)
+
+    def sessions(self) -> List[HTTPSession]:
+        """Retourne les sessions actives."""
+        with self._lock:
+            self._purge_expired()
+            return list(self._sessions.values())
+
+    def _remove(self, session_id: Optional[str]) -> bool:
+        """Retire une session (à appeler sous self._lock) et ferme son flux SSE."""
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            return False
+        session.closed = True
+        session.outbox.put(None)
+        return True
+
+    def _purge_expired(self):
+        """Retire les sessions inactives (à appeler sous self._lock)."""
+        limit = time.monotonic() - self.ttl
+        for session_id in [sid for sid, s in self._sessions.items() if s.last_seen < limit]:
+            self._remove(session_id)
+            self.expired += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Retourne les compteurs de sessions."""
+        with self._lock:
+            return {
+                'active': len(self._sessions),
+                'created': self.created,
+                'expired': self.expired,
+                'requests': sum(s.requests for s in self._sessions.values()),
+            }
+
+
+class MCPHTTPTransport:
+    """
+    Transport streamable HTTP (spécification MCP) sur le dispatch de MCPServer.
+
+    - POST /mcp : un message ou un batch JSON-RPC, réponse JSON ou flux SSE (selon Accept,
+      ou dès qu'un appel porte un progressToken : avancement puis réponse sur le même flux)
+    - GET /mcp : flux SSE des messages initiés par le serveur pour la session
+    - DELETE /mcp : fin de session
+
+    Tous les clients partagent le même MCPServer : pools de connexions, caches et
+    pool d'exécution des outils.
+    """
+
+    ENDPOINT = '/mcp'
+    KEEPALIVE_INTERVAL = 15
+
+    def __init__(self, server, host: str = '127.0.0.1', port: int = 8765):
+        """
+        Initialise le transport.
+
+        Args:
+            server: Instance de MCPServer partagée entre les clients
+            host: Adresse d'écoute
+            port: Port d'écoute (0 = port libre choisi par le système)
+        """
+        self.server = server
+        self.auth_token = server.config.http_auth_token
+        self.allowed_origins = {_normalize_origin(origin) for origin in server.config.http_allowed_origins}
+        if host not in _LOCAL_HOSTS and not self.auth_token:
+            # Sans secret, n'importe quel poste du réseau utiliserait le token SonarQube du serveur
+            raise ValueError(
+                f"SONARQUBE_HTTP_AUTH_TOKEN est requis pour écouter sur une adresse non locale ({host})"
+            )
+        self.sessions = SessionManager(ttl=server.config.http_session_ttl)
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        """URL de l'endpoint MCP."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{self.ENDPOINT}"
+
+    def _handler_class(self):
+        transport = self
+
+        class Handler(_MCPRequestHandler):
+            pass
+
+        Handler.transport = transport
+        return Handler
+
+    def serve_forever(self):
+        """Sert les requêtes jusqu'à l'arrêt (Ctrl+C ou shutdown())."""
+        logger.info(f"Démarrage serveur MCP en mode HTTP sur {self.url}")
+        try:
+            self.httpd.serve_forever()
+        except KeyboardInterrupt:
+            logger.info("Arrêt serveur MCP (Ctrl+C)")
+        finally:
+            self.httpd.server_close()
+
+    def start(self) -> "MCPHTTPTransport":
+        """Démarre le transport dans un thread d'arrière-plan."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="mcp-http", daemon=True)
+        self._thread.start()
+        return self
+
+    def shutdown(self):
+        """Arrête le transport et ferme les flux SSE ouverts."""
+        self._stopping.set()
+        for session in self.sessions.sessions():
+            self.sessions.close(session.session_id)
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join(5)
+
+    def is_allowed_origin(self, origin: Optional[str]) -> bool:
+        """
+        Vérifie l'en-tête Origin (protection DNS rebinding).
+
+        Les origines de http_allowed_origins sont acceptées ; sinon, un navigateur ne
+        peut joindre un serveur lié à une adresse locale que depuis une origine locale,
+        et un serveur lié à une adresse non locale depuis aucune autre origine.
+        """
+        if not origin:
+            return True
+        if _normalize_origin(origin) in self.allowed_origins:
+            return True
+        bound_host = self.httpd.server_address[0]
+        return bound_host in _LOCAL_HOSTS and urlsplit(origin).hostname in _LOCAL_HOSTS
+
+    def is_authorized(self, authorization: Optional[str]) -> bool:
+        """Vérifie l'en-tête Authorization (Bearer) si un secret partagé est configuré."""
+        if not self.auth_token:
+            return True
+        scheme, _, credentials = (authorization or '').partition(' ')
+        return scheme.lower() == 'bearer' and secrets.compare_digest(
+            credentials.strip().encode('utf-8'), self.auth_token.encode('utf-8')
+        )
+
+    def process(self, message: Any, notify: Optional[Callable[[Dict[str, Any]], None]] = None,
+                subscriber: Optional[Callable[[Dict[str, Any]], None]] = None) -> Optional[str]:
+        """
+        Traite un message ou un batch JSON-RPC.
+
+        Args:
+            message: Message décodé (objet ou tableau)
+            notify: Envoi des notifications au client pendant le traitement (optionnel)
+            subscriber: Envoi des notifications d'abonnement (flux GET de la session)
+
+        Returns:
+            Réponse encodée ou None si aucune réponse n'est attendue ; erreur
+            OVERLOADED si la file d'entrée du serveur est pleine
+        """
+        return self.server.process_message(message, notify, subscriber)
+
+
+def _normalize_origin(origin: str) -> str:
+    """Forme comparable d'une origine : schéma://hôte[:port] en minuscules."""
+    parts = urlsplit(origin.strip())
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def _expects_response(message: Any) -> bool:
+    """Vrai si le message (ou une entrée du batch) est une requête avec id."""
+    entries = message if isinstance(message, list) else [message]
+    return not entries or any(not isinstance(e, dict) or ('id' in e and 'method' in e) for e in entries)
+
+
+def _has_progress_token(message: Any) -> bool:
+    """Vrai si le message (ou une entrée du batch) demande des notifications d'avancement."""
+    entries = message if isinstance(message, list) else [message]
+    return any(
+        isinstance(e, dict) and isinstance(e.get('params'), dict)
+        and (e['params'].get('_meta') or {}).get('progressToken') is not None
+        for e in entries
+    )
+
+
+def _is_initialize(message: Any) -> bool:
+    entries = message if isinstance(message, list) else [message]
+    return any(isinstance(e, dict) and e.get('method') == 'initialize' for e in entries)
+
+
+class _MCPRequestHandler(BaseHTTPRequestHandler):
+    """Gestionnaire des requêtes HTTP (un thread par connexion)."""
+
+    protocol_version = 'HTTP/1.1'
+    transport: MCPHTTPTransport
+
+    def log_message(self, format, *args):
+        logger.debug(f"HTTP {self.address_string()} - {format % args}")
+
+    def _check_request(self) -> bool:
+        """Vérifie le chemin et l'origine ; envoie l'erreur sinon."""
+        if urlsplit(self.path).path != self.transport.ENDPOINT:
+            self._reject(404, -32601, f"Endpoint inconnu: {self.path}")
+            return False
+        if not self.transport.is_allowed_origin(self.headers.get('Origin')):
+            self._reject(403, -32600, "Origine non autorisée")
+            return False
+        if not self.transport.is_authorized(self.headers.get('Authorization')):
+            self._reject(401, -32600, "Authentification requise", {'WWW-Authenticate': 'Bearer'})
+            return False
+        return True
+
+    def _session(self) -> Optional[HTTPSession]:
+        """Récupère la session de l'en-tête ; envoie l'erreur (400/404) sinon."""
+        session_id = self.headers.get(SESSION_HEADER)
+        if not session_id:
+            self._send_error(400, -32600, f"En-tête {SESSION_HEADER} manquant")
+            return None
+        session = self.transport.sessions.get(session_id)
+        if session is None:
+            self._send_error(404, -32600, "Session inconnue ou expirée")
+        return session
+
+    def do_POST(self):
+        if not self._check_request():
+            return
+
+        # Corps borné par la même limite que les messages stdio (max_message_bytes)
+        length = self.headers.get('Content-Length', '').strip()
+        if not length.isdigit():
+            self._reject(400, -32600, "En-tête Content-Length absent ou invalide")
+            return
+        if int(length) > self.transport.server.config.max_message_bytes:
+            self._reject(413, -32600, "Requête trop volumineuse")
+            return
+        length = int(length)
+        try:
+            message = json.loads(self.rfile.read(length))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            self._send_error(400, -32700, "Parse error")
+            return
+
+        headers = {}
+        if _is_initialize(message):
+            params = message.get('params', {}) if isinstance(message, dict) else {}
+            session = self.transport.sessions.create(params.get('clientInfo'))
+            headers[SESSION_HEADER] = session.session_id
+        else:
+            session = self._session()
+            if session is None:
+                return
+
+        accept = self.headers.get('Accept', '')
+        accepts_events = 'text/event-stream' in accept
+        if accepts_events and _expects_response(message) and _has_progress_token(message):
+            # Avancement et résultats partiels sur le flux de la requête, puis la réponse
+            self._start_events(headers)
+            write_lock = threading.Lock()
+
+            def notify(notification: Dict[str, Any]):
+                with write_lock:
+                    self._write_event(json.dumps(notification, ensure_ascii=False))
+
+            data = self.transport.process(message, notify, session.send)
+            if data is not None:
+                with write_lock:
+                    self._write_event(data)
+            return
+
+        data = self.transport.process(message, session.send, session.send)
+        if data is None or not _expects_response(message):
+            self._send(202, b'', headers=headers)
+            return
+
+        if accepts_events and 'application/json' not in accept:
+            self._send_events([data], headers)
+        else:
+            self._send(200, data.encode('utf-8'), 'application/json', headers)
+
+    def do_GET(self):
+        if not self._check_request():
+            return
+        if 'text/event-stream' not in self.headers.get('Accept', ''):
+            self._send_error(406, -32600, "Accept: text/event-stream requis")
+            return
+        session = self._session()
+        if session is None:
+            return
+
+        self._start_events({})
+        try:
+            while not self.transport._stopping.is_set():
+                try:
+                    message = session.outbox.get(timeout=self.transport.KEEPALIVE_INTERVAL)
+                except queue.Empty:
+                    self.wfile.write(b': keepalive\n\n')
+                    self.wfile.flush()
+                    continue
+                if message is None:
+                    break
+                self._write_event(json.dumps(message, ensure_ascii=False))
+        except (BrokenPipeError, ConnectionResetError):
+            logger.debug(f"Flux SSE fermé par le client ({session.session_id})")
+
+    def do_DELETE(self):
+        if not self._check_request():
+            return
+        if self.transport.sessions.close(self.headers.get(SESSION_HEADER)):
+            self._send(200, b'')
+        else:
+            self._send_error(404, -32600, "Session inconnue ou expirée")
+
+    def _send(self, status: int, body: bytes, content_type: Optional[str] = None,
+              headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        if content_type:
+            self.send_header('Content-Type', content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, code: int, message: str, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps({'jsonrpc': '2.0', 'id': None, 'error': {'code': code, 'message': message}})
+        self._send(status, body.encode('utf-8'), 'application/json', headers)
+
+    def _reject(self, status: int, code: int, message: str, headers: Optional[Dict[str, str]] = None):
+        """Erreur envoyée sans lire le corps de la requête : la connexion est fermée."""
+        self.close_connection = True
+        self._send_error(status, code, message, {**(headers or {}), 'Connection': 'close'})
+
+    def _start_events(self, headers: Dict[str, str]):
+        """Envoie les en-têtes d'un flux SSE (fermé en fin de réponse)."""
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+
+    def _write_event(self, data: str):
+        self.wfile.write(f"event: message\ndata: {data}\n\n".encode('utf-8'))
+        self.wfile.flush()
+
+    def _send_events(self, messages: List[str], headers: Dict[str, str]):
+        self._start_events(headers)
+        for data in messages:
+            self._write_event(data)
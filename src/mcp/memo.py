@@ -0,0 +1,145 @@
+"""Mémoïsation des résultats d'appels d'outils."""
+
+import json
+import time
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+
+
+def normalize_arguments(arguments: Dict[str, Any], defaults: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Forme canonique des arguments d'un appel d'outil.
+
+    - Valeurs par défaut déclarées appliquées, valeurs nulles retirées
+    - Clés triées ; listes de valeurs simples triées et dédoublonnées (les listes
+      des outils sont des filtres : leur ordre ne change pas le résultat)
+
+    Args:
+        arguments: Arguments de l'appel
+        defaults: Valeurs par défaut des paramètres de l'outil
+
+    Returns:
+        Arguments encodés en JSON (clé de cache)
+    """
+    normalized = dict(defaults or {})
+    for name, value in arguments.items():
+        if value is None:
+            continue
+        if isinstance(value, list) and all(isinstance(item, (str, int, float, bool)) for item in value):
+            value = sorted(set(value), key=lambda item: (type(item).__name__, item))
+        normalized[name] = value
+    return json.dumps(normalized, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+
+@dataclass
+class _MemoEntry:
+    """Résultat encodé d'un appel."""
+
+    text: str
+    project_key: Optional[str]
+    expires_at: float
+    size: int
+
+
+class ToolResultCache:
+    """
+    Résultats encodés des appels d'outils, par outil et arguments normalisés.
+
+    - Durée de validité propre à chaque outil (0 = jamais mémoïsé)
+    - Les résultats d'un projet sont invalidés à chaque nouvelle analyse
+      (invalidate_project, abonné à AnalysisTracker)
+    - Mémoire bornée par max_bytes (éviction des résultats les moins récemment servis)
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        """
+        Initialise le cache.
+
+        Args:
+            max_bytes: Taille maximale (caractères encodés) des résultats conservés (0 = désactivé)
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, _MemoEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, tool_name: str, key: str) -> Optional[str]:
+        """
+        Retourne le résultat encodé d'un appel s'il est encore valide.
+
+        Args:
+            tool_name: Nom de l'outil
+            key: Arguments normalisés (normalize_arguments)
+        """
+        with self._lock:
+            entry = self._entries.get((tool_name, key))
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self._remove((tool_name, key))
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((tool_name, key))
+            self.hits += 1
+            return entry.text
+
+    def put(self, tool_name: str, key: str, text: str, ttl: float, project_key: Optional[str] = None):
+        """
+        Conserve le résultat encodé d'un appel.
+
+        Args:
+            tool_name: Nom de l'outil
+            key: Arguments normalisés (normalize_arguments)
+            text: Résultat encodé
+            ttl: Durée de validité (secondes)
+            project_key: Projet dont une nouvelle analyse invalide le résultat
+        """
+        if not self.enabled or ttl <= 0 or len(text) > self.max_bytes:
+            return
+        entry = _MemoEntry(text, project_key, time.monotonic() + ttl, len(text))
+        with self._lock:
+            self._remove((tool_name, key))
+            self._entries[(tool_name, key)] = entry
+            self._bytes += entry.size
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate_project(self, project_key: str):
+        """Supprime les résultats d'un projet (nouvelle analyse)."""
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry.project_key == project_key]
+            for key in stale:
+                self._remove(key)
+            self.invalidations += len(stale)
+
+    def _remove(self, key: tuple):
+        """Supprime un résultat (à appeler sous self._lock)."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def stats(self) -> Dict[str, Any]:
+        """Retourne les compteurs du cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0,
+                'invalidations': self.invalidations,
+                'evictions': self.evictions,
+            }
@@ -0,0 +1,237 @@
+"""Découpage des résultats d'outils volumineux en pages avec curseur opaque."""
+
+import time
+import base64
+import logging
+import secrets
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List
+
+from ..commands import CommandResult
+
+logger = logging.getLogger(__name__)
+
+
+class CursorError(ValueError):
+    """Exception levée pour un curseur invalide, expiré ou évincé."""
+    pass
+
+
+@dataclass
+class _CursorEntry:
+    """Éléments restants d'un résultat découpé."""
+
+    tool_name: str
+    list_key: str
+    base_data: Dict[str, Any]
+    metadata: Dict[str, Any]
+    items: List[Any]
+    expires_at: float
+    size: int = 0
+    # Pages déjà encodées (préchargement) : position -> texte JSON
+    rendered: Dict[int, str] = field(default_factory=dict)
+
+
+class ResultPaginator:
+    """
+    Découpe les résultats dont la liste principale dépasse page_items éléments.
+
+    - La première page est renvoyée avec metadata.next_cursor ; le serveur conserve la suite
+    - La page suivante est encodée en arrière-plan pendant que le client lit la page courante
+    - Les curseurs expirent après ttl secondes et la mémoire occupée est bornée par max_bytes
+      (éviction des curseurs les plus anciens)
+    """
+
+    def __init__(self, page_items: int = 100, ttl: float = 300, max_bytes: int = 32 * 1024 * 1024,
+                 compact: bool = False):
+        """
+        Initialise le découpage.
+
+        Args:
+            page_items: Nombre d'éléments par page (0 = désactivé)
+            ttl: Durée de validité (secondes) d'un curseur
+            max_bytes: Mémoire maximale (estimée) des pages conservées
+            compact: Encoder les pages au format compact (CommandResult.to_json(compact=True))
+        """
+        self.page_items = page_items
+        self.compact = compact
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _CursorEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._prefetcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mcp-prefetch")
+        self.pages_served = 0
+        self.prefetch_hits = 0
+        self.evictions = 0
+        self.expired = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.page_items > 0
+
+    def splits(self, result: CommandResult) -> bool:
+        """Indique si render() découpera ce résultat en pages."""
+        return self.enabled and self._largest_list(result.data) is not None
+    
+    def render(self, tool_name: str, result: CommandResult) -> str:
+        """
+        Encode un résultat d'outil, découpé en pages s'il est trop volumineux.
+
+        Args:
+            tool_name: Nom de l'outil
+            result: Résultat de la commande
+
+        Returns:
+            Texte JSON de la première (ou unique) page
+        """
+        list_key = self._largest_list(result.data) if self.enabled else None
+        if list_key is None:
+            return result.to_json(compact=self.compact)
+
+        items = result.data[list_key]
+        entry = _CursorEntry(
+            tool_name=tool_name,
+            list_key=list_key,
+            base_data={k: v for k, v in result.data.items() if k != list_key},
+            metadata=dict(result.metadata or {}),
+            items=items,
+            expires_at=time.monotonic() + self.ttl,
+        )
+        cursor_id = secrets.token_urlsafe(12)
+        text = self._render_page(cursor_id, entry, 0)
+
+        # Taille estimée d'après la première page encodée
+        entry.size = len(text) * len(items) // self.page_items
+        with self._lock:
+            self._entries[cursor_id] = entry
+            self._bytes += entry.size
+            self.pages_served += 1
+            self._evict()
+        self._schedule_prefetch(cursor_id, entry, self.page_items)
+        return text
+
+    def next_page(self, tool_name: str, cursor: str) -> str:
+        """
+        Retourne la page désignée par un curseur.
+
+        Args:
+            tool_name: Nom de l'outil appelé avec le curseur
+            cursor: Curseur next_cursor d'une page précédente
+
+        Returns:
+            Texte JSON de la page
+
+        Raises:
+            CursorError: Si le curseur est invalide, expiré, évincé ou d'un autre outil
+        """
+        cursor_id, offset = self._decode_cursor(cursor)
+        with self._lock:
+            entry = self._entries.get(cursor_id)
+            if entry is not None and time.monotonic() > entry.expires_at:
+                self._remove(cursor_id)
+                self.expired += 1
+                entry = None
+            if entry is None:
+                raise CursorError("Curseur expiré ou inconnu, relancez l'appel sans curseur")
+            if entry.tool_name != tool_name or not 0 < offset < len(entry.items):
+                raise CursorError("Curseur invalide pour cet outil")
+            self._entries.move_to_end(cursor_id)
+            self.pages_served += 1
+            text = entry.rendered.pop(offset, None)
+            if text is not None:
+                self.prefetch_hits += 1
+
+        if text is None:
+            text = self._render_page(cursor_id, entry, offset)
+
+        next_offset = offset + self.page_items
+        if next_offset < len(entry.items):
+            self._schedule_prefetch(cursor_id, entry, next_offset)
+        else:
+            with self._lock:
+                self._remove(cursor_id)
+        return text
+
+    def _render_page(self, cursor_id: str, entry: _CursorEntry, offset: int) -> str:
+        """Encode la page commençant à offset."""
+        end = offset + self.page_items
+        metadata = dict(entry.metadata)
+        metadata['page'] = {
+            'offset': offset,
+            'count': len(entry.items[offset:end]),
+            'total_items': len(entry.items),
+        }
+        if end < len(entry.items):
+            metadata['next_cursor'] = self._encode_cursor(cursor_id, end)
+        data = dict(entry.base_data)
+        data[entry.list_key] = entry.items[offset:end]
+        return CommandResult(success=True, data=data, metadata=metadata).to_json(compact=self.compact)
+
+    def _schedule_prefetch(self, cursor_id: str, entry: _CursorEntry, offset: int):
+        """Encode la page suivante en arrière-plan."""
+        def prefetch():
+            text = self._render_page(cursor_id, entry, offset)
+            with self._lock:
+                if cursor_id in self._entries:
+                    entry.rendered[offset] = text
+
+        try:
+            self._prefetcher.submit(prefetch)
+        except RuntimeError:
+            pass
+
+    def _largest_list(self, data: Any) -> Optional[str]:
+        """Clé de la plus grande liste de premier niveau dépassant la taille de page."""
+        if not isinstance(data, dict):
+            return None
+        candidates = [(len(v), k) for k, v in data.items() if isinstance(v, list) and len(v) > self.page_items]
+        return max(candidates)[1] if candidates else None
+
+    @staticmethod
+    def _encode_cursor(cursor_id: str, offset: int) -> str:
+        return base64.urlsafe_b64encode(f"{cursor_id}:{offset}".encode('ascii')).decode('ascii')
+
+    @staticmethod
+    def _decode_cursor(cursor: Any) -> tuple:
+        try:
+            cursor_id, offset = base64.urlsafe_b64decode(str(cursor).encode('ascii')).decode('ascii').rsplit(':', 1)
+            return cursor_id, int(offset)
+        except (ValueError, UnicodeError):
+            raise CursorError("Curseur invalide")
+
+    def _remove(self, cursor_id: str):
+        """Supprime un curseur (à appeler sous self._lock)."""
+        entry = self._entries.pop(cursor_id, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _evict(self):
+        """
+        Supprime les curseurs expirés puis les plus anciens au-delà de max_bytes (sous self._lock).
+
+        Le curseur le plus récent est conservé même s'il dépasse seul la limite.
+        """
+        now = time.monotonic()
+        for cursor_id in [cid for cid, e in self._entries.items() if e.expires_at < now]:
+            self._remove(cursor_id)
+            self.expired += 1
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Retourne les compteurs du découpage."""
+        with self._lock:
+            return {
+                'cursors': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'pages_served': self.pages_served,
+                'prefetch_hits': self.prefetch_hits,
+                'evictions': self.evictions,
+                'expired': self.expired,
+            }
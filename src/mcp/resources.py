@@ -0,0 +1,321 @@
+"""Ressources MCP (projet, fichier, issue, règle) servies depuis un cache de lecture."""
+
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Callable, Tuple
+
+from ..api import SonarQubeAPI, SonarQubeAPIError, cancellation_scope
+from ..api.progress import current_cancellation
+from ..commands.compact import to_plain
+
+logger = logging.getLogger(__name__)
+
+URI_SCHEME = 'sonarqube://'
+
+# Modèles d'URI annoncés par resources/templates/list
+RESOURCE_TEMPLATES = [
+    {
+        'uriTemplate': 'sonarqube://project/{key}',
+        'name': 'Projet SonarQube',
+        'description': 'Projet : informations, métriques principales et statut du Quality Gate',
+        'mimeType': 'application/json',
+    },
+    {
+        'uriTemplate': 'sonarqube://file/{key}',
+        'name': 'Fichier SonarQube',
+        'description': 'Fichier (clé projet:chemin) : métriques, issues ouvertes et code source',
+        'mimeType': 'application/json',
+    },
+    {
+        'uriTemplate': 'sonarqube://issue/{key}',
+        'name': 'Issue SonarQube',
+        'description': 'Issue : détail, historique des changements et règle associée',
+        'mimeType': 'application/json',
+    },
+    {
+        'uriTemplate': 'sonarqube://rule/{key}',
+        'name': 'Règle SonarQube',
+        'description': 'Règle (ex: java:S1234) : description et paramètres',
+        'mimeType': 'application/json',
+    },
+]
+
+FILE_METRICS = [
+    'ncloc', 'coverage', 'bugs', 'vulnerabilities', 'code_smells', 'duplicated_lines_density'
+]
+
+
+class ResourceNotFoundError(LookupError):
+    """Exception levée pour une ressource inexistante."""
+    pass
+
+
+def parse_uri(uri: str) -> Optional[Tuple[str, str]]:
+    """
+    Découpe une URI de ressource.
+
+    Returns:
+        (type, clé) ou None si l'URI n'est pas celle d'une ressource connue
+    """
+    if not isinstance(uri, str) or not uri.startswith(URI_SCHEME):
+        return None
+    kind, _, key = uri[len(URI_SCHEME):].partition('/')
+    if kind not in ResourceCache.DEFAULT_TTLS or not key:
+        return None
+    return kind, key
+
+
+class ResourceCache:
+    """
+    Cache des lectures de ressources, durée de validité par type.
+
+    - Les entrées d'un projet sont invalidées à chaque nouvelle analyse
+      (invalidate_project, abonné à AnalysisTracker)
+    - Le nombre d'entrées est borné (éviction des moins récemment lues)
+    """
+
+    # Durée de validité par défaut (secondes) ; 0 désactive le cache du type
+    DEFAULT_TTLS = {'project': 60, 'file': 300, 'issue': 60, 'rule': 3600}
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, max_entries: int = 512):
+        """
+        Initialise le cache.
+
+        Args:
+            ttls: Surcharges des durées de validité par type
+            max_entries: Nombre maximal d'entrées conservées
+        """
+        self.ttls = dict(self.DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.max_entries = max_entries
+        # uri -> (valeur, projet, expiration)
+        self._entries: "OrderedDict[str, Tuple[Any, Optional[str], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, kind: str, uri: str, loader: Callable[[], Tuple[Any, Optional[str]]]) -> Any:
+        """
+        Retourne la ressource en cache ou la charge.
+
+        Args:
+            kind: Type de ressource (durée de validité)
+            uri: URI de la ressource
+            loader: Chargement, retourne (valeur, projet dont les analyses l'invalident)
+        """
+        ttl = self.ttls.get(kind, 0)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(uri)
+            if entry is not None and entry[2] > now:
+                self._entries.move_to_end(uri)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value, project_key = loader()
+        if ttl > 0:
+            with self._lock:
+                self._entries[uri] = (value, project_key, time.monotonic() + ttl)
+                self._entries.move_to_end(uri)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def project_of(self, uri: str) -> Optional[str]:
+        """Projet associé à une ressource déjà lue (None si inconnue)."""
+        with self._lock:
+            entry = self._entries.get(uri)
+            return entry[1] if entry else None
+
+    def invalidate_project(self, project_key: str):
+        """Supprime les ressources d'un projet (nouvelle analyse)."""
+        with self._lock:
+            stale = [uri for uri, entry in self._entries.items() if entry[1] == project_key]
+            for uri in stale:
+                del self._entries[uri]
+            self.invalidations += len(stale)
+
+    def stats(self) -> Dict[str, int]:
+        """Retourne les compteurs du cache."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+            }
+
+
+class ResourceReader:
+    """
+    Lecture des ressources sonarqube://<type>/<clé>.
+
+    Les requêtes SonarQube d'une ressource sont lancées en parallèle
+    (informations, métriques, issues, code source...) puis assemblées.
+    """
+
+    def __init__(self, api: SonarQubeAPI, ttls: Optional[Dict[str, float]] = None, max_workers: int = 4):
+        """
+        Initialise la lecture.
+
+        Args:
+            api: Client API SonarQube
+            ttls: Surcharges des durées de validité du cache par type
+            max_workers: Nombre de requêtes SonarQube simultanées
+        """
+        self.api = api
+        self.cache = ResourceCache(ttls)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mcp-resource")
+        self._loaders = {
+            'project': self._load_project,
+            'file': self._load_file,
+            'issue': self._load_issue,
+            'rule': self._load_rule,
+        }
+
+    def read(self, uri: str) -> Dict[str, Any]:
+        """
+        Lit une ressource.
+
+        Returns:
+            Contenu JSON de la ressource (types natifs)
+
+        Raises:
+            ValueError: Si l'URI est inconnue
+            ResourceNotFoundError: Si la ressource n'existe pas
+            SonarQubeAPIError: En cas d'erreur de l'API
+        """
+        parsed = parse_uri(uri)
+        if parsed is None:
+            raise ValueError(f'URI de ressource inconnue: {uri}')
+        kind, key = parsed
+        return self.cache.get(kind, uri, lambda: self._loaders[kind](key))
+
+    def project_of(self, uri: str) -> Optional[str]:
+        """
+        Projet dont les analyses mettent à jour une ressource.
+
+        Déduit de la clé pour un projet ou un fichier ; pour une issue, connu
+        après sa lecture. Les règles ne dépendent d'aucun projet (None).
+        """
+        parsed = parse_uri(uri)
+        if parsed is None:
+            return None
+        kind, key = parsed
+        if kind == 'project':
+            return key
+        if kind == 'file':
+            return key.split(':', 1)[0]
+        if kind == 'issue':
+            return self.cache.project_of(uri)
+        return None
+
+    def _parallel(self, *calls: Callable[[], Any]) -> List[Any]:
+        """
+        Exécute des requêtes en parallèle (la première dans le thread appelant).
+
+        Le jeton d'annulation de l'appelant est transmis aux threads de lecture.
+        """
+        token = current_cancellation()
+
+        def run(call: Callable[[], Any]) -> Any:
+            with cancellation_scope(token):
+                return call()
+
+        futures = [self._executor.submit(run, call) for call in calls[1:]]
+        results = [calls[0]()]
+        results.extend(future.result() for future in futures)
+        return results
+
+    def _load_project(self, key: str) -> Tuple[Dict[str, Any], str]:
+        project, component, quality_gate = self._parallel(
+            lambda: self.api.projects.get(key),
+            lambda: self._optional(lambda: self.api.measures.get_component(key)),
+            lambda: self._optional(lambda: self.api.projects.get_quality_gate_status(key)),
+        )
+        if project is None:
+            raise ResourceNotFoundError(f'Projet non trouvé: {key}')
+        data = {
+            'project': to_plain(project),
+            'measures': self._measures(component),
+        }
+        if quality_gate:
+            status = quality_gate.get('projectStatus', {})
+            data['quality_gate'] = {
+                'status': status.get('status'),
+                'conditions': status.get('conditions', []),
+            }
+        return data, key
+
+    def _load_file(self, key: str) -> Tuple[Dict[str, Any], str]:
+        try:
+            component, issues, sources = self._parallel(
+                lambda: self.api.measures.get_component(key, FILE_METRICS),
+                lambda: self.api.issues.search(project_keys=[key], resolved=False),
+                lambda: self.api.projects.get_source_lines(key),
+            )
+        except SonarQubeAPIError as e:
+            if e.status_code == 404:
+                raise ResourceNotFoundError(f'Fichier non trouvé: {key}')
+            raise
+        data = {
+            'file': {'key': component.key, 'name': component.name, 'qualifier': component.qualifier},
+            'measures': self._measures(component),
+            'issues': to_plain(issues.get('issues', [])),
+            'sources': sources.get('sources', []),
+        }
+        return data, key.split(':', 1)[0]
+
+    def _load_issue(self, key: str) -> Tuple[Dict[str, Any], Optional[str]]:
+        issue, changelog = self._parallel(
+            lambda: self.api.issues.get(key),
+            lambda: self._optional(lambda: self.api.issues.get_changelog(key)),
+        )
+        if issue is None:
+            raise ResourceNotFoundError(f'Issue non trouvée: {key}')
+        # La règle passe par le cache : partagée entre les issues qui la déclenchent
+        rule = self._optional(lambda: self.read(f'{URI_SCHEME}rule/{issue.rule}'))
+        data = {
+            'issue': to_plain(issue),
+            'changelog': (changelog or {}).get('changelog', []),
+        }
+        if rule:
+            data['rule'] = rule['rule']
+        return data, issue.component.split(':', 1)[0]
+
+    def _load_rule(self, key: str) -> Tuple[Dict[str, Any], None]:
+        try:
+            rule = self.api.rules.get(key)
+        except SonarQubeAPIError as e:
+            if e.status_code == 404:
+                raise ResourceNotFoundError(f'Règle non trouvée: {key}')
+            raise
+        return {'rule': to_plain(rule)}, None
+
+    @staticmethod
+    def _optional(call: Callable[[], Any]) -> Any:
+        """Requête complémentaire : une erreur de l'API donne None au lieu d'échouer la lecture."""
+        try:
+            return call()
+        except (SonarQubeAPIError, ResourceNotFoundError) as e:
+            logger.debug(f"Donnée complémentaire indisponible: {e}")
+            return None
+
+    @staticmethod
+    def _measures(component: Any) -> List[Dict[str, Any]]:
+        if component is None:
+            return []
+        return [{'metric': m.metric, 'value': m.value} for m in component.measures]
+
+    def stats(self) -> Dict[str, int]:
+        """Retourne les compteurs du cache de lecture."""
+        return self.cache.stats()
+
+    def shutdown(self):
+        """Arrête les threads de lecture."""
+        self._executor.shutdown(wait=False)
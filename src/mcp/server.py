@@ -2,15 +2,28 @@
 
 import sys
 import json
+import time
 import logging
 import threading
-from typing import Dict, Any, Optional, List
+from concurrent.futures import ThreadPoolExecutor, CancelledError, TimeoutError as FutureTimeoutError
+from typing import Dict, Any, Optional, List, Callable
 
 from ..config import SonarQubeConfig
-from ..api import SonarQubeAPI, SonarQubeAPIError
-from ..commands import CommandHandler
-from ..utils import validate_file_path, validate_project_key, validate_rule_key, validate_user_login, ValidationError
+from ..api import (
+    SonarQubeAPI, SonarQubeAPIError, ProgressReporter, progress_scope,
+    CancellationToken, RequestCancelledError, cancellation_scope, priority_scope, BACKGROUND
+)
+from ..api.metrics import RequestMetrics, process_stats
+from ..commands import CommandHandler, CommandResult
+from ..utils import validate_file_path, validate_project_key, validate_rule_key, validate_user_login, ValidationError, lazy_property
 from .tools_registry import MCPToolsRegistry
+from .executor import BoundedExecutor, ExecutorSaturatedError
+from .pagination import ResultPaginator, CursorError
+from .framing import MessageReader, MessageWriter, MessageTooLargeError
+from .subscriptions import SubscriptionManager
+from .resources import ResourceReader, ResourceNotFoundError, RESOURCE_TEMPLATES
+from .memo import ToolResultCache, normalize_arguments
+from .admission import AdmissionController, OVERLOADED
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +31,34 @@ logger = logging.getLogger(__name__)
 class MCPServer:
     """Serveur MCP implémentant le protocole."""
     
+    # Timeout (secondes) d'un appel d'outil sans timeout déclaré
+    TOOL_TIMEOUT = 60
+    
+    # Mapping outil -> commande
+    TOOL_TO_COMMAND = {
+        'sonarqube_issues': 'issues',
+        'sonarqube_search_issues': 'search-issues',
+        'sonarqube_measures': 'measures',
+        'sonarqube_hotspots': 'hotspots',
+        'sonarqube_rule': 'rule',
+        'sonarqube_users': 'users',
+        'sonarqube_quality_gate': 'quality-gate',
+        'sonarqube_analyses_history': 'analyses',
+        'sonarqube_duplications': 'duplications',
+        'sonarqube_source_lines': 'source-lines',
+        'sonarqube_metrics_list': 'metrics-list',
+        'sonarqube_languages': 'languages',
+        'sonarqube_projects': 'projects'
+    }
+    
+    # Méthodes rapides traitées directement par la boucle de lecture (ordre préservé)
+    INLINE_METHODS = frozenset({
+        'initialize', 'initialized', 'notifications/initialized', 'ping', 'tools/list', 'resources/list',
+        'resources/templates/list', 'resources/subscribe', 'resources/unsubscribe', 'notifications/cancelled'
+    })
+    # Outils traités comme les méthodes rapides : ni file d'admission ni pool (disponibles sous saturation)
+    INLINE_TOOLS = frozenset({'sonarqube_server_stats'})
+    
     def __init__(self, config: SonarQubeConfig):
         """
         Initialise le serveur MCP.
@@ -28,32 +69,99 @@ class MCPServer:
         self.config = config
         self.api = SonarQubeAPI(config)
         self.command_handler = CommandHandler(self.api, config)
-        self.tools_registry = MCPToolsRegistry()
+        self._preload_thread: Optional[threading.Thread] = None
+        
+        # Préchargement du projet par défaut (opt-in, voir _start_warmup)
+        self._warmup_thread: Optional[threading.Thread] = None
+        self._warm_results: Dict[tuple, tuple] = {}
+        self._warm_lock = threading.Lock()
+        
+        # Pool borné d'exécution des outils (threads réutilisés)
+        self.tool_executor = BoundedExecutor(
+            max_workers=config.tool_workers,
+            max_queued=config.tool_queue_size,
+            name="mcp-tool"
+        )
+        
+        # Découpage des résultats volumineux (curseur next_cursor)
+        self.paginator = ResultPaginator(
+            page_items=config.result_page_items,
+            ttl=config.cursor_ttl,
+            max_bytes=config.cursor_max_bytes,
+            compact=config.result_format == 'compact'
+        )
+        
+        # Nombre d'appels, erreurs et latences par outil (sonarqube_server_stats)
+        self.tool_metrics = RequestMetrics()
+        self._started_at = time.monotonic()
+        
+        # Mémoïsation des résultats d'outils (outil + arguments normalisés)
+        self.tool_cache = ToolResultCache(max_bytes=config.tool_cache_max_bytes)
+        
+        # Lecture des ressources : cache par type
+        self.resources = ResourceReader(self.api, ttls=config.resource_cache_ttls)
+        
+        # Abonnements aux ressources : sondage central des analyses des projets suivis
+        self.subscriptions = SubscriptionManager(
+            poll=self._poll_project_analyses,
+            interval=config.subscription_poll_interval
+        )
+        
+        # Nouvelle analyse : caches invalidés avant de notifier les abonnés
+        self.api.analysis_tracker.add_listener(self.tool_cache.invalidate_project)
+        self.api.analysis_tracker.add_listener(self.resources.cache.invalidate_project)
+        self.api.analysis_tracker.add_listener(self.subscriptions.notify_project)
+        
+        # Requêtes annulables en cours : (canal du client, id) -> jeton (voir notifications/cancelled)
+        self._cancellations: Dict[tuple, CancellationToken] = {}
+        self._cancellations_lock = threading.Lock()
+        
+        # File d'entrée bornée : au-delà, les requêtes lentes sont refusées (erreur OVERLOADED)
+        self.admission = AdmissionController(
+            max_pending=config.max_pending_requests,
+            limits=config.admission_limits,
+            exempt=self.INLINE_METHODS
+        )
         
         logger.info("Serveur MCP SonarQube initialisé")
         logger.info(f"URL: {config.url}")
-        logger.info(f"{len(self.tools_registry.get_tool_names())} outils chargés")
     
-    def handle_request(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    @lazy_property
+    def tools_registry(self) -> MCPToolsRegistry:
+        """Registre des outils, chargé au premier usage (ou après initialize, voir _start_preload)."""
+        registry = MCPToolsRegistry()
+        logger.info(f"{len(registry.get_tool_names())} outils chargés")
+        return registry
+    
+    def handle_request(self, request: Dict[str, Any],
+                       notify: Optional[Callable[[Dict[str, Any]], None]] = None,
+                       subscriber: Optional[Callable[[Dict[str, Any]], None]] = None) -> Optional[Dict[str, Any]]:
         """
         Traite une requête MCP.
         
         Args:
             request: Requête MCP
+            notify: Envoi des notifications au client pendant le traitement (optionnel)
+            subscriber: Envoi des notifications d'abonnement au client (par défaut: notify)
         
         Returns:
             Réponse MCP ou None pour les notifications
         """
         method = request.get('method')
+        client = subscriber or notify
         
         handlers = {
             'initialize': self._handle_initialize,
             'initialized': lambda r: {'result': {}},
             'notifications/initialized': lambda r: None,
             'tools/list': self._handle_tools_list,
-            'tools/call': self._handle_tools_call,
+            'tools/call': lambda r: self._handle_tools_call(r, notify, client),
             'resources/list': self._handle_resources_list,
-            'resources/read': self._handle_resources_read,
+            'resources/read': lambda r: self._run_cancellable(r, client, self._handle_resources_read),
+            'resources/templates/list': lambda r: {'result': {'resourceTemplates': RESOURCE_TEMPLATES}},
+            'resources/subscribe': lambda r: self._handle_resources_subscribe(r, subscriber or notify),
+            'resources/unsubscribe': lambda r: self._handle_resources_unsubscribe(r, subscriber or notify),
+            'notifications/cancelled': lambda r: self._handle_cancelled(r, client),
             'ping': lambda r: {'result': {'status': 'pong'}}
         }
         
@@ -69,6 +177,8 @@ class MCPServer:
     
     def _handle_initialize(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Traite requête initialize."""
+        self._start_preload()
+        self._start_warmup()
         return {
             'result': {
                 'protocolVersion': '2024-11-05',
@@ -86,115 +196,489 @@ class MCPServer:
             }
         }
     
+    def _start_preload(self):
+        """
+        Charge le registre des outils en arrière-plan (une seule fois).
+        
+        La réponse à initialize n'attend pas le chargement du YAML ; un tools/list
+        reçu entre-temps attend la fin du chargement en cours.
+        """
+        if self._preload_thread or 'tools_registry' in self.__dict__:
+            return
+        
+        self._preload_thread = threading.Thread(
+            target=lambda: self.tools_registry, name="mcp-preload", daemon=True
+        )
+        self._preload_thread.start()
+    
+    def _start_warmup(self):
+        """Lance le préchargement du projet par défaut en arrière-plan (une seule fois)."""
+        if not self.config.warmup_enabled or not self.config.default_project or self._warmup_thread:
+            return
+        
+        self._warmup_thread = threading.Thread(target=self._warmup, name="mcp-warmup")
+        self._warmup_thread.daemon = True
+        self._warmup_thread.start()
+    
+    def _warmup(self):
+        """
+        Précharge le projet par défaut : Quality Gate, mesures et issues ouvertes de l'assignee.
+        
+        Établit les connexions des sessions HTTP et conserve les résultats des
+        commandes pour le premier appel d'outil correspondant (voir _take_warm_result).
+        Travail de fond : les appels d'outils passent devant ses requêtes.
+        """
+        with priority_scope(BACKGROUND):
+            self._warmup_default_project()
+    
+    def _warmup_default_project(self):
+        """Préchargement du projet par défaut (voir _warmup)."""
+        start = time.monotonic()
+        project_key = self.config.default_project.key
+        
+        try:
+            self.api.projects.get_quality_gate_status(project_key)
+        except Exception as e:
+            logger.warning(f"Préchargement du Quality Gate de {project_key} échoué: {e}")
+        
+        for command, arguments in (('issues', {}), ('measures', {'project_key': project_key})):
+            try:
+                args = self._convert_arguments(command, arguments)
+                if not args:
+                    continue
+                result = self.command_handler.execute(command, args)
+            except Exception as e:
+                logger.warning(f"Préchargement de '{command}' échoué: {e}")
+                continue
+            
+            if result.success:
+                with self._warm_lock:
+                    self._warm_results[(command, tuple(args))] = (result, time.monotonic())
+        
+        logger.info(f"Préchargement de {project_key} terminé en {time.monotonic() - start:.2f}s")
+    
+    def _take_warm_result(self, command: str, args: List[str]) -> Optional[CommandResult]:
+        """
+        Consomme le résultat préchargé d'une commande s'il est encore valide.
+        
+        Args:
+            command: Nom de la commande
+            args: Arguments de la commande
+        
+        Returns:
+            Résultat préchargé ou None
+        """
+        with self._warm_lock:
+            entry = self._warm_results.pop((command, tuple(args)), None)
+        if entry is None:
+            return None
+        result, loaded_at = entry
+        if time.monotonic() - loaded_at > self.config.warmup_ttl:
+            return None
+        logger.debug(f"Résultat préchargé utilisé pour '{command}'")
+        return result
+    
     def _handle_tools_list(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Liste les outils disponibles."""
         tools = self.tools_registry.list_all_tools()
         return {'result': {'tools': tools}}
     
-    def _handle_tools_call(self, request: Dict[str, Any]) -> Dict[str, Any]:
+    def _handle_tools_call(self, request: Dict[str, Any],
+                           notify: Optional[Callable[[Dict[str, Any]], None]] = None,
+                           client: Any = None) -> Optional[Dict[str, Any]]:
         """
         Appelle un outil.
         
+        L'outil est exécuté par le pool borné self.tool_executor ; au-delà du
+        timeout, le travail est abandonné et une erreur est renvoyée.
+        
         Args:
             request: Requête MCP avec params.name et params.arguments
+            notify: Envoi des notifications d'avancement (optionnel)
+            client: Canal du client, identifie la requête pour notifications/cancelled (optionnel)
         
         Returns:
-            Résultat de l'outil ou erreur
+            Résultat de l'outil, erreur, ou None si le client a annulé l'appel
+        """
+        return self._submit_tool_call(request, notify, client)()
+    
+    def _submit_tool_call(self, request: Dict[str, Any],
+                          notify: Optional[Callable[[Dict[str, Any]], None]] = None,
+                          client: Any = None) -> Callable[[], Optional[Dict[str, Any]]]:
         """
+        Soumet un appel d'outil au pool sans attendre son résultat.
+        
+        La durée de l'appel (attente comprise) est enregistrée dans self.tool_metrics.
+        
+        Args:
+            request: Requête MCP avec params.name et params.arguments
+            notify: Envoi des notifications d'avancement (optionnel)
+            client: Canal du client, identifie la requête pour notifications/cancelled (optionnel)
+        
+        Returns:
+            Fonction d'attente retournant le résultat de l'outil, une erreur,
+            ou None si le client a annulé l'appel
+        """
+        tool_name = request.get('params', {}).get('name')
+        start = time.monotonic()
+        wait = self._start_tool_call(request, notify, client)
+        
+        def measured_wait() -> Optional[Dict[str, Any]]:
+            response = wait()
+            # Outils déclarés uniquement : le nom vient du client
+            if response is not None and self.tools_registry.tool_exists(tool_name):
+                self.tool_metrics.record(tool_name, time.monotonic() - start, 'error' in response)
+            return response
+        
+        return measured_wait
+    
+    def _start_tool_call(self, request: Dict[str, Any],
+                         notify: Optional[Callable[[Dict[str, Any]], None]],
+                         client: Any) -> Callable[[], Optional[Dict[str, Any]]]:
+        """Démarre un appel d'outil (voir _submit_tool_call)."""
         params = request.get('params', {})
         tool_name = params.get('name')
         arguments = params.get('arguments', {})
         
-        # Variables pour gérer le timeout de manière cross-platform
-        result_container = [None]
-        exception_container = [None]
+        # Statistiques : servies sans passer par le pool, même saturé
+        if tool_name == 'sonarqube_server_stats':
+            stats = {'result': {'content': [{'type': 'text', 'text': self._server_stats_json()}]}}
+            return lambda: stats
+        
+        # Résultat mémoïsé : servi sans passer par le pool
+        memo_key = self._memo_key(tool_name, arguments)
+        if memo_key is not None:
+            text = self.tool_cache.get(tool_name, memo_key)
+            if text is not None:
+                response = {'result': {'content': [{'type': 'text', 'text': text}]}}
+                return lambda: response
+        
+        timeout, latency_budget = self._get_tool_limits(tool_name)
+        reporter = self._progress_reporter(params, notify)
+        start = time.monotonic()
+        request_key, token = self._track_request(request, client)
+        
+        try:
+            future = self.tool_executor.submit(
+                self._execute_tool, tool_name, arguments, reporter, memo_key, token, block_timeout=timeout
+            )
+        except ExecutorSaturatedError as e:
+            self._untrack_request(request_key)
+            logger.error(f"Appel de {tool_name} refusé: {e}")
+            error = self._error_response(OVERLOADED, f"Serveur saturé: {e}")
+            return lambda: error
+        
+        if token is not None:
+            # Appel encore en file : retiré sans être exécuté
+            token.add_callback(future.cancel)
         
-        def execute_tool():
-            """Exécute l'outil dans un thread séparé."""
+        def wait() -> Optional[Dict[str, Any]]:
             try:
-                # Tool special: ping
-                if tool_name == 'sonarqube_ping':
-                    result_container[0] = {
-                        'result': {
-                            'content': [{
-                                'type': 'text',
-                                'text': json.dumps({
-                                    'success': True,
-                                    'message': 'pong',
-                                    'config': {
-                                        'url': self.config.url,
-                                        'project_key': self.config.default_project.key if self.config.default_project else None,
-                                        'user': self.config.default_project.assignee if self.config.default_project else None
-                                    }
-                                }, indent=2)
-                            }]
-                        }
-                    }
-                    return
-                
-                # Mapping outil -> commande
-                tool_to_command = {
-                    'sonarqube_issues': 'issues',
-                    'sonarqube_search_issues': 'search-issues',
-                    'sonarqube_measures': 'measures',
-                    'sonarqube_hotspots': 'hotspots',
-                    'sonarqube_rule': 'rule',
-                    'sonarqube_users': 'users',
-                    'sonarqube_quality_gate': 'quality-gate',
-                    'sonarqube_analyses_history': 'analyses',
-                    'sonarqube_duplications': 'duplications',
-                    'sonarqube_source_lines': 'source-lines',
-                    'sonarqube_metrics_list': 'metrics-list',
-                    'sonarqube_languages': 'languages',
-                    'sonarqube_projects': 'projects'
-                }
-                
-                command = tool_to_command.get(tool_name)
-                if not command:
-                    result_container[0] = self._error_response(-32602, f"Outil inconnu: {tool_name}")
-                    return
-                
-                # Convertir arguments + exécuter
-                args = self._convert_arguments(command, arguments)
-                result = self.command_handler.execute(command, args)
-                
-                if result.success:
-                    result_container[0] = {
-                        'result': {
-                            'content': [{'type': 'text', 'text': result.to_json()}]
-                        }
-                    }
-                else:
-                    result_container[0] = self._error_response(-32603, result.error)
-            
+                remaining = max(timeout - (time.monotonic() - start), 0)
+                response = future.result(timeout=remaining)
+            except (CancelledError, RequestCancelledError):
+                logger.info(f"Appel de {tool_name} annulé par le client")
+                return None
+            except FutureTimeoutError:
+                self.tool_executor.abandon(future)
+                logger.error(f"Timeout lors de l'appel de {tool_name}: dépassé {timeout} secondes")
+                return self._error_response(
+                    -32603, f"Timeout: L'appel de l'outil a dépassé le timeout de {timeout} secondes",
+                    data=self._limits_data(tool_name, timeout, latency_budget, start)
+                )
             except SonarQubeAPIError as e:
-                exception_container[0] = ('api', e)
+                logger.error(f"Erreur API SonarQube: {e}")
+                return self._error_response(-32603, f'Erreur SonarQube: {e.message}')
             except Exception as e:
-                exception_container[0] = ('general', e)
-        
-        # Exécuter avec timeout de 60 secondes
-        thread = threading.Thread(target=execute_tool)
-        thread.daemon = True
-        thread.start()
-        thread.join(timeout=60)
-        
-        # Vérifier si le timeout s'est produit
-        if thread.is_alive():
-            logger.error(f"Timeout lors de l'appel de {tool_name}: dépassé 60 secondes")
-            return self._error_response(-32603, "Timeout: L'appel de l'outil a dépassé le timeout de 60 secondes")
-        
-        # Vérifier si une exception s'est produite
-        if exception_container[0]:
-            exc_type, exc = exception_container[0]
-            if exc_type == 'api':
-                logger.error(f"Erreur API SonarQube: {exc}")
-                return self._error_response(-32603, f'Erreur SonarQube: {exc.message}')
-            else:
-                logger.error(f"Erreur inattendue: {exc}", exc_info=True)
-                return self._error_response(-32603, f'Erreur interne: {str(exc)}')
+                logger.error(f"Erreur inattendue: {e}", exc_info=True)
+                return self._error_response(-32603, f'Erreur interne: {str(e)}')
+            finally:
+                self._untrack_request(request_key)
+            
+            if token is not None and token.cancelled:
+                # Pas de réponse à une requête annulée
+                return None
+            
+            elapsed = time.monotonic() - start
+            if latency_budget is not None and elapsed > latency_budget:
+                logger.warning(
+                    f"Budget de latence dépassé pour {tool_name}: {elapsed:.2f}s (budget {latency_budget}s)"
+                )
+                if 'error' in response:
+                    response['error']['data'] = self._limits_data(tool_name, timeout, latency_budget, start)
+            return response
+        
+        return wait
+    
+    def _track_request(self, request: Dict[str, Any], client: Any) -> tuple:
+        """
+        Enregistre une requête annulable.
+        
+        Returns:
+            Tuple (clé de la requête, jeton d'annulation), (None, None) sans id
+        """
+        if 'id' not in request:
+            return None, None
+        key = (client, json.dumps(request['id']))
+        token = CancellationToken()
+        with self._cancellations_lock:
+            self._cancellations[key] = token
+        return key, token
+    
+    def _untrack_request(self, key: Optional[tuple]):
+        """Retire une requête terminée des requêtes annulables."""
+        if key is not None:
+            with self._cancellations_lock:
+                self._cancellations.pop(key, None)
+    
+    def _run_cancellable(self, request: Dict[str, Any], client: Any,
+                         handler: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Exécute un handler dans le thread courant, annulable par notifications/cancelled."""
+        key, token = self._track_request(request, client)
+        try:
+            with cancellation_scope(token):
+                response = handler(request)
+        except RequestCancelledError:
+            response = None
+        finally:
+            self._untrack_request(key)
+        if token is not None and token.cancelled:
+            logger.info(f"Requête {request.get('method')} annulée par le client")
+            return None
+        return response
+    
+    def _handle_cancelled(self, request: Dict[str, Any], client: Any) -> None:
+        """
+        Annule une requête en cours (notifications/cancelled).
+        
+        Les pages et requêtes SonarQube restantes ne sont pas envoyées, un appel
+        encore en file n'est pas exécuté, et aucune réponse n'est renvoyée.
+        """
+        params = request.get('params') or {}
+        if 'requestId' not in params:
+            return None
+        with self._cancellations_lock:
+            token = self._cancellations.get((client, json.dumps(params['requestId'])))
+        if token is not None:
+            token.cancel(params.get('reason'))
+            logger.info(f"Annulation de la requête {params['requestId']}: {params.get('reason') or 'sans motif'}")
+        return None
+    
+    @staticmethod
+    def _progress_reporter(params: Dict[str, Any],
+                           notify: Optional[Callable[[Dict[str, Any]], None]]) -> Optional[ProgressReporter]:
+        """
+        Crée le suivi d'avancement d'un appel portant un progressToken.
+        
+        - notifications/progress : pages récupérées / pages attendues (paging.total)
+        - notifications/sonarqube/partial_result : lots d'éléments, si _meta.partialResults est vrai
+        
+        Args:
+            params: Paramètres de la requête tools/call
+            notify: Envoi des notifications au client
+        
+        Returns:
+            Suivi ou None si le client n'a pas demandé d'avancement
+        """
+        meta = params.get('_meta') or {}
+        token = meta.get('progressToken')
+        if token is None or notify is None:
+            return None
+        
+        def on_progress(progress: int, total: Optional[int], message: str):
+            notification_params = {'progressToken': token, 'progress': progress, 'message': message}
+            if total is not None:
+                notification_params['total'] = total
+            notify({'jsonrpc': '2.0', 'method': 'notifications/progress', 'params': notification_params})
+        
+        def on_partial(key: str, items: List[Any], offset: int):
+            notify({
+                'jsonrpc': '2.0',
+                'method': 'notifications/sonarqube/partial_result',
+                'params': {'progressToken': token, 'key': key, 'offset': offset, 'items': items}
+            })
+        
+        return ProgressReporter(on_progress, on_partial if meta.get('partialResults') else None)
+    
+    def _get_tool_limits(self, tool_name: str) -> tuple:
+        """
+        Résout le timeout et le budget de latence d'un outil.
+        
+        La configuration (tool_timeouts / tool_latency_budgets) prime sur les
+        valeurs déclarées dans tools_descriptions.yaml.
+        
+        Args:
+            tool_name: Nom de l'outil
+        
+        Returns:
+            Tuple (timeout, budget de latence ou None)
+        """
+        declared = self.tools_registry.get_tool_limits(tool_name)
+        timeout = self.config.tool_timeouts.get(tool_name, declared['timeout']) or self.TOOL_TIMEOUT
+        latency_budget = self.config.tool_latency_budgets.get(tool_name, declared['latency_budget'])
+        return timeout, latency_budget
+    
+    def _memo_key(self, tool_name: str, arguments: Dict[str, Any]) -> Optional[str]:
+        """
+        Clé de mémoïsation d'un appel (None si l'outil n'est pas mémoïsé).
+        
+        La configuration (tool_cache_ttls) prime sur le cache_ttl déclaré dans
+        tools_descriptions.yaml ; les pages suivantes (cursor) ne sont jamais mémoïsées.
+        """
+        if not self.tool_cache.enabled or not isinstance(arguments, dict) or arguments.get('cursor'):
+            return None
+        if not self._get_cache_ttl(tool_name):
+            return None
+        return normalize_arguments(arguments, self.tools_registry.get_parameter_defaults(tool_name))
+    
+    def _get_cache_ttl(self, tool_name: str) -> float:
+        """Durée de mémoïsation (secondes) des résultats d'un outil (0 = jamais)."""
+        declared = self.tools_registry.get_tool_limits(tool_name)['cache_ttl']
+        return self.config.tool_cache_ttls.get(tool_name, declared) or 0
+    
+    def _tool_project(self, tool_name: str, arguments: Dict[str, Any]) -> Optional[str]:
+        """Projet dont une nouvelle analyse invalide le résultat d'un appel (None si aucun)."""
+        if arguments.get('project_key'):
+            return arguments['project_key']
+        if arguments.get('file_key'):
+            return str(arguments['file_key']).split(':', 1)[0]
+        if tool_name == 'sonarqube_issues' and self.config.default_project:
+            return self.config.default_project.key
+        return None
+    
+    @staticmethod
+    def _limits_data(tool_name: str, timeout: float, latency_budget: Optional[float],
+                     start: float) -> Dict[str, Any]:
+        """Détails de limites joints aux erreurs (champ error.data)."""
+        return {
+            'tool': tool_name,
+            'timeout': timeout,
+            'latency_budget': latency_budget,
+            'elapsed': round(time.monotonic() - start, 3),
+        }
+    
+    def server_stats(self) -> Dict[str, Any]:
+        """
+        Statistiques du serveur (outil sonarqube_server_stats).
+        
+        Returns:
+            Appels par outil, requêtes SonarQube par endpoint, caches, appels en
+            cours et en attente, occupation du processus
+        """
+        api = self.api
+        caches = {
+            'tool_results': self.tool_cache.stats(),
+            'resources': self.resources.stats(),
+            'cursors': self.paginator.stats(),
+            'negative': api.negative_cache.stats(),
+        }
+        if api.disk_cache is not None:
+            caches['disk'] = api.disk_cache.stats()
+        # Client projects déjà créé uniquement (pas de création pour les statistiques)
+        projects = api.__dict__.get('projects')
+        if projects is not None:
+            caches['source_lines'] = projects.source_cache.stats()
+            caches['quality_gate'] = projects.quality_gate_cache.stats()
+        
+        pool = self.tool_executor.stats()
+        with self._cancellations_lock:
+            cancellable = len(self._cancellations)
+        return {
+            'uptime_s': round(time.monotonic() - self._started_at, 1),
+            'tools': self.tool_metrics.snapshot(),
+            'upstream': api.request_metrics.snapshot(),
+            'caches': caches,
+            'requests': {
+                'in_flight': pool['active'],
+                'queued': pool['queued'],
+                'cancellable': cancellable,
+                'tool_pool': pool,
+                'admission': self.admission.stats(),
+            },
+            'scheduler': api.scheduler.stats(),
+            'subscriptions': self.subscriptions.stats(),
+            'process': process_stats(),
+        }
+    
+    def _server_stats_json(self) -> str:
+        """Résultat de sonarqube_server_stats encodé en JSON compact."""
+        return json.dumps({'success': True, 'data': self.server_stats()}, separators=(',', ':'), ensure_ascii=False)
+    
+    def _execute_tool(self, tool_name: str, arguments: Dict[str, Any],
+                      reporter: Optional[ProgressReporter] = None,
+                      memo_key: Optional[str] = None,
+                      token: Optional[CancellationToken] = None) -> Dict[str, Any]:
+        """
+        Exécute un outil (dans un thread du pool).
+        
+        Args:
+            tool_name: Nom de l'outil
+            arguments: Arguments de l'outil
+            reporter: Suivi d'avancement des appels API (optionnel)
+            memo_key: Clé de mémoïsation du résultat (None = non mémoïsé)
+            token: Jeton d'annulation de l'appel (optionnel)
         
-        # Retourner le résultat
-        return result_container[0] if result_container[0] else self._error_response(-32603, "Erreur interne: aucun résultat")
+        Returns:
+            Réponse MCP
+        
+        Raises:
+            SonarQubeAPIError: En cas d'erreur d'API ou de validation
+            RequestCancelledError: Si le client a annulé l'appel
+        """
+        # Page suivante d'un résultat découpé
+        if arguments.get('cursor'):
+            try:
+                text = self.paginator.next_page(tool_name, arguments['cursor'])
+            except CursorError as e:
+                return self._error_response(-32602, str(e))
+            return {'result': {'content': [{'type': 'text', 'text': text}]}}
+        
+        # Tool special: ping
+        if tool_name == 'sonarqube_ping':
+            return {
+                'result': {
+                    'content': [{
+                        'type': 'text',
+                        'text': json.dumps({
+                            'success': True,
+                            'message': 'pong',
+                            'config': {
+                                'url': self.config.url,
+                                'project_key': self.config.default_project.key if self.config.default_project else None,
+                                'user': self.config.default_project.assignee if self.config.default_project else None
+                            }
+                        }, indent=2)
+                    }]
+                }
+            }
+        
+        command = self.TOOL_TO_COMMAND.get(tool_name)
+        if not command:
+            return self._error_response(-32602, f"Outil inconnu: {tool_name}")
+        
+        # Convertir arguments + exécuter
+        args = self._convert_arguments(command, arguments)
+        result = self._take_warm_result(command, args)
+        if result is None:
+            with progress_scope(reporter), cancellation_scope(token):
+                result = self.command_handler.execute(command, args)
+        
+        if token is not None:
+            token.raise_if_cancelled()
+        if not result.success:
+            return self._error_response(-32603, result.error)
+        
+        # Un résultat découpé en pages renvoie un curseur éphémère : pas de mémoïsation
+        if self.tools_registry.is_paginated(tool_name):
+            memoize = memo_key is not None and not self.paginator.splits(result)
+            text = self.paginator.render(tool_name, result)
+        else:
+            memoize = memo_key is not None
+            text = result.to_json(compact=self.paginator.compact)
+        if memoize:
+            self.tool_cache.put(tool_name, memo_key, text, self._get_cache_ttl(tool_name),
+                                self._tool_project(tool_name, arguments))
+        return {'result': {'content': [{'type': 'text', 'text': text}]}}
     
     def _convert_arguments(self, command: str, arguments: Dict[str, Any]) -> list:  # noqa: C901
         """
@@ -286,6 +770,12 @@ class MCPServer:
                 # La validation sera faite par la commande elle-même
                 args.append(status_str)
         
+        # Export complet : toutes les pages
+        if arguments.get('all_pages'):
+            if len(args) < 3:
+                args.append('')
+            args.append('all')
+        
         return args
     
     def _convert_measures_args(self, arguments: Dict[str, Any]) -> List[str]:
@@ -388,94 +878,395 @@ class MCPServer:
         return {'result': {'resources': resources}}
     
     def _handle_resources_read(self, request: Dict[str, Any]) -> Dict[str, Any]:
-        """Lit une ressource."""
-        params = request.get('params', {})
-        uri = params.get('uri', '')
+        """Lit une ressource (sonarqube://project|file|issue|rule/<clé>, voir ResourceReader)."""
+        uri = request.get('params', {}).get('uri', '')
         
-        if uri.startswith('sonarqube://project/'):
-            project_key = uri.replace('sonarqube://project/', '')
-            
-            try:
-                # Récupérer les informations du projet
-                project = self.api.projects.get_project(project_key)
-                if not project:
-                    return self._error_response(-32602, f'Projet non trouvé: {project_key}')
-                
-                # Récupérer les métriques
-                component = self.api.measures.get_component_measures(project_key)
-                
-                data = {
-                    'project': {
-                        'key': project.key,
-                        'name': project.name,
-                        'qualifier': project.qualifier,
-                        'visibility': project.visibility,
-                        'last_analysis_date': str(project.last_analysis_date) if project.last_analysis_date else None
-                    },
-                    'measures': [
-                        {'metric': m.metric, 'value': m.value}
-                        for m in component.measures
-                    ]
-                }
-                
-                return {
-                    'result': {
-                        'contents': [{
-                            'uri': uri,
-                            'mimeType': 'application/json',
-                            'text': json.dumps(data, indent=2, ensure_ascii=True)
-                        }]
-                    }
-                }
-            except SonarQubeAPIError as e:
-                return self._error_response(-32603, f'Erreur SonarQube: {e.message}')
+        try:
+            data = self.resources.read(uri)
+        except ValueError as e:
+            return self._error_response(-32602, str(e))
+        except ResourceNotFoundError as e:
+            return self._error_response(-32602, str(e))
+        except SonarQubeAPIError as e:
+            return self._error_response(-32603, f'Erreur SonarQube: {e.message}')
+        
+        return {
+            'result': {
+                'contents': [{
+                    'uri': uri,
+                    'mimeType': 'application/json',
+                    'text': json.dumps(data, indent=2, ensure_ascii=False)
+                }]
+            }
+        }
+    
+    def _handle_resources_subscribe(self, request: Dict[str, Any],
+                                    subscriber: Optional[Callable[[Dict[str, Any]], None]]) -> Dict[str, Any]:
+        """
+        Abonne le client aux mises à jour d'une ressource.
+        
+        Le projet est sondé par l'ordonnanceur central ; le client reçoit
+        notifications/resources/updated à chaque nouvelle analyse. Une issue
+        doit avoir été lue (son projet est alors connu) ; une règle ne dépend
+        d'aucun projet.
+        """
+        uri = request.get('params', {}).get('uri', '')
+        project_key = self.resources.project_of(uri)
+        if project_key is None:
+            return self._error_response(-32602, f'URI de ressource inconnue ou sans projet: {uri}')
+        if subscriber is None:
+            return self._error_response(-32603, 'Abonnement impossible sans canal de notification')
         
-        return self._error_response(-32602, f'URI de ressource inconnue: {uri}')
+        self.subscriptions.subscribe(uri, project_key, subscriber)
+        return {'result': {}}
     
-    def _error_response(self, code: int, message: str) -> Dict[str, Any]:
-        """Crée une réponse d'erreur MCP."""
-        return {'error': {'code': code, 'message': message}}
+    def _handle_resources_unsubscribe(self, request: Dict[str, Any],
+                                      subscriber: Optional[Callable[[Dict[str, Any]], None]]) -> Dict[str, Any]:
+        """Désabonne le client d'une ressource."""
+        uri = request.get('params', {}).get('uri', '')
+        if subscriber is not None:
+            self.subscriptions.unsubscribe(uri, subscriber)
+        return {'result': {}}
+    
+    def _poll_project_analyses(self, project_key: str):
+        """Vérifie la dernière analyse d'un projet (nouvelle analyse signalée par AnalysisTracker)."""
+        with priority_scope(BACKGROUND):
+            self.api.projects.get_analyses_history(project_key, page_size=1)
+    
+    def _error_response(self, code: int, message: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Crée une réponse d'erreur MCP (data : détails optionnels)."""
+        error = {'code': code, 'message': message}
+        if data is not None:
+            error['data'] = data
+        return {'error': error}
     
     def run(self):
-        """Lance le serveur en mode stdio."""
+        """
+        Lance le serveur en mode stdio.
+        
+        Les requêtes lentes (tools/call, resources/read) sont traitées en parallèle,
+        au plus max_concurrent_requests à la fois ; chaque réponse est écrite dès
+        qu'elle est prête, identifiée par son id. Un batch (tableau JSON) reçoit
+        une unique réponse tableau. Au-delà des limites d'admission, une requête
+        lente est refusée aussitôt (erreur OVERLOADED) : la lecture de stdin n'est
+        jamais bloquée.
+        """
         logger.info("Démarrage serveur MCP en mode stdio")
         
+        # Lecture et écriture en octets UTF-8, sans passer par la couche texte
         try:
-            for line in sys.stdin:
-                if not line.strip():
-                    continue
-                
-                try:
-                    request = json.loads(line)
-                    logger.debug(f"Requête reçue: {request.get('method')}")
-                    
-                    response = self.handle_request(request)
-                    
-                    if response is None:
-                        logger.debug("Notification traitée, aucune réponse")
-                        continue
-                    
-                    # Ajouter l'ID de la requête si présent
-                    if 'id' in request:
-                        response['id'] = request['id']
-                    response['jsonrpc'] = '2.0'
-                    
-                    print(json.dumps(response, ensure_ascii=True))
-                    sys.stdout.flush()
-                    logger.debug(f"Réponse envoyée pour {request.get('method')}")
-                
-                except json.JSONDecodeError as e:
-                    logger.error(f"JSON invalide: {e}")
-                    error_response = {
-                        'jsonrpc': '2.0',
-                        'error': {'code': -32700, 'message': 'Parse error'}
-                    }
-                    print(json.dumps(error_response))
-                    sys.stdout.flush()
-        
+            self.serve(MessageReader(sys.stdin.buffer), MessageWriter(sys.stdout.buffer))
         except KeyboardInterrupt:
             logger.info("Arrêt serveur MCP (Ctrl+C)")
         except Exception as e:
             logger.error(f"Erreur fatale: {e}", exc_info=True)
             raise
+        finally:
+            self.subscriptions.shutdown()
+            self.resources.shutdown()
+    
+    def serve(self, reader: MessageReader, writer: MessageWriter):
+        """
+        Traite un flux JSON-RPC jusqu'à sa fin (stdio et connexions du démon partagé).
+        
+        Les méthodes rapides sont traitées dans l'ordre de lecture ; les autres sont
+        admises (ou refusées) à la lecture puis traitées en parallèle.
+        
+        Args:
+            reader: Lecture des messages du client
+            writer: Écriture des réponses et notifications (sérialisée entre threads)
+        """
+        reader.max_bytes = self.config.max_message_bytes
+        executor = ThreadPoolExecutor(
+            max_workers=self.config.max_concurrent_requests,
+            thread_name_prefix="mcp-request"
+        )
+        try:
+            while True:
+                try:
+                    line = reader.read_message()
+                except MessageTooLargeError as e:
+                    logger.error(str(e))
+                    self._send(writer, {
+                        'jsonrpc': '2.0',
+                        'id': None,
+                        'error': {'code': -32600, 'message': 'Invalid Request', 'data': {'max_bytes': e.max_bytes}}
+                    })
+                    continue
+                if line is None:
+                    break
+                if not line.strip():
+                    continue
+                self._dispatch_line(line, executor, writer)
+        finally:
+            # Laisser les requêtes en cours écrire leur réponse
+            executor.shutdown(wait=True)
+    
+    def _dispatch_line(self, line: bytes, executor: ThreadPoolExecutor, writer: MessageWriter):
+        """
+        Décode une ligne JSON-RPC et la traite directement ou en parallèle.
+        
+        Args:
+            line: Ligne lue (octets UTF-8)
+            executor: Pool de threads des requêtes concurrentes
+            writer: Écriture des réponses
+        """
+        try:
+            request = json.loads(line.decode('utf-8'))
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            logger.error(f"JSON invalide: {e}")
+            self._send(writer, {
+                'jsonrpc': '2.0',
+                'error': {'code': -32700, 'message': 'Parse error'}
+            })
+            return
+        
+        if not isinstance(request, (dict, list)):
+            logger.error(f"Requête invalide (ni objet ni tableau): {request!r}")
+            writer.write(self.encode_invalid_request())
+            return
+        
+        method = self.admission_key(request)
+        logger.debug(f"Requête reçue: {method}")
+        
+        if self.is_inline(request):
+            self._process_request(request, writer)
+            return
+        
+        # Requête lente (ou batch, traité comme une requête lente) : admise dans la file ou refusée
+        if not self.admission.try_acquire(method):
+            logger.warning(f"Requête {method} refusée: serveur surchargé")
+            data = self.encode_overloaded(request, method)
+            if data is not None:
+                writer.write(data)
+            return
+        
+        handler = self._process_batch if isinstance(request, list) else self._process_request
+        try:
+            executor.submit(self._run_and_release, handler, request, method, writer)
+        except Exception:
+            self.admission.release(method)
+            raise
+    
+    def _run_and_release(self, handler: Callable[[Any, MessageWriter], None], message: Any,
+                         method: Optional[str], writer: MessageWriter):
+        """Traite une requête ou un batch dans un thread du pool puis libère sa place."""
+        try:
+            handler(message, writer)
+        except Exception as e:
+            logger.error(f"Erreur inattendue pour {method}: {e}", exc_info=True)
+        finally:
+            self.admission.release(method)
+    
+    def _process_batch(self, batch: List[Any], writer: MessageWriter):
+        """Traite un batch et écrit sa réponse tableau."""
+        responses = self.handle_batch(batch, notify=lambda message: self._send(writer, message))
+        if responses:
+            writer.write(json.dumps(responses, ensure_ascii=False))
+    
+    def process_message(self, message: Any,
+                        notify: Optional[Callable[[Dict[str, Any]], None]] = None,
+                        subscriber: Optional[Callable[[Dict[str, Any]], None]] = None) -> Optional[str]:
+        """
+        Traite un message ou un batch JSON-RPC décodé, après admission (transport HTTP).
+        
+        Args:
+            message: Message décodé (objet ou tableau)
+            notify: Envoi des notifications au client pendant le traitement (optionnel)
+            subscriber: Envoi des notifications d'abonnement au client (par défaut: notify)
+        
+        Returns:
+            Réponse encodée ou None si aucune réponse n'est attendue ; erreur
+            OVERLOADED si la file d'entrée est pleine, Invalid Request si le
+            message n'est ni un objet ni un tableau
+        """
+        if not isinstance(message, (dict, list)):
+            return self.encode_invalid_request()
+        if self.is_inline(message):
+            return self.encode_response(message, notify, subscriber)
+        method = self.admission_key(message)
+        if not self.admission.try_acquire(method):
+            logger.warning(f"Requête {method} refusée: serveur surchargé")
+            return self.encode_overloaded(message, method)
+        try:
+            if isinstance(message, list):
+                responses = self.handle_batch(message, notify, subscriber)
+                return json.dumps(responses, ensure_ascii=False) if responses else None
+            return self.encode_response(message, notify, subscriber)
+        finally:
+            self.admission.release(method)
+    
+    def is_inline(self, message: Any) -> bool:
+        """
+        Indique si un message est traité directement, hors admission : méthode rapide
+        ou appel d'un outil de diagnostic (INLINE_TOOLS).
+        """
+        if not isinstance(message, dict):
+            return False
+        method = message.get('method')
+        if method in self.INLINE_METHODS:
+            return True
+        params = message.get('params')
+        return method == 'tools/call' and isinstance(params, dict) and params.get('name') in self.INLINE_TOOLS
+    
+    @staticmethod
+    def admission_key(message: Any) -> Optional[str]:
+        """Méthode comptée par l'admission ('batch' pour un tableau JSON-RPC)."""
+        if isinstance(message, list):
+            return 'batch'
+        return message.get('method') if isinstance(message, dict) else None
+    
+    def encode_invalid_request(self) -> str:
+        """Réponse encodée d'un message qui n'est ni un objet ni un tableau JSON-RPC (id null)."""
+        return json.dumps(self._with_envelope({'id': None}, self._error_response(-32600, 'Invalid Request')))
+    
+    def encode_overloaded(self, message: Any, method: Optional[str]) -> Optional[str]:
+        """
+        Réponse encodée d'une requête refusée par l'admission (commun à tous les transports).
+        
+        Args:
+            message: Requête ou batch refusé
+            method: Méthode comptée par l'admission
+        
+        Returns:
+            Erreur OVERLOADED pour chaque requête avec id, None si aucune réponse n'est attendue
+        """
+        entries = message if isinstance(message, list) else [message]
+        responses = [
+            self._with_envelope(entry, self._overloaded_response(method))
+            for entry in entries if isinstance(entry, dict) and 'id' in entry
+        ]
+        if not responses:
+            return None
+        if isinstance(message, list):
+            return json.dumps(responses, ensure_ascii=False)
+        return json.dumps(responses[0], ensure_ascii=False)
+    
+    def _overloaded_response(self, method: Optional[str]) -> Dict[str, Any]:
+        """Erreur OVERLOADED d'une requête refusée par l'admission."""
+        return self._error_response(
+            OVERLOADED, f"Serveur surchargé: trop de requêtes {method} en attente",
+            data=self.admission.limit_data(method)
+        )
+    
+    def handle_batch(self, batch: List[Any],
+                     notify: Optional[Callable[[Dict[str, Any]], None]] = None,
+                     subscriber: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+        """
+        Traite un batch JSON-RPC.
+        
+        Les appels d'outils sont tous soumis au pool avant d'attendre le premier
+        résultat : ils s'exécutent en parallèle. Chacun prend une place tools/call
+        de l'admission (libérée à la fin du batch) ; au-delà de la limite, l'entrée
+        reçoit l'erreur OVERLOADED. Les notifications n'ont pas de réponse.
+        
+        Args:
+            batch: Liste de requêtes JSON-RPC
+            notify: Envoi des notifications au client pendant le traitement (optionnel)
+            subscriber: Envoi des notifications d'abonnement au client (par défaut: notify)
+        
+        Returns:
+            Réponses dans l'ordre des requêtes (liste vide si uniquement des notifications)
+        """
+        if not batch:
+            return [self._with_envelope({'id': None}, self._error_response(-32600, 'Invalid Request'))]
+        
+        pending = []
+        admitted = 0
+        try:
+            for entry in batch:
+                if not isinstance(entry, dict):
+                    error = self._error_response(-32600, 'Invalid Request')
+                    pending.append(({'id': None}, lambda error=error: error))
+                elif entry.get('method') == 'tools/call':
+                    if not self.is_inline(entry):
+                        if not self.admission.try_acquire('tools/call'):
+                            error = self._overloaded_response('tools/call')
+                            pending.append((entry, lambda error=error: error))
+                            continue
+                        admitted += 1
+                    pending.append((entry, self._submit_tool_call(entry, notify, subscriber or notify)))
+                else:
+                    response = self.handle_request(entry, notify, subscriber)
+                    pending.append((entry, lambda response=response: response))
+            
+            responses = []
+            for entry, wait in pending:
+                response = wait()
+                if response is None or 'id' not in entry:
+                    continue
+                responses.append(self._with_envelope(entry, response))
+            return responses
+        finally:
+            for _ in range(admitted):
+                self.admission.release('tools/call')
+    
+    @staticmethod
+    def _with_envelope(request: Dict[str, Any], response: Dict[str, Any]) -> Dict[str, Any]:
+        """Ajoute l'id de la requête et la version JSON-RPC à une réponse."""
+        if 'id' in request:
+            response['id'] = request['id']
+        response['jsonrpc'] = '2.0'
+        return response
+    
+    def encode_response(self, request: Dict[str, Any],
+                        notify: Optional[Callable[[Dict[str, Any]], None]] = None,
+                        subscriber: Optional[Callable[[Dict[str, Any]], None]] = None) -> Optional[str]:
+        """
+        Traite une requête et retourne sa réponse JSON-RPC encodée (commun à tous les transports).
+        
+        Args:
+            request: Requête JSON-RPC décodée
+            notify: Envoi des notifications au client pendant le traitement (optionnel)
+            subscriber: Envoi des notifications d'abonnement au client (par défaut: notify)
+        
+        Returns:
+            Réponse encodée en JSON ou None pour les notifications
+        """
+        if request.get('method') == 'tools/list':
+            # Réponse constante, encodée une fois par le registre
+            return self._encode_result(request, self.tools_registry.get_tools_list_json())
+        
+        response = self.handle_request(request, notify, subscriber)
+        if response is None:
+            return None
+        return json.dumps(self._with_envelope(request, response), ensure_ascii=False)
+    
+    def _process_request(self, request: Dict[str, Any], writer: MessageWriter):
+        """
+        Traite une requête et écrit sa réponse.
+        
+        Args:
+            request: Requête JSON-RPC décodée
+            writer: Écriture de la réponse et des notifications
+        """
+        data = self.encode_response(request, notify=lambda message: self._send(writer, message))
+        
+        if data is None:
+            logger.debug("Notification traitée, aucune réponse")
+            return
+        
+        writer.write(data)
+        logger.debug(f"Réponse envoyée pour {request.get('method')}")
+    
+    @staticmethod
+    def _encode_result(request: Dict[str, Any], result_json: str) -> str:
+        """
+        Construit une réponse JSON-RPC autour d'un résultat déjà encodé.
+        
+        Args:
+            request: Requête JSON-RPC décodée
+            result_json: Résultat encodé en JSON
+        
+        Returns:
+            Réponse JSON-RPC encodée
+        """
+        if 'id' in request:
+            return f'{{"result": {result_json}, "id": {json.dumps(request["id"])}, "jsonrpc": "2.0"}}'
+        return f'{{"result": {result_json}, "jsonrpc": "2.0"}}'
+    
+    @staticmethod
+    def _send(writer: MessageWriter, message: Dict[str, Any]):
+        """Écrit un message JSON-RPC (UTF-8, une écriture par message, sérialisée entre threads)."""
+        writer.write(json.dumps(message, ensure_ascii=False))
 
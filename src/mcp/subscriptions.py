@@ -0,0 +1,162 @@
+"""Abonnements aux ressources MCP, servis par un ordonnanceur de sondage central."""
+
+import time
+import logging
+import threading
+from typing import Dict, Any, Optional, Callable, Set
+
+logger = logging.getLogger(__name__)
+
+Sink = Callable[[Dict[str, Any]], None]
+
+
+class SubscriptionManager:
+    """
+    Abonnements resources/subscribe des clients.
+
+    - Un seul thread sonde la dernière analyse de chaque projet suivi, une fois par
+      intervalle, quel que soit le nombre d'abonnés
+    - notifications/resources/updated n'est envoyé qu'à l'arrivée d'une nouvelle
+      analyse (signalée par AnalysisTracker, voir notify_project)
+    - Un abonné dont l'envoi échoue (client déconnecté, session fermée) est retiré
+    """
+
+    def __init__(self, poll: Callable[[str], None], interval: float = 30.0):
+        """
+        Initialise les abonnements.
+
+        Args:
+            poll: Vérifie la dernière analyse d'un projet (appelé avec la clé du projet)
+            interval: Délai (secondes) entre deux sondages d'un même projet
+        """
+        self.poll = poll
+        self.interval = interval
+        self._sinks: Dict[str, Set[Sink]] = {}
+        self._project_uris: Dict[str, Set[str]] = {}
+        self._next_poll: Dict[str, float] = {}
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self.polls = 0
+        self.poll_errors = 0
+        self.notifications = 0
+
+    def subscribe(self, uri: str, project_key: str, sink: Sink):
+        """
+        Abonne un client aux mises à jour d'une ressource.
+
+        Args:
+            uri: URI de la ressource
+            project_key: Projet dont les analyses mettent à jour la ressource
+            sink: Envoi d'un message au client
+        """
+        with self._condition:
+            self._sinks.setdefault(uri, set()).add(sink)
+            self._project_uris.setdefault(project_key, set()).add(uri)
+            if project_key not in self._next_poll:
+                # Premier abonné du projet : sondage immédiat (analyse de référence)
+                self._next_poll[project_key] = time.monotonic()
+            self._ensure_thread()
+            self._condition.notify()
+        logger.info(f"Abonnement à {uri}")
+
+    def unsubscribe(self, uri: str, sink: Sink) -> bool:
+        """
+        Désabonne un client d'une ressource.
+
+        Returns:
+            True si le client était abonné
+        """
+        with self._condition:
+            return self._remove(uri, sink)
+
+    def notify_project(self, project_key: str):
+        """
+        Envoie notifications/resources/updated aux abonnés des ressources du projet.
+
+        Abonné à AnalysisTracker : appelé à chaque nouvelle analyse observée,
+        par le sondage comme par un appel d'outil.
+        """
+        with self._condition:
+            targets = [(uri, list(self._sinks.get(uri, ()))) for uri in self._project_uris.get(project_key, ())]
+
+        failed = []
+        for uri, sinks in targets:
+            message = {'jsonrpc': '2.0', 'method': 'notifications/resources/updated', 'params': {'uri': uri}}
+            for sink in sinks:
+                try:
+                    sink(message)
+                    self.notifications += 1
+                except Exception as e:
+                    logger.info(f"Abonné retiré de {uri}: {e}")
+                    failed.append((uri, sink))
+
+        if failed:
+            with self._condition:
+                for uri, sink in failed:
+                    self._remove(uri, sink)
+
+    def _remove(self, uri: str, sink: Sink) -> bool:
+        """Retire un abonné (à appeler sous self._condition) ; le projet n'est plus sondé sans abonné."""
+        sinks = self._sinks.get(uri)
+        if not sinks or sink not in sinks:
+            return False
+        sinks.discard(sink)
+        if not sinks:
+            del self._sinks[uri]
+            for project_key, uris in list(self._project_uris.items()):
+                uris.discard(uri)
+                if not uris:
+                    del self._project_uris[project_key]
+                    self._next_poll.pop(project_key, None)
+        return True
+
+    def _ensure_thread(self):
+        """Démarre le thread de sondage (à appeler sous self._condition)."""
+        if self._thread is None and not self._stopped:
+            self._thread = threading.Thread(target=self._run, name="mcp-subscriptions", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        """Boucle de sondage : attend la prochaine échéance puis sonde les projets dus."""
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    now = time.monotonic()
+                    due = [key for key, at in self._next_poll.items() if at <= now]
+                    if due:
+                        break
+                    timeout = min(self._next_poll.values()) - now if self._next_poll else None
+                    self._condition.wait(timeout)
+                if self._stopped:
+                    return
+                for project_key in due:
+                    self._next_poll[project_key] = now + self.interval
+
+            for project_key in due:
+                try:
+                    self.poll(project_key)
+                    self.polls += 1
+                except Exception as e:
+                    self.poll_errors += 1
+                    logger.warning(f"Sondage des analyses de {project_key} échoué: {e}")
+
+    def shutdown(self):
+        """Arrête le thread de sondage."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        if self._thread:
+            self._thread.join(5)
+
+    def stats(self) -> Dict[str, int]:
+        """Retourne les compteurs des abonnements."""
+        with self._condition:
+            return {
+                'resources': len(self._sinks),
+                'subscribers': sum(len(sinks) for sinks in self._sinks.values()),
+                'projects': len(self._project_uris),
+                'polls': self.polls,
+                'poll_errors': self.poll_errors,
+                'notifications': self.notifications,
+            }
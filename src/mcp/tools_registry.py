@@ -1,9 +1,11 @@
 """Registre et schémas des outils MCP."""
 
-import yaml
+import os
+import json
+import hashlib
 import logging
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -11,42 +13,116 @@ logger = logging.getLogger(__name__)
 class MCPToolsRegistry:
     """Registre des outils MCP avec descriptions externalisées."""
     
-    def __init__(self, descriptions_file: str = None):
+    # Paramètre des outils paginated : suite d'un résultat découpé en pages
+    CURSOR_PARAMETER = {
+        'type': 'string',
+        'description': "Curseur next_cursor d'une réponse précédente pour obtenir la page suivante (optionnel)"
+    }
+    
+    # Format de l'artefact compilé : à incrémenter si sa structure change
+    CACHE_VERSION = 1
+    
+    def __init__(self, descriptions_file: str = None, cache_file: str = None):
         """
         Initialise le registre des outils.
         
         Args:
             descriptions_file: Chemin vers le fichier YAML de descriptions.
                               Par défaut: tools_descriptions.yaml dans le même dossier.
+            cache_file: Artefact JSON compilé depuis le YAML.
+                        Par défaut: __pycache__/<nom du YAML>.json à côté du YAML.
         """
         if descriptions_file is None:
             descriptions_file = Path(__file__).parent / 'tools_descriptions.yaml'
+        descriptions_file = Path(descriptions_file)
+        if cache_file is None:
+            cache_file = descriptions_file.parent / '__pycache__' / f"{descriptions_file.stem}.json"
+        self.cache_file = Path(cache_file)
         
         try:
-            with open(descriptions_file, 'r', encoding='utf-8') as f:
-                self.descriptions = yaml.safe_load(f)
+            self.descriptions = self._load_descriptions(descriptions_file)
             logger.info(f"Loaded {len(self.descriptions)} tool descriptions from {descriptions_file}")
         except Exception as e:
             logger.error(f"Failed to load tool descriptions: {e}")
             raise
+        
+        # Les descriptions ne changent pas pendant la vie du processus :
+        # schémas et réponse tools/list encodée sont construits une seule fois
+        self._schemas = {name: self._build_tool_schema(desc) for name, desc in self.descriptions.items()}
+        self._tools_list_json = json.dumps({'tools': list(self._schemas.values())}, ensure_ascii=False)
     
-    def get_tool_schema(self, tool_name: str) -> Dict[str, Any]:
+    def _load_descriptions(self, descriptions_file: Path) -> Dict[str, Any]:
         """
-        Récupère le schéma MCP complet d'un outil.
+        Charge les descriptions depuis l'artefact compilé, ou depuis le YAML s'il est périmé.
+        
+        L'artefact est valide si sa version correspond et si le YAML n'a pas changé :
+        même date de modification et taille, sinon même empreinte SHA-256 (fichier
+        touché sans modification). PyYAML n'est importé que pour recompiler.
         
         Args:
-            tool_name: Nom de l'outil (ex: 'sonarqube_issues')
+            descriptions_file: Chemin du fichier YAML
         
         Returns:
-            Schéma MCP de l'outil
+            Descriptions des outils
+        """
+        stat = descriptions_file.stat()
+        cached = self._read_cache()
+        source = (cached or {}).get('source') or {}
+        if source.get('mtime_ns') == stat.st_mtime_ns and source.get('size') == stat.st_size:
+            return cached['descriptions']
         
-        Raises:
-            ValueError: Si l'outil n'est pas trouvé
+        content = descriptions_file.read_bytes()
+        digest = hashlib.sha256(content).hexdigest()
+        if cached is not None and source.get('sha256') == digest:
+            descriptions = cached['descriptions']
+        else:
+            import yaml
+            descriptions = yaml.safe_load(content.decode('utf-8'))
+            logger.debug(f"Tool descriptions compiled from {descriptions_file}")
+        
+        self._write_cache({
+            'version': self.CACHE_VERSION,
+            'source': {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': digest},
+            'descriptions': descriptions,
+        })
+        return descriptions
+    
+    def _read_cache(self) -> Optional[Dict[str, Any]]:
+        """Lit l'artefact compilé (None s'il est absent, illisible ou d'une autre version)."""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(cached, dict) or cached.get('version') != self.CACHE_VERSION:
+            return None
+        return cached
+    
+    def _write_cache(self, artefact: Dict[str, Any]):
+        """Écrit l'artefact compilé (remplacement atomique ; ignoré si le dossier est en lecture seule)."""
+        tmp = self.cache_file.with_name(f"{self.cache_file.name}.{os.getpid()}.tmp")
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(artefact, f, ensure_ascii=False)
+            os.replace(tmp, self.cache_file)
+        except OSError as e:
+            logger.debug(f"Tool descriptions cache not written: {e}")
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+    
+    def _build_tool_schema(self, desc: Dict[str, Any]) -> Dict[str, Any]:
         """
-        desc = self.descriptions.get(tool_name)
-        if not desc:
-            raise ValueError(f"Tool {tool_name} not found in registry")
+        Construit le schéma MCP d'un outil à partir de sa description YAML.
         
+        Args:
+            desc: Description de l'outil
+        
+        Returns:
+            Schéma MCP de l'outil
+        """
         # Construire le schéma inputSchema
         properties = {}
         required = []
@@ -65,12 +141,18 @@ class MCPToolsRegistry:
             if 'items' in param_spec:
                 prop['items'] = param_spec['items']
             
+            if 'default' in param_spec:
+                prop['default'] = param_spec['default']
+            
             properties[param_name] = prop
             
             # Marquer comme required si nécessaire
             if param_spec.get('required', False):
                 required.append(param_name)
         
+        if desc.get('paginated'):
+            properties['cursor'] = dict(self.CURSOR_PARAMETER)
+        
         return {
             'name': desc['name'],
             'description': desc['description'],
@@ -82,14 +164,41 @@ class MCPToolsRegistry:
             }
         }
     
+    def get_tool_schema(self, tool_name: str) -> Dict[str, Any]:
+        """
+        Récupère le schéma MCP complet d'un outil.
+        
+        Args:
+            tool_name: Nom de l'outil (ex: 'sonarqube_issues')
+        
+        Returns:
+            Schéma MCP de l'outil (partagé, à ne pas modifier)
+        
+        Raises:
+            ValueError: Si l'outil n'est pas trouvé
+        """
+        schema = self._schemas.get(tool_name)
+        if not schema:
+            raise ValueError(f"Tool {tool_name} not found in registry")
+        return schema
+    
     def list_all_tools(self) -> List[Dict[str, Any]]:
         """
         Liste tous les outils disponibles avec leurs schémas MCP.
         
         Returns:
-            Liste des schémas MCP de tous les outils
+            Liste des schémas MCP de tous les outils (schémas partagés, à ne pas modifier)
+        """
+        return list(self._schemas.values())
+    
+    def get_tools_list_json(self) -> str:
+        """
+        Retourne le résultat de tools/list déjà encodé en JSON (UTF-8, caractères non échappés).
+        
+        Returns:
+            Fragment JSON {"tools": [...]}
         """
-        return [self.get_tool_schema(name) for name in self.descriptions.keys()]
+        return self._tools_list_json
     
     def get_tool_names(self) -> List[str]:
         """
@@ -100,6 +209,52 @@ class MCPToolsRegistry:
         """
         return list(self.descriptions.keys())
     
+    def get_tool_limits(self, tool_name: str) -> Dict[str, Optional[float]]:
+        """
+        Récupère le timeout, le budget de latence et la durée de mémoïsation déclarés pour un outil.
+        
+        Args:
+            tool_name: Nom de l'outil
+        
+        Returns:
+            Dictionnaire {'timeout', 'latency_budget', 'cache_ttl'} (secondes ou None)
+        """
+        desc = self.descriptions.get(tool_name) or {}
+        return {
+            'timeout': desc.get('timeout'),
+            'latency_budget': desc.get('latency_budget'),
+            'cache_ttl': desc.get('cache_ttl'),
+        }
+    
+    def is_paginated(self, tool_name: str) -> bool:
+        """
+        Indique si les résultats d'un outil peuvent être découpés en pages (paramètre cursor).
+        
+        Args:
+            tool_name: Nom de l'outil
+        
+        Returns:
+            True si l'outil déclare paginated: true
+        """
+        return bool((self.descriptions.get(tool_name) or {}).get('paginated'))
+    
+    def get_parameter_defaults(self, tool_name: str) -> Dict[str, Any]:
+        """
+        Récupère les valeurs par défaut déclarées des paramètres d'un outil.
+        
+        Args:
+            tool_name: Nom de l'outil
+        
+        Returns:
+            Dictionnaire paramètre → valeur par défaut
+        """
+        desc = self.descriptions.get(tool_name) or {}
+        return {
+            name: spec['default']
+            for name, spec in (desc.get('parameters') or {}).items()
+            if 'default' in spec
+        }
+    
     def tool_exists(self, tool_name: str) -> bool:
         """
         Vérifie si un outil existe dans le registre.
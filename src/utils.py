@@ -1,8 +1,9 @@
 """Utilitaires de validation et sécurité."""
 
 import re
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Optional
 
 
 class ValidationError(ValueError):
@@ -150,6 +151,28 @@ def validate_user_login(login: str) -> str:
     return login
 
 
-
-
-
+class lazy_property:
+    """
+    Attribut construit au premier accès puis conservé sur l'instance.
+    
+    Comme functools.cached_property, mais la construction est protégée par un
+    verrou : deux threads ne créent jamais deux instances du même attribut.
+    """
+    
+    def __init__(self, factory: Callable[[Any], Any]):
+        self.factory = factory
+        self.name = factory.__name__
+        self.__doc__ = factory.__doc__
+        self._lock = threading.RLock()
+    
+    def __get__(self, instance: Any, owner: type) -> Any:
+        if instance is None:
+            return self
+        try:
+            return instance.__dict__[self.name]
+        except KeyError:
+            pass
+        with self._lock:
+            if self.name not in instance.__dict__:
+                instance.__dict__[self.name] = self.factory(instance)
+            return instance.__dict__[self.name]
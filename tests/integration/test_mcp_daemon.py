@@ -0,0 +1,218 @@
+"""Tests du démon local partagé (socket Unix)."""
+
+import io
+import os
+import sys
+import json
+import time
+import threading
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.commands.base import CommandResult
+from src.config import SonarQubeConfig
+from src.mcp import daemon as daemon_module
+from src.mcp.daemon import SharedDaemon, relay_stdio, run_cli, tenant_key
+
+ROOT = Path(__file__).resolve().parents[2]
+
+pytestmark = pytest.mark.skipif(not daemon_module.is_supported(), reason="Sockets Unix indisponibles")
+
+
+@pytest.fixture
+def client_env(monkeypatch, tmp_path):
+    """Variables du client : le démon construit sa configuration à partir d'elles."""
+    monkeypatch.setenv('SONARQUBE_URL', 'https://test.sonarqube.com')
+    monkeypatch.setenv('SONARQUBE_TOKEN', 'token-a')
+    monkeypatch.setenv('SONARQUBE_DISK_CACHE_DIR', str(tmp_path / 'cache'))
+    return SonarQubeConfig(url='https://test.sonarqube.com', token='token-a',
+                           daemon_socket=str(tmp_path / 'd.sock'))
+
+
+@pytest.fixture
+def shared_daemon(client_env):
+    """Démon à l'écoute dans un thread, API et commandes mockées."""
+    daemon = SharedDaemon(client_env.daemon_socket, idle_timeout=0)
+    assert daemon.bind()
+    with patch('src.mcp.server.SonarQubeAPI'), patch('src.mcp.server.CommandHandler'):
+        thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+        thread.start()
+        yield daemon
+        daemon.shutdown()
+        thread.join(5)
+
+
+class TestSharedDaemon:
+    """Tests du démon partagé."""
+
+    def test_stdio_relay(self, shared_daemon, client_env):
+        """Test flux JSON-RPC relayé : méthodes rapides et appel d'outil servis par le serveur partagé."""
+        server = shared_daemon.server_for(daemon_module.client_environ())
+        server.command_handler.execute.return_value = CommandResult(success=True, data={'status': 'OK'})
+        requests = [
+            {'jsonrpc': '2.0', 'id': 1, 'method': 'initialize', 'params': {}},
+            {'jsonrpc': '2.0', 'id': 2, 'method': 'ping'},
+            {'jsonrpc': '2.0', 'id': 3, 'method': 'tools/call',
+             'params': {'name': 'sonarqube_quality_gate', 'arguments': {'project_key': 'P'}}},
+        ]
+        stdin = io.BufferedReader(io.BytesIO(''.join(json.dumps(r) + '\n' for r in requests).encode()))
+        stdout = io.BytesIO()
+
+        relay_stdio(client_env, stdin, stdout)
+
+        responses = {m['id']: m for m in map(json.loads, stdout.getvalue().splitlines())}
+        assert responses[1]['result']['serverInfo']['name'] == 'sonarqube-mcp'
+        assert 'result' in responses[2]
+        assert 'OK' in responses[3]['result']['content'][0]['text']
+        server.command_handler.execute.assert_called_once()
+
+    def test_cli_reuses_server(self, shared_daemon, client_env):
+        """Test invocations CLI successives servies par le même serveur."""
+        server = shared_daemon.server_for(daemon_module.client_environ())
+        server.command_handler.execute.return_value = CommandResult(success=True, data={'status': 'OK'})
+
+        for _ in range(2):
+            success, output = run_cli(client_env, 'quality-gate', ['P'])
+            assert success
+            assert json.loads(output)['data'] == {'status': 'OK'}
+
+        assert server.command_handler.execute.call_count == 2
+        assert len(shared_daemon._servers) == 1
+
+    def test_cli_configuration_error(self, shared_daemon, client_env, monkeypatch):
+        """Test configuration invalide du client : erreur renvoyée, démon intact."""
+        monkeypatch.setenv('SONARQUBE_RESULT_FORMAT', 'inconnu')
+        with pytest.raises(ValueError, match='SONARQUBE_RESULT_FORMAT'):
+            run_cli(client_env, 'version', [])
+        assert shared_daemon._servers == {}
+
+    def test_per_token_isolation(self, shared_daemon, client_env):
+        """Test deux tokens : serveurs, caches et dossiers de cache disque distincts."""
+        env_a = daemon_module.client_environ()
+        env_b = {**env_a, 'SONARQUBE_TOKEN': 'token-b'}
+
+        server_a = shared_daemon.server_for(env_a)
+        server_b = shared_daemon.server_for(env_b)
+
+        assert server_a is shared_daemon.server_for(dict(env_a))
+        assert server_a is not server_b
+        assert server_b.config.token == 'token-b'
+        assert server_a.tool_cache is not server_b.tool_cache
+        assert server_a.config.disk_cache_dir != server_b.config.disk_cache_dir
+        assert tenant_key(env_a) != tenant_key(env_b)
+
+    def test_admission_before_queueing(self, shared_daemon, client_env):
+        """Test appels lents au-delà de la limite tools/call : refus OVERLOADED immédiat, file vide ensuite."""
+        server = shared_daemon.server_for(daemon_module.client_environ())
+        release = threading.Event()
+
+        def blocked_execute(command, args):
+            release.wait(5)
+            return CommandResult(success=True, data={'status': 'OK'})
+
+        server.command_handler.execute.side_effect = blocked_execute
+        limit = server.admission.limits['tools/call']
+        requests = [
+            {'jsonrpc': '2.0', 'id': i, 'method': 'tools/call',
+             'params': {'name': 'sonarqube_quality_gate', 'arguments': {'project_key': f'P{i}'}}}
+            for i in range(150)
+        ]
+        stdin = io.BufferedReader(io.BytesIO(''.join(json.dumps(r) + '\n' for r in requests).encode()))
+        stdout = io.BytesIO()
+        threading.Timer(0.5, release.set).start()
+
+        relay_stdio(client_env, stdin, stdout)
+
+        responses = list(map(json.loads, stdout.getvalue().splitlines()))
+        assert len(responses) == 150
+        overloaded = [m for m in responses if m.get('error', {}).get('code') == -32001]
+        assert len(overloaded) == 150 - limit
+        assert server.admission.stats()['methods']['tools/call']['rejected'] == 150 - limit
+        assert server.admission.stats()['pending'] == 0
+
+    def test_idle_tenant_evicted(self, shared_daemon, client_env):
+        """Test configuration inactive : serveur arrêté et retiré, recréé à la connexion suivante."""
+        server = shared_daemon.server_for(daemon_module.client_environ())
+        server.command_handler.execute.return_value = CommandResult(success=True, data={'status': 'OK'})
+        run_cli(client_env, 'quality-gate', ['P'])
+
+        assert shared_daemon.evict_idle_tenants() == 0
+        shared_daemon.tenant_idle_timeout = 0.01
+        time.sleep(0.05)
+        with patch.object(server.subscriptions, 'shutdown') as subscriptions, \
+                patch.object(server.resources, 'shutdown') as resources, \
+                patch.object(server.tool_executor, 'shutdown') as tool_executor:
+            assert shared_daemon.evict_idle_tenants() == 1
+        subscriptions.assert_called_once()
+        resources.assert_called_once()
+        tool_executor.assert_called_once_with(wait=False)
+        assert shared_daemon._servers == {}
+        assert shared_daemon.server_for(daemon_module.client_environ()) is not server
+
+    def test_connected_tenant_kept(self, shared_daemon, client_env):
+        """Test configuration avec une connexion ouverte : jamais retirée."""
+        key, server = shared_daemon._open_tenant(daemon_module.client_environ(), None)
+        shared_daemon.tenant_idle_timeout = 0.01
+        time.sleep(0.05)
+
+        assert shared_daemon.evict_idle_tenants() == 0
+        shared_daemon._close_tenant(key)
+        time.sleep(0.05)
+        assert shared_daemon.evict_idle_tenants() == 1
+
+    def test_daemon_environ_without_client_config(self, client_env, monkeypatch):
+        """Test démon lancé sans les variables SONARQUBE_* du premier client (hors logs)."""
+        monkeypatch.setenv('SONARQUBE_LOG_DIR', '/tmp/logs')
+        with patch('src.mcp.daemon.subprocess.Popen') as popen:
+            daemon_module.start_daemon(client_env)
+
+        env = popen.call_args.kwargs['env']
+        assert 'SONARQUBE_TOKEN' not in env and 'SONARQUBE_URL' not in env
+        assert env['SONARQUBE_LOG_DIR'] == '/tmp/logs'
+        assert env['PATH'] == os.environ['PATH']
+
+    def test_single_daemon_per_socket(self, shared_daemon, client_env):
+        """Test un second démon ne prend pas le socket ; socket réservé à l'utilisateur."""
+        assert not SharedDaemon(client_env.daemon_socket).bind()
+        assert os.stat(client_env.daemon_socket).st_mode & 0o077 == 0
+
+    def test_stale_socket_replaced(self, client_env):
+        """Test socket orphelin (démon arrêté sans nettoyage) remplacé."""
+        Path(client_env.daemon_socket).touch()
+        daemon = SharedDaemon(client_env.daemon_socket)
+        try:
+            assert daemon.bind()
+        finally:
+            daemon.shutdown()
+        assert not Path(client_env.daemon_socket).exists()
+
+
+@pytest.mark.slow
+class TestAutoStart:
+    """Démarrage automatique du démon par le CLI."""
+
+    def test_cli_starts_daemon(self, tmp_path):
+        """Test première invocation : démon démarré, arrêté seul après inactivité."""
+        socket_path = tmp_path / 'd.sock'
+        env = {
+            **os.environ,
+            'SONARQUBE_URL': 'https://test.sonarqube.com', 'SONARQUBE_TOKEN': 'test',
+            'SONARQUBE_DAEMON': 'true', 'SONARQUBE_DAEMON_SOCKET': str(socket_path),
+            'SONARQUBE_DAEMON_IDLE_TIMEOUT': '1', 'SONARQUBE_LOG_DIR': str(tmp_path / 'logs'),
+        }
+        result = subprocess.run(
+            [sys.executable, 'sonarqube_cli.py', 'help', 'issues'],
+            cwd=ROOT, env=env, capture_output=True, text=True, timeout=30
+        )
+
+        assert result.returncode == 0
+        assert json.loads(result.stdout)['data']['command'] == 'issues'
+        assert socket_path.exists()
+
+        deadline = time.monotonic() + 10
+        while socket_path.exists() and time.monotonic() < deadline:
+            time.sleep(0.1)
+        assert not socket_path.exists()
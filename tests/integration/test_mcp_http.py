@@ -0,0 +1,359 @@
+"""Tests du transport HTTP du serveur MCP."""
+
+import json
+import time
+import threading
+import http.client
+import pytest
+from urllib.parse import urlsplit
+
+from src.commands.base import CommandResult
+from src.mcp.http_transport import MCPHTTPTransport, SessionManager, SESSION_HEADER
+
+
+@pytest.fixture
+def transport(mcp_server):
+    """Transport HTTP démarré sur un port libre."""
+    transport = MCPHTTPTransport(mcp_server, '127.0.0.1', 0).start()
+    yield transport
+    transport.shutdown()
+
+
+class Client:
+    """Client HTTP MCP minimal (connexion persistante)."""
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.path = parts.path
+        self.conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=10)
+        self.session_id = None
+
+    def request(self, method, body=None, headers=None):
+        headers = dict(headers or {})
+        if self.session_id:
+            headers[SESSION_HEADER] = self.session_id
+        payload = json.dumps(body).encode('utf-8') if body is not None else None
+        if payload is not None:
+            headers['Content-Type'] = 'application/json'
+            headers.setdefault('Accept', 'application/json, text/event-stream')
+        self.conn.request(method, self.path, body=payload, headers=headers)
+        response = self.conn.getresponse()
+        return response, response.read()
+
+    def post(self, body, headers=None):
+        response, data = self.request('POST', body, headers)
+        return response.status, json.loads(data) if data else None
+
+    def initialize(self, name='test-client'):
+        response, data = self.request('POST', {
+            'jsonrpc': '2.0', 'id': 0, 'method': 'initialize',
+            'params': {'clientInfo': {'name': name, 'version': '1.0'}}
+        })
+        self.session_id = response.getheader(SESSION_HEADER)
+        return json.loads(data)
+
+    def close(self):
+        self.conn.close()
+
+
+class TestHTTPTransport:
+    """Tests du protocole streamable HTTP."""
+
+    def test_initialize_creates_session(self, transport):
+        """Test initialize : session créée et renvoyée dans l'en-tête."""
+        client = Client(transport.url)
+        response = client.initialize('ide-1')
+
+        assert response['result']['serverInfo']['name'] == 'sonarqube-mcp'
+        assert client.session_id
+        session = transport.sessions.get(client.session_id)
+        assert session.client_info['name'] == 'ide-1'
+
+    def test_request_without_session(self, transport):
+        """Test requête sans en-tête de session (400) ou session inconnue (404)."""
+        client = Client(transport.url)
+        status, body = client.post({'jsonrpc': '2.0', 'id': 1, 'method': 'ping'})
+        assert status == 400
+        assert body['error']['code'] == -32600
+
+        client.session_id = 'inconnue'
+        status, _ = client.post({'jsonrpc': '2.0', 'id': 1, 'method': 'ping'})
+        assert status == 404
+
+    def test_tools_list_and_notification(self, transport):
+        """Test tools/list (JSON) et notification (202 sans corps)."""
+        client = Client(transport.url)
+        client.initialize()
+
+        status, body = client.post({'jsonrpc': '2.0', 'method': 'notifications/initialized'})
+        assert status == 202
+        assert body is None
+
+        status, body = client.post({'jsonrpc': '2.0', 'id': 'l', 'method': 'tools/list'})
+        assert status == 200
+        assert body['id'] == 'l'
+        assert len(body['result']['tools']) == 15
+
+    def test_overload_shared_between_clients(self, transport):
+        """Test file d'entrée commune aux clients : refus (-32001), ping toujours servi."""
+        release = threading.Event()
+
+        def blocked_execute(command, args):
+            release.wait(5)
+            return CommandResult(success=True, data={})
+
+        transport.server.admission.limits['tools/call'] = 1
+        transport.server.command_handler.execute.side_effect = blocked_execute
+        busy = Client(transport.url)
+        busy.initialize()
+        call = threading.Thread(target=busy.post, args=({
+            'jsonrpc': '2.0', 'id': 1, 'method': 'tools/call',
+            'params': {'name': 'sonarqube_quality_gate', 'arguments': {'project_key': 'P'}}
+        },))
+        call.start()
+        try:
+            deadline = time.monotonic() + 2
+            while transport.server.admission.stats()['pending'] == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            client = Client(transport.url)
+            client.initialize()
+            status, body = client.post({
+                'jsonrpc': '2.0', 'id': 2, 'method': 'tools/call',
+                'params': {'name': 'sonarqube_quality_gate', 'arguments': {'project_key': 'Q'}}
+            })
+            assert status == 200
+            assert body['error']['code'] == -32001
+            _, body = client.post({'jsonrpc': '2.0', 'id': 3, 'method': 'ping'})
+            assert 'result' in body
+        finally:
+            release.set()
+            call.join(5)
+        assert transport.server.admission.stats()['methods']['tools/call']['rejected'] == 1
+
+    def test_batch(self, transport):
+        """Test batch JSON-RPC sur HTTP."""
+        client = Client(transport.url)
+        client.initialize()
+
+        status, body = client.post([
+            {'jsonrpc': '2.0', 'id': 1, 'method': 'ping'},
+            {'jsonrpc': '2.0', 'id': 2, 'method': 'tools/call', 'params': {'name': 'sonarqube_ping'}},
+        ])
+        assert status == 200
+        assert [r['id'] for r in body] == [1, 2]
+
+    def test_sse_response(self, transport):
+        """Test réponse en flux SSE quand le client n'accepte que text/event-stream."""
+        client = Client(transport.url)
+        client.initialize()
+
+        response, data = client.request(
+            'POST', {'jsonrpc': '2.0', 'id': 5, 'method': 'ping'}, {'Accept': 'text/event-stream'}
+        )
+        assert response.getheader('Content-Type') == 'text/event-stream'
+        event = data.decode('utf-8')
+        assert event.startswith('event: message\ndata: ')
+        assert json.loads(event.split('data: ', 1)[1])['id'] == 5
+
+    def test_progress_streamed_on_post(self, transport, mcp_server):
+        """Test avancement puis réponse sur le flux SSE de la requête."""
+        from src.api.progress import current_reporter
+
+        def execute(command, args):
+            current_reporter().page_fetched('/api/issues/search', (1, 1, 2))
+            current_reporter().page_fetched('/api/issues/search', (2, 1, 2))
+            return CommandResult(success=True, data={})
+
+        mcp_server.command_handler.execute = execute
+        client = Client(transport.url)
+        client.initialize()
+
+        response, data = client.request('POST', {
+            'jsonrpc': '2.0', 'id': 9, 'method': 'tools/call',
+            'params': {'name': 'sonarqube_search_issues', 'arguments': {'project_key': 'P'},
+                       '_meta': {'progressToken': 'p1'}}
+        })
+
+        assert response.getheader('Content-Type') == 'text/event-stream'
+        events = [json.loads(chunk.split('data: ', 1)[1]) for chunk in data.decode().split('\n\n') if chunk]
+        assert [e.get('method') for e in events] == ['notifications/progress'] * 2 + [None]
+        assert events[1]['params']['progress'] == 2
+        assert events[-1]['id'] == 9
+
+    def test_server_stream_and_delete(self, transport):
+        """Test flux GET des notifications serveur, fermé par DELETE."""
+        client = Client(transport.url)
+        client.initialize()
+        session = transport.sessions.get(client.session_id)
+        session.send({'jsonrpc': '2.0', 'method': 'notifications/resources/list_changed'})
+
+        stream = Client(transport.url)
+        stream.session_id = client.session_id
+        stream.conn.request('GET', stream.path, headers={
+            'Accept': 'text/event-stream', SESSION_HEADER: client.session_id
+        })
+        response = stream.conn.getresponse()
+        assert response.status == 200
+        first = response.fp.readline() + response.fp.readline()
+        assert b'notifications/resources/list_changed' in first
+
+        response_delete, _ = client.request('DELETE')
+        assert response_delete.status == 200
+        assert transport.sessions.get(client.session_id) is None
+        stream.close()
+
+    def test_subscription_on_session_stream(self, transport, mcp_server):
+        """Test notification d'abonnement mise en file pour le flux GET ; session fermée désabonnée."""
+        client = Client(transport.url)
+        client.initialize()
+        session = transport.sessions.get(client.session_id)
+
+        status, body = client.post({
+            'jsonrpc': '2.0', 'id': 1, 'method': 'resources/subscribe',
+            'params': {'uri': 'sonarqube://project/P'}
+        })
+        assert status == 200 and body['result'] == {}
+
+        mcp_server.subscriptions.notify_project('P')
+        assert session.outbox.get(timeout=1)['params']['uri'] == 'sonarqube://project/P'
+
+        transport.sessions.close(client.session_id)
+        mcp_server.subscriptions.notify_project('P')
+        assert mcp_server.subscriptions.stats()['subscribers'] == 0
+        mcp_server.subscriptions.shutdown()
+
+    def test_foreign_origin_rejected(self, transport):
+        """Test origine distante refusée sur un serveur local."""
+        client = Client(transport.url)
+        response, _ = client.request(
+            'POST', {'jsonrpc': '2.0', 'id': 0, 'method': 'initialize'}, {'Origin': 'https://evil.example'}
+        )
+        assert response.status == 403
+
+    def test_non_local_bind_requires_secret(self, mcp_server):
+        """Test adresse non locale sans secret partagé : démarrage refusé."""
+        with pytest.raises(ValueError, match='SONARQUBE_HTTP_AUTH_TOKEN'):
+            MCPHTTPTransport(mcp_server, '0.0.0.0', 0)
+
+    def test_non_local_bind_origins(self, mcp_server):
+        """Test adresse non locale : seules les origines configurées sont acceptées."""
+        mcp_server.config.http_auth_token = 'secret'
+        mcp_server.config.http_allowed_origins = ['https://IDE.example.com/']
+        transport = MCPHTTPTransport(mcp_server, '0.0.0.0', 0)
+        try:
+            assert transport.is_allowed_origin('https://ide.example.com')
+            assert not transport.is_allowed_origin('http://localhost:3000')
+            assert not transport.is_allowed_origin('https://evil.example')
+            assert transport.is_allowed_origin(None)
+        finally:
+            transport.httpd.server_close()
+
+    def test_bearer_secret(self, mcp_server):
+        """Test secret partagé : requête sans Authorization ou avec un autre secret refusée (401)."""
+        mcp_server.config.http_auth_token = 'secret'
+        transport = MCPHTTPTransport(mcp_server, '127.0.0.1', 0).start()
+        try:
+            client = Client(transport.url)
+            initialize = {'jsonrpc': '2.0', 'id': 0, 'method': 'initialize'}
+            response, _ = client.request('POST', initialize)
+            assert response.status == 401
+            assert response.getheader('WWW-Authenticate') == 'Bearer'
+            response, _ = client.request('POST', initialize, {'Authorization': 'Bearer autre'})
+            assert response.status == 401
+            response, _ = client.request('POST', initialize, {'Authorization': 'Bearer secret'})
+            assert response.status == 200
+        finally:
+            transport.shutdown()
+
+    def test_content_length_validated(self, transport, mcp_server):
+        """Test Content-Length invalide (400) ou au-delà de max_message_bytes (413)."""
+        mcp_server.config.max_message_bytes = 1024
+        for headers, status in [({'Content-Length': 'abc'}, 400), ({'Content-Length': '-1'}, 400),
+                                ({'Content-Length': '2048'}, 413)]:
+            client = Client(transport.url)
+            client.conn.putrequest('POST', client.path)
+            for name, value in headers.items():
+                client.conn.putheader(name, value)
+            client.conn.endheaders()
+            response = client.conn.getresponse()
+            assert response.status == status
+            assert json.loads(response.read())['error']['code'] == -32600
+            client.close()
+
+    def test_unknown_path(self, transport):
+        """Test chemin inconnu."""
+        client = Client(transport.url)
+        client.path = '/autre'
+        response, _ = client.request('POST', {'jsonrpc': '2.0', 'id': 0, 'method': 'ping'})
+        assert response.status == 404
+
+
+class TestSessionManager:
+    """Tests pour SessionManager."""
+
+    def test_expiration(self):
+        """Test expiration après inactivité."""
+        manager = SessionManager(ttl=0.01)
+        session = manager.create()
+        time.sleep(0.02)
+        assert manager.get(session.session_id) is None
+        assert manager.stats()['expired'] == 1
+
+    def test_max_sessions(self):
+        """Test la session la moins récemment utilisée est libérée."""
+        manager = SessionManager(max_sessions=2)
+        first = manager.create()
+        manager.create()
+        manager.create()
+        assert manager.get(first.session_id) is None
+        assert manager.stats()['active'] == 2
+
+
+class TestHTTPLoad:
+    """Test de charge avec des clients locaux."""
+
+    @pytest.mark.slow
+    def test_many_concurrent_clients(self, transport, mcp_server):
+        """Test charge : 16 clients concurrents, 20 appels chacun, un seul serveur partagé."""
+        def slow_execute(command, args):
+            time.sleep(0.01)
+            return CommandResult(success=True, data={'args': args})
+
+        mcp_server.command_handler.execute = slow_execute
+        clients, calls = 16, 20
+        errors = []
+        session_ids = set()
+        lock = threading.Lock()
+
+        def run_client(index):
+            client = Client(transport.url)
+            try:
+                client.initialize(f'client-{index}')
+                with lock:
+                    session_ids.add(client.session_id)
+                for i in range(calls):
+                    status, body = client.post({
+                        'jsonrpc': '2.0', 'id': i, 'method': 'tools/call',
+                        'params': {'name': 'sonarqube_quality_gate', 'arguments': {'project_key': f'P{index}'}}
+                    })
+                    if status != 200 or body.get('id') != i or 'result' not in body:
+                        errors.append((index, i, status, body))
+            except Exception as e:
+                errors.append((index, repr(e)))
+            finally:
+                client.close()
+
+        start = time.monotonic()
+        threads = [threading.Thread(target=run_client, args=(i,)) for i in range(clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(30)
+        elapsed = time.monotonic() - start
+
+        assert errors == []
+        assert len(session_ids) == clients
+        assert transport.sessions.stats()['requests'] == clients * calls
+        # 320 appels de 10 ms sur 8 workers partagés : bien moins que l'exécution en série (3,2 s)
+        assert elapsed < 3.2
@@ -1,6 +1,7 @@
 """Tests du protocole MCP."""
 
 import json
+import time
 import pytest
 
 
@@ -65,7 +66,7 @@ class TestMCPProtocol:
         assert response is not None
         assert 'result' in response
         tools = response['result']['tools']
-        assert len(tools) == 14
+        assert len(tools) == 15
         
         # Vérifier présence de tous les outils de base
         tool_names = [t['name'] for t in tools]
@@ -77,6 +78,7 @@ class TestMCPProtocol:
         assert 'sonarqube_users' in tool_names
         assert 'sonarqube_quality_gate' in tool_names
         assert 'sonarqube_ping' in tool_names
+        assert 'sonarqube_server_stats' in tool_names
         
         # Vérifier présence des nouveaux outils
         assert 'sonarqube_analyses_history' in tool_names
@@ -172,8 +174,11 @@ class TestMCPProtocol:
             ]
         )
         
-        mcp_server.api.projects.get_project = Mock(return_value=mock_project)
-        mcp_server.api.measures.get_component_measures = Mock(return_value=mock_component)
+        mcp_server.api.projects.get = Mock(return_value=mock_project)
+        mcp_server.api.measures.get_component = Mock(return_value=mock_component)
+        mcp_server.api.projects.get_quality_gate_status = Mock(
+            return_value={'projectStatus': {'status': 'OK', 'conditions': []}}
+        )
         
         response = mcp_server.handle_request(request)
         
@@ -193,6 +198,81 @@ class TestMCPProtocol:
         assert data['project']['key'] == 'TestProject'
         assert 'measures' in data
         assert len(data['measures']) == 2
+        assert data['quality_gate']['status'] == 'OK'
+        
+        # Deuxième lecture servie par le cache de lecture
+        mcp_server.handle_request(request)
+        assert mcp_server.api.projects.get.call_count == 1
+        assert mcp_server.resources.stats()['hits'] == 1
+    
+    def test_resources_templates_list(self, mcp_server):
+        """Test requête resources/templates/list."""
+        response = mcp_server.handle_request({'jsonrpc': '2.0', 'id': 8, 'method': 'resources/templates/list'})
+        
+        templates = [t['uriTemplate'] for t in response['result']['resourceTemplates']]
+        assert templates == [
+            'sonarqube://project/{key}', 'sonarqube://file/{key}',
+            'sonarqube://issue/{key}', 'sonarqube://rule/{key}'
+        ]
+    
+    def test_resources_read_issue(self, mcp_server):
+        """Test lecture d'une issue : détail, historique et règle (règle mise en cache)."""
+        from unittest.mock import Mock
+        from src.models import Issue, Rule, Severity, IssueType
+        
+        issue = Issue(key='AX1', rule='dart:S100', severity=Severity.MAJOR, component='TestProject:lib/a.dart',
+                      message='Renommer', type=IssueType.CODE_SMELL, status='OPEN', line=3)
+        mcp_server.api.issues.get = Mock(return_value=issue)
+        mcp_server.api.issues.get_changelog = Mock(return_value={'changelog': [{'user': 'alice'}]})
+        mcp_server.api.rules.get = Mock(return_value=Rule(
+            key='dart:S100', name='Nommage', lang='dart', type='CODE_SMELL', severity=Severity.MAJOR
+        ))
+        
+        response = mcp_server.handle_request({
+            'jsonrpc': '2.0', 'id': 9, 'method': 'resources/read',
+            'params': {'uri': 'sonarqube://issue/AX1'}
+        })
+        data = json.loads(response['result']['contents'][0]['text'])
+        
+        assert data['issue']['severity'] == 'MAJOR'
+        assert data['changelog'] == [{'user': 'alice'}]
+        assert data['rule']['name'] == 'Nommage'
+        assert mcp_server.resources.project_of('sonarqube://issue/AX1') == 'TestProject'
+        
+        mcp_server.handle_request({
+            'jsonrpc': '2.0', 'id': 10, 'method': 'resources/read',
+            'params': {'uri': 'sonarqube://rule/dart:S100'}
+        })
+        assert mcp_server.api.rules.get.call_count == 1
+    
+    def test_resources_read_not_found(self, mcp_server):
+        """Test lecture d'une issue inexistante."""
+        from unittest.mock import Mock
+        
+        mcp_server.api.issues.get = Mock(return_value=None)
+        mcp_server.api.issues.get_changelog = Mock(return_value={})
+        
+        response = mcp_server.handle_request({
+            'jsonrpc': '2.0', 'id': 11, 'method': 'resources/read',
+            'params': {'uri': 'sonarqube://issue/inconnue'}
+        })
+        assert response['error']['code'] == -32602
+    
+    def test_resources_read_file_not_found(self, mcp_server):
+        """Test lecture d'un fichier inexistant (404 SonarQube) : ressource introuvable."""
+        from unittest.mock import Mock
+        from src.api.base import SonarQubeAPIError
+        
+        mcp_server.api.measures.get_component = Mock(side_effect=SonarQubeAPIError(404, 'Component not found'))
+        mcp_server.api.issues.search = Mock(return_value={'issues': []})
+        mcp_server.api.projects.get_source_lines = Mock(side_effect=SonarQubeAPIError(404, 'Component not found'))
+        
+        response = mcp_server.handle_request({
+            'jsonrpc': '2.0', 'id': 12, 'method': 'resources/read',
+            'params': {'uri': 'sonarqube://file/TestProject:absent.dart'}
+        })
+        assert response['error']['code'] == -32602
+        assert response['error']['message'] == 'Fichier non trouvé: TestProject:absent.dart'
     
     def test_resources_read_unknown_uri(self, mcp_server):
         """Test lecture d'une ressource inconnue."""
@@ -210,3 +290,187 @@ class TestMCPProtocol:
         assert 'error' in response
         assert response['error']['code'] == -32602
 
+
+
+class TestResourceSubscriptions:
+    """Tests de resources/subscribe."""
+
+    def test_updated_only_on_new_analysis(self, mcp_server):
+        """Test notification à la nouvelle analyse seulement (sondage central)."""
+        from src.api.cache import AnalysisTracker
+
+        tracker = AnalysisTracker()
+        tracker.add_listener(mcp_server.subscriptions.notify_project)
+        revisions = iter(['AN1', 'AN1', 'AN2'] + ['AN2'] * 100)
+        mcp_server.api.projects.get_analyses_history.side_effect = (
+            lambda key, page_size: tracker.observe(key, next(revisions))
+        )
+        mcp_server.subscriptions.interval = 0.02
+        received = []
+
+        response = mcp_server.handle_request({
+            'jsonrpc': '2.0', 'id': 1, 'method': 'resources/subscribe',
+            'params': {'uri': 'sonarqube://project/TestProject'}
+        }, notify=received.append)
+        assert response == {'result': {}}
+
+        deadline = time.monotonic() + 2
+        while mcp_server.subscriptions.polls < 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        mcp_server.subscriptions.shutdown()
+
+        assert received == [{
+            'jsonrpc': '2.0', 'method': 'notifications/resources/updated',
+            'params': {'uri': 'sonarqube://project/TestProject'}
+        }]
+
+    def test_subscribe_unknown_uri(self, mcp_server):
+        """Test abonnement à une URI inconnue."""
+        response = mcp_server.handle_request({
+            'jsonrpc': '2.0', 'id': 1, 'method': 'resources/subscribe', 'params': {'uri': 'file:///etc'}
+        }, notify=lambda m: None)
+        assert response['error']['code'] == -32602
+
+
+class TestWarmup:
+    """Tests du préchargement au démarrage."""
+    
+    def _initialize(self, mcp_server):
+        return mcp_server.handle_request({'jsonrpc': '2.0', 'id': 1, 'method': 'initialize', 'params': {}})
+    
+    def test_warmup_disabled_by_default(self, mcp_server):
+        """Test aucun préchargement sans opt-in."""
+        self._initialize(mcp_server)
+        
+        assert mcp_server._warmup_thread is None
+        mcp_server.command_handler.execute.assert_not_called()
+    
+    def test_warmup_does_not_delay_initialize(self, mcp_server):
+        """Test initialize répond sans attendre le préchargement."""
+        import time
+        import threading
+        from src.commands.base import CommandResult
+        
+        release = threading.Event()
+        
+        def slow_execute(command, args):
+            release.wait(5)
+            return CommandResult(success=True, data={'command': command})
+        
+        mcp_server.config.warmup_enabled = True
+        mcp_server.command_handler.execute.side_effect = slow_execute
+        
+        start = time.monotonic()
+        response = self._initialize(mcp_server)
+        assert time.monotonic() - start < 0.5
+        assert 'result' in response
+        
+        release.set()
+        mcp_server._warmup_thread.join(5)
+        assert not mcp_server._warmup_thread.is_alive()
+    
+    def test_warmup_prefetches_default_project(self, mcp_server):
+        """Test préchargement Quality Gate, issues et mesures du projet par défaut."""
+        from src.commands.base import CommandResult
+        
+        mcp_server.config.warmup_enabled = True
+        mcp_server.command_handler.execute.return_value = CommandResult(success=True, data={'issues': []})
+        
+        self._initialize(mcp_server)
+        mcp_server._warmup_thread.join(5)
+        
+        mcp_server.api.projects.get_quality_gate_status.assert_called_once_with('TestProject')
+        commands = [c[0] for c in mcp_server.command_handler.execute.call_args_list]
+        assert ('issues', ['TestProject', 'test-user']) in commands
+        assert ('measures', ['TestProject']) in commands
+        
+        # Le premier appel d'outil consomme le résultat préchargé
+        mcp_server.command_handler.execute.reset_mock()
+        response = mcp_server.handle_request({
+            'jsonrpc': '2.0', 'id': 2, 'method': 'tools/call',
+            'params': {'name': 'sonarqube_issues', 'arguments': {}}
+        })
+        assert 'result' in response
+        mcp_server.command_handler.execute.assert_not_called()
+        
+        # Le suivant interroge à nouveau SonarQube (hors mémoïsation)
+        mcp_server.tool_cache.max_bytes = 0
+        mcp_server.handle_request({
+            'jsonrpc': '2.0', 'id': 3, 'method': 'tools/call',
+            'params': {'name': 'sonarqube_issues', 'arguments': {}}
+        })
+        mcp_server.command_handler.execute.assert_called_once()
+    
+    def test_warmup_started_once(self, mcp_server):
+        """Test un seul préchargement malgré plusieurs initialize."""
+        mcp_server.config.warmup_enabled = True
+        
+        self._initialize(mcp_server)
+        thread = mcp_server._warmup_thread
+        self._initialize(mcp_server)
+        
+        assert mcp_server._warmup_thread is thread
+        thread.join(5)
+
+
+class TestCancellation:
+    """Tests de notifications/cancelled."""
+
+    class _PagedSession:
+        """Session HTTP factice : 100 pages de 10 issues, 10 ms par requête."""
+
+        def __init__(self):
+            self.requests = 0
+
+        def request(self, method, url, params=None, **kwargs):
+            from unittest.mock import Mock
+            self.requests += 1
+            time.sleep(0.01)
+            page = params['p']
+            issues = [{'key': f'AX{page}-{i}'} for i in range(10)]
+            return Mock(raise_for_status=lambda: None,
+                        json=lambda: {'issues': issues, 'p': page, 'ps': 10, 'total': 1000})
+
+    def test_cancel_stops_page_fetches(self, mcp_server, mock_config):
+        """Test annulation : plus aucune requête SonarQube envoyée, pas de réponse."""
+        import threading
+        from src.api.base import SonarQubeAPIBase
+        from src.commands.base import CommandResult
+
+        api = SonarQubeAPIBase(mock_config)
+        session = api._session = self._PagedSession()
+
+        def execute(command, args):
+            data = api._get_all_pages('/api/issues/search', {'componentKeys': 'P', 'ps': 10}, 'issues')
+            return CommandResult(success=True, data=data)
+
+        mcp_server.command_handler.execute = execute
+        responses, notifications = [], []
+        call = threading.Thread(target=lambda: responses.append(mcp_server.handle_request({
+            'jsonrpc': '2.0', 'id': 'long', 'method': 'tools/call',
+            'params': {'name': 'sonarqube_search_issues', 'arguments': {'project_key': 'P', 'all_pages': True}}
+        }, notify=notifications.append)))
+        call.start()
+
+        deadline = time.monotonic() + 2
+        while session.requests < 3 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        mcp_server.handle_request({
+            'jsonrpc': '2.0', 'method': 'notifications/cancelled',
+            'params': {'requestId': 'long', 'reason': 'Utilisateur'}
+        }, notify=notifications.append)
+        call.join(2)
+        stopped_at = session.requests
+        time.sleep(0.1)
+
+        assert responses == [None]
+        assert session.requests == stopped_at
+        assert stopped_at < 10
+        assert mcp_server._cancellations == {}
+
+    def test_cancel_unknown_request_ignored(self, mcp_server):
+        """Test annulation d'une requête terminée ou inconnue : ignorée."""
+        response = mcp_server.handle_request({
+            'jsonrpc': '2.0', 'method': 'notifications/cancelled', 'params': {'requestId': 42}
+        })
+        assert response is None
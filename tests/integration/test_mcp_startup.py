@@ -0,0 +1,81 @@
+"""Tests du démarrage différé du serveur MCP."""
+
+import sys
+import json
+import subprocess
+from pathlib import Path
+
+from src.api import SonarQubeAPI
+from src.commands import CommandHandler
+from src.mcp.server import MCPServer
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+class TestLazyStartup:
+    """Tests des imports et constructions différés."""
+
+    def test_heavy_modules_not_imported(self, tmp_path):
+        """Test requests, PyYAML et http.server ne sont pas chargés avant le premier appel d'outil."""
+        code = (
+            "import sys, json\n"
+            "import sonarqube_mcp_server\n"
+            "from src.config import SonarQubeConfig\n"
+            "from src.mcp.server import MCPServer\n"
+            "server = MCPServer(SonarQubeConfig(url='https://sq.example', token='t'))\n"
+            "server.handle_request({'jsonrpc': '2.0', 'id': 1, 'method': 'ping'})\n"
+            "print(json.dumps([m for m in ('requests', 'yaml', 'http.server') if m in sys.modules]))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True,
+            env={'SONARQUBE_LOG_DIR': str(tmp_path), 'PATH': ''}
+        )
+        assert json.loads(result.stdout) == []
+        assert list(tmp_path.iterdir()) == []
+
+    def test_registry_cache_skips_yaml(self, tmp_path):
+        """Test registre chargé depuis l'artefact compilé : PyYAML n'est pas importé."""
+        descriptions = tmp_path / 'tools_descriptions.yaml'
+        descriptions.write_bytes((ROOT / 'src' / 'mcp' / 'tools_descriptions.yaml').read_bytes())
+        code = (
+            "import sys, json\n"
+            "from src.mcp.tools_registry import MCPToolsRegistry\n"
+            f"registry = MCPToolsRegistry({str(descriptions)!r})\n"
+            "print(json.dumps([len(registry.get_tool_names()), 'yaml' in sys.modules]))\n"
+        )
+        runs = [
+            json.loads(subprocess.run(
+                [sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True
+            ).stdout)
+            for _ in range(2)
+        ]
+        assert runs == [[15, True], [15, False]]
+
+    def test_api_clients_created_on_first_use(self, mock_config):
+        """Test clients de domaine et session HTTP créés au premier usage, puis réutilisés."""
+        api = SonarQubeAPI(mock_config)
+        assert 'issues' not in api.__dict__
+
+        issues = api.issues
+        assert api.issues is issues
+        assert issues._session is None
+        assert issues.session is issues.session
+        assert 'measures' not in api.__dict__
+
+    def test_command_groups_created_on_first_use(self, mock_config):
+        """Test groupes de commandes créés avec la table des commandes."""
+        handler = CommandHandler(SonarQubeAPI(mock_config), mock_config)
+        assert 'projects' not in handler.__dict__
+
+        assert handler.commands['projects'] == handler.projects.list_projects
+
+    def test_registry_loaded_after_initialize(self, mock_config):
+        """Test registre chargé en arrière-plan après initialize."""
+        server = MCPServer(mock_config)
+        assert 'tools_registry' not in server.__dict__
+
+        server.handle_request({'jsonrpc': '2.0', 'id': 1, 'method': 'initialize', 'params': {}})
+        server._preload_thread.join(5)
+
+        assert 'tools_registry' in server.__dict__
+        assert len(server.tools_registry.get_tool_names()) == 15
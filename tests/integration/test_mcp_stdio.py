@@ -0,0 +1,385 @@
+"""Tests de la boucle stdio du serveur MCP."""
+
+import io
+import json
+import time
+import threading
+from unittest.mock import patch
+
+from src.commands.base import CommandResult
+
+
+class TimestampedStdout(io.BytesIO):
+    """Stdout factice (flux binaire) enregistrant l'instant d'écriture de chaque message."""
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+        self.writes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def buffer(self):
+        return self
+
+    def write(self, data):
+        with self._lock:
+            self.writes += 1
+            for line in data.splitlines():
+                self.messages.append((time.monotonic(), json.loads(line)))
+            return super().write(data)
+
+
+def _stdin(text):
+    """Stdin factice (couche texte au-dessus d'un flux binaire)."""
+    return io.TextIOWrapper(io.BytesIO(text.encode('utf-8')), encoding='utf-8')
+
+
+def _run(mcp_server, requests):
+    """Exécute run() sur une liste de requêtes et retourne (début, messages écrits)."""
+    stdin = _stdin(''.join(json.dumps(r) + '\n' for r in requests))
+    stdout = TimestampedStdout()
+    start = time.monotonic()
+    with patch('sys.stdin', stdin), patch('sys.stdout', stdout):
+        mcp_server.run()
+    return start, stdout.messages
+
+
+def _tool_call(request_id, name, arguments=None):
+    return {
+        'jsonrpc': '2.0', 'id': request_id, 'method': 'tools/call',
+        'params': {'name': name, 'arguments': arguments or {}}
+    }
+
+
+class TestConcurrentDispatch:
+    """Tests du dispatch concurrent des requêtes."""
+
+    def test_fast_call_not_delayed_by_slow_call(self, mcp_server):
+        """Test latence : un ping n'attend pas un appel d'outil lent."""
+        def slow_execute(command, args):
+            time.sleep(0.5)
+            return CommandResult(success=True, data={'sources': []})
+
+        mcp_server.command_handler.execute.side_effect = slow_execute
+
+        start, messages = _run(mcp_server, [
+            _tool_call(1, 'sonarqube_source_lines', {'file_key': 'lib/main.dart'}),
+            {'jsonrpc': '2.0', 'id': 2, 'method': 'ping'},
+            _tool_call(3, 'sonarqube_ping'),
+        ])
+
+        by_id = {m['id']: t - start for t, m in messages}
+        assert [m['id'] for _, m in messages][-1] == 1
+        assert by_id[2] < 0.25
+        assert by_id[3] < 0.25
+        assert by_id[1] >= 0.5
+
+    def test_slow_calls_run_in_parallel(self, mcp_server):
+        """Test plusieurs appels lents traités en parallèle."""
+        def slow_execute(command, args):
+            time.sleep(0.3)
+            return CommandResult(success=True, data={})
+
+        mcp_server.command_handler.execute.side_effect = slow_execute
+
+        start, messages = _run(mcp_server, [
+            _tool_call(i, 'sonarqube_quality_gate', {'project_key': 'P'}) for i in range(4)
+        ])
+
+        assert sorted(m['id'] for _, m in messages) == [0, 1, 2, 3]
+        assert max(t for t, _ in messages) - start < 1.0
+
+    def test_inflight_cap(self, mcp_server):
+        """Test la limite de requêtes en cours est respectée."""
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def tracked_execute(command, args):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.pop()
+            return CommandResult(success=True, data={})
+
+        mcp_server.config.max_concurrent_requests = 2
+        mcp_server.command_handler.execute.side_effect = tracked_execute
+
+        _, messages = _run(mcp_server, [
+            _tool_call(i, 'sonarqube_quality_gate', {'project_key': 'P'}) for i in range(6)
+        ])
+
+        assert len(messages) == 6
+        assert max(peak) <= 2
+
+    def test_overload_shedding(self, mcp_server):
+        """Test file d'entrée pleine : refus immédiat (-32001), ping toujours servi."""
+        release = threading.Event()
+
+        def blocked_execute(command, args):
+            release.wait(2)
+            return CommandResult(success=True, data={})
+
+        mcp_server.admission.limits['tools/call'] = 2
+        mcp_server.command_handler.execute.side_effect = blocked_execute
+        threading.Timer(0.3, release.set).start()
+
+        start, messages = _run(mcp_server, [
+            _tool_call(i, 'sonarqube_quality_gate', {'project_key': f'P{i}'}) for i in range(5)
+        ] + [{'jsonrpc': '2.0', 'id': 'ping', 'method': 'ping'}])
+
+        by_id = {m['id']: (t - start, m) for t, m in messages}
+        rejected = [i for i in range(5) if 'error' in by_id[i][1]]
+        assert len(rejected) == 3
+        assert by_id[rejected[0]][1]['error']['code'] == -32001
+        assert by_id[rejected[0]][1]['error']['data']['limit'] == 2
+        assert all(by_id[i][0] < 0.2 for i in rejected)
+        assert by_id['ping'][0] < 0.2
+        stats = mcp_server.admission.stats()
+        assert stats['methods']['tools/call']['rejected'] == 3
+        assert stats['pending'] == 0
+
+    def test_server_stats_under_saturation(self, mcp_server):
+        """Test sonarqube_server_stats servi hors admission quand la file tools/call est pleine."""
+        release = threading.Event()
+
+        def blocked_execute(command, args):
+            release.wait(2)
+            return CommandResult(success=True, data={})
+
+        mcp_server.admission.limits['tools/call'] = 1
+        mcp_server.command_handler.execute.side_effect = blocked_execute
+        # API mockée : statistiques remplacées par un résultat fixe
+        mcp_server._server_stats_json = lambda: '{"success":true,"data":{}}'
+        threading.Timer(0.3, release.set).start()
+
+        start, messages = _run(mcp_server, [
+            _tool_call(i, 'sonarqube_quality_gate', {'project_key': f'P{i}'}) for i in range(2)
+        ] + [_tool_call('stats', 'sonarqube_server_stats', {})])
+
+        by_id = {m['id']: (t - start, m) for t, m in messages}
+        assert by_id[1][1]['error']['code'] == -32001
+        assert 'result' in by_id['stats'][1]
+        assert by_id['stats'][0] < 0.2
+        assert mcp_server.admission.stats()['methods']['tools/call']['rejected'] == 1
+
+    def test_responses_tagged_with_id(self, mcp_server):
+        """Test chaque réponse porte l'id et la version JSON-RPC."""
+        _, messages = _run(mcp_server, [
+            {'jsonrpc': '2.0', 'id': 'a', 'method': 'ping'},
+            {'jsonrpc': '2.0', 'method': 'notifications/initialized'},
+            {'jsonrpc': '2.0', 'id': 'b', 'method': 'tools/list'},
+        ])
+
+        assert [m['id'] for _, m in messages] == ['a', 'b']
+        assert all(m['jsonrpc'] == '2.0' for _, m in messages)
+
+    def test_parse_error(self, mcp_server):
+        """Test ligne JSON invalide."""
+        stdin = _stdin('{not json\n')
+        stdout = TimestampedStdout()
+        with patch('sys.stdin', stdin), patch('sys.stdout', stdout):
+            mcp_server.run()
+
+        assert stdout.messages[0][1]['error']['code'] == -32700
+
+    def test_scalar_message_invalid_request(self, mcp_server):
+        """Test ligne JSON valide mais ni objet ni tableau : Invalid Request, id null."""
+        stdin = _stdin('5\n"x"\n')
+        stdout = TimestampedStdout()
+        with patch('sys.stdin', stdin), patch('sys.stdout', stdout):
+            mcp_server.run()
+
+        assert [m['error']['code'] for _, m in stdout.messages] == [-32600, -32600]
+        assert all(m['id'] is None for _, m in stdout.messages)
+        assert mcp_server.process_message(5) == stdout.getvalue().splitlines()[0].decode('utf-8')
+
+
+class TestFraming:
+    """Tests de l'écriture binaire et de la taille maximale des messages."""
+
+    def test_utf8_single_write_per_message(self, mcp_server):
+        """Test messages en UTF-8 non échappé, une écriture par message."""
+        mcp_server.command_handler.execute.return_value = CommandResult(
+            success=True, data={'message': 'Qualité « dégradée »'}
+        )
+        stdout = TimestampedStdout()
+        with patch('sys.stdin', _stdin(json.dumps(_tool_call(1, 'sonarqube_quality_gate', {'project_key': 'P'})) + '\n')), \
+                patch('sys.stdout', stdout):
+            mcp_server.run()
+
+        assert stdout.writes == 1
+        assert 'Qualité « dégradée »'.encode('utf-8') in stdout.getvalue()
+        assert b'\\u00e9' not in stdout.getvalue()
+
+    def test_oversized_message_skipped(self, mcp_server):
+        """Test ligne trop longue refusée, lecture poursuivie sur la ligne suivante."""
+        mcp_server.config.max_message_bytes = 1024
+        stdin = _stdin('{"padding": "' + 'x' * 5000 + '"}\n' + json.dumps({'jsonrpc': '2.0', 'id': 2, 'method': 'ping'}) + '\n')
+        stdout = TimestampedStdout()
+        with patch('sys.stdin', stdin), patch('sys.stdout', stdout):
+            mcp_server.run()
+
+        errors, pong = stdout.messages[0][1], stdout.messages[1][1]
+        assert errors['error']['code'] == -32600
+        assert errors['error']['data'] == {'max_bytes': 1024}
+        assert pong['id'] == 2
+
+
+class TestPreEncodedToolsList:
+    """Tests de la réponse tools/list pré-encodée."""
+
+    def test_same_content_as_handle_request(self, mcp_server):
+        """Test la réponse écrite correspond à handle_request()."""
+        _, messages = _run(mcp_server, [{'jsonrpc': '2.0', 'id': 7, 'method': 'tools/list'}])
+
+        message = messages[0][1]
+        assert message['id'] == 7
+        assert message['jsonrpc'] == '2.0'
+        assert message['result'] == mcp_server.handle_request({'method': 'tools/list'})['result']
+
+    def test_schemas_not_rebuilt(self, mcp_server):
+        """Test les schémas ne sont pas reconstruits à chaque requête."""
+        with patch.object(mcp_server.tools_registry, '_build_tool_schema') as build:
+            _run(mcp_server, [{'jsonrpc': '2.0', 'id': i, 'method': 'tools/list'} for i in range(3)])
+            mcp_server.handle_request({'method': 'tools/list'})
+        build.assert_not_called()
+
+    def test_string_id_encoded(self, mcp_server):
+        """Test un id chaîne (non ASCII) est correctement encodé."""
+        _, messages = _run(mcp_server, [{'jsonrpc': '2.0', 'id': 'req-é"1', 'method': 'tools/list'}])
+        assert messages[0][1]['id'] == 'req-é"1'
+
+
+class TestBatch:
+    """Tests des batchs JSON-RPC."""
+
+    def test_batch_single_array_response(self, mcp_server):
+        """Test un batch reçoit une réponse tableau, sans les notifications."""
+        mcp_server.command_handler.execute.return_value = CommandResult(success=True, data={})
+
+        _, messages = _run(mcp_server, [[
+            {'jsonrpc': '2.0', 'id': 1, 'method': 'ping'},
+            {'jsonrpc': '2.0', 'method': 'notifications/initialized'},
+            _tool_call(2, 'sonarqube_quality_gate', {'project_key': 'P'}),
+            {'jsonrpc': '2.0', 'id': 3, 'method': 'methode/inconnue'},
+        ]])
+
+        assert len(messages) == 1
+        batch = messages[0][1]
+        assert [r['id'] for r in batch] == [1, 2, 3]
+        assert 'result' in batch[1]
+        assert batch[2]['error']['code'] == -32601
+
+    def test_invalid_batches(self, mcp_server):
+        """Test batch vide, entrée invalide et batch de notifications."""
+        assert mcp_server.handle_batch([])[0]['error']['code'] == -32600
+        assert mcp_server.handle_batch([42]) == [
+            {'error': {'code': -32600, 'message': 'Invalid Request'}, 'id': None, 'jsonrpc': '2.0'}
+        ]
+        assert mcp_server.handle_batch([{'jsonrpc': '2.0', 'method': 'notifications/initialized'}]) == []
+
+    def test_batch_tool_calls_admitted_per_entry(self, mcp_server):
+        """Test batch plus grand que la limite tools/call : entrées en trop refusées (-32001), places libérées."""
+        mcp_server.command_handler.execute.return_value = CommandResult(success=True, data={})
+        mcp_server.admission.limits['tools/call'] = 3
+        mcp_server._server_stats_json = lambda: '{"success":true,"data":{}}'
+        calls = [_tool_call(i, 'sonarqube_quality_gate', {'project_key': f'P{i}'}) for i in range(10)]
+
+        _, messages = _run(mcp_server, [calls + [_tool_call('stats', 'sonarqube_server_stats', {})]])
+
+        batch = messages[0][1]
+        assert [r['id'] for r in batch] == list(range(10)) + ['stats']
+        assert all('result' in r for r in batch[:3])
+        assert all(r['error']['code'] == -32001 for r in batch[3:10])
+        assert batch[3]['error']['data']['method'] == 'tools/call'
+        assert 'result' in batch[10]
+        assert mcp_server.command_handler.execute.call_count == 3
+        stats = mcp_server.admission.stats()
+        assert stats['methods']['tools/call']['rejected'] == 7
+        assert stats['pending'] == 0
+
+    def test_batch_faster_than_serial(self, mcp_server):
+        """Test performance : les appels d'un batch s'exécutent en parallèle."""
+        def slow_execute(command, args):
+            time.sleep(0.2)
+            return CommandResult(success=True, data={})
+
+        mcp_server.command_handler.execute = slow_execute
+        # Appels identiques rejoués : mémoïsation désactivée pour mesurer l'exécution
+        mcp_server.tool_cache.max_bytes = 0
+        calls = [_tool_call(i, 'sonarqube_quality_gate', {'project_key': 'P'}) for i in range(4)]
+
+        start = time.monotonic()
+        for call in calls:
+            mcp_server.handle_request(call)
+        serial = time.monotonic() - start
+
+        start = time.monotonic()
+        responses = mcp_server.handle_batch(calls)
+        batched = time.monotonic() - start
+
+        assert [r['id'] for r in responses] == [0, 1, 2, 3]
+        assert serial >= 0.8
+        assert batched < serial / 2
+
+
+class TestProgressNotifications:
+    """Tests des notifications d'avancement."""
+
+    def _progress_execute(self, mcp_server):
+        """Commande factice signalant deux pages puis un lot partiel."""
+        from src.api.progress import current_reporter
+
+        def execute(command, args):
+            reporter = current_reporter()
+            reporter.page_fetched('/api/issues/search', (1, 2, 3))
+            reporter.partial('issues', [{'key': 'A'}, {'key': 'B'}], 0)
+            reporter.page_fetched('/api/issues/search', (2, 2, 3))
+            return CommandResult(success=True, data={'issues': ['A', 'B', 'C']})
+
+        mcp_server.command_handler.execute = execute
+
+    def test_progress_before_response(self, mcp_server):
+        """Test notifications/progress émises avant la réponse, avec le total de pages."""
+        self._progress_execute(mcp_server)
+        call = _tool_call(1, 'sonarqube_search_issues', {'project_key': 'P', 'all_pages': True})
+        call['params']['_meta'] = {'progressToken': 'tok'}
+
+        _, messages = _run(mcp_server, [call])
+
+        methods = [m.get('method') for _, m in messages]
+        assert methods == ['notifications/progress', 'notifications/progress', None]
+        assert [m['params']['progress'] for _, m in messages[:2]] == [1, 2]
+        assert all(m['params']['total'] == 2 and m['params']['progressToken'] == 'tok' for _, m in messages[:2])
+        assert messages[-1][1]['id'] == 1
+
+    def test_partial_results_opt_in(self, mcp_server):
+        """Test lots partiels émis seulement si demandés."""
+        self._progress_execute(mcp_server)
+        call = _tool_call(1, 'sonarqube_search_issues', {'project_key': 'P'})
+        call['params']['_meta'] = {'progressToken': 7, 'partialResults': True}
+
+        _, messages = _run(mcp_server, [call])
+
+        partial = [m for _, m in messages if m.get('method') == 'notifications/sonarqube/partial_result']
+        assert partial[0]['params'] == {
+            'progressToken': 7, 'key': 'issues', 'offset': 0, 'items': [{'key': 'A'}, {'key': 'B'}]
+        }
+
+    def test_no_token_no_notification(self, mcp_server):
+        """Test sans progressToken : uniquement la réponse."""
+        self._progress_execute(mcp_server)
+        mcp_server.command_handler.execute = lambda command, args: CommandResult(success=True, data={})
+        _, messages = _run(mcp_server, [_tool_call(1, 'sonarqube_search_issues', {'project_key': 'P'})])
+        assert [m['id'] for _, m in messages] == [1]
+
+    def test_all_pages_argument(self, mcp_server):
+        """Test l'argument all_pages est transmis à la commande."""
+        assert mcp_server._convert_search_issues_args({'project_key': 'P', 'all_pages': True}) == ['P', '', '', 'all']
+        assert mcp_server._convert_search_issues_args(
+            {'project_key': 'P', 'statuses': ['OPEN'], 'all_pages': True}
+        ) == ['P', '', 'OPEN', 'all']
@@ -1,6 +1,8 @@
 """Tests des appels d'outils MCP."""
 
+import os
 import json
+import time
 import pytest
 from unittest.mock import Mock
 from src.commands.base import CommandResult
@@ -383,3 +385,330 @@ class TestMCPTools:
 
 
 
+
+
+class TestToolLimits:
+    """Tests des timeouts et budgets de latence par outil."""
+    
+    def test_limits_declared_for_every_tool(self):
+        """Test chaque outil déclare un timeout et un budget de latence cohérents."""
+        from src.mcp.tools_registry import MCPToolsRegistry
+        
+        registry = MCPToolsRegistry()
+        for name in registry.get_tool_names():
+            limits = registry.get_tool_limits(name)
+            assert limits['timeout'] > 0, name
+            assert 0 < limits['latency_budget'] <= limits['timeout'], name
+    
+    def test_config_overrides_declared_limits(self, mcp_server):
+        """Test la configuration prime sur les valeurs du YAML."""
+        mcp_server.config.tool_timeouts = {'sonarqube_rule': 3}
+        
+        assert mcp_server._get_tool_limits('sonarqube_rule') == (3, 2)
+        assert mcp_server._get_tool_limits('sonarqube_ping') == (5, 0.5)
+        assert mcp_server._get_tool_limits('outil_inconnu') == (mcp_server.TOOL_TIMEOUT, None)
+    
+    def test_timeout_reported_in_error_data(self, mcp_server):
+        """Test timeout propre à l'outil appliqué et signalé dans error.data."""
+        def slow_execute(command, args):
+            time.sleep(0.5)
+            return CommandResult(success=True, data={})
+        
+        mcp_server.command_handler.execute = slow_execute
+        mcp_server.config.tool_timeouts = {'sonarqube_rule': 0.1}
+        
+        start = time.monotonic()
+        response = mcp_server.handle_request({
+            'jsonrpc': '2.0', 'id': 1, 'method': 'tools/call',
+            'params': {'name': 'sonarqube_rule', 'arguments': {'rule_key': 'dart:S100'}}
+        })
+        
+        assert time.monotonic() - start < 0.4
+        assert 'Timeout' in response['error']['message']
+        data = response['error']['data']
+        assert data['tool'] == 'sonarqube_rule'
+        assert data['timeout'] == 0.1
+        assert data['latency_budget'] == 2
+        assert data['elapsed'] >= 0.1
+    
+    def test_latency_budget_exceeded_logged(self, mcp_server, caplog):
+        """Test dépassement du budget de latence journalisé sans faire échouer l'appel."""
+        def slow_execute(command, args):
+            time.sleep(0.05)
+            return CommandResult(success=True, data={})
+        
+        mcp_server.command_handler.execute = slow_execute
+        mcp_server.config.tool_latency_budgets = {'sonarqube_rule': 0.01}
+        
+        response = mcp_server.handle_request({
+            'jsonrpc': '2.0', 'id': 1, 'method': 'tools/call',
+            'params': {'name': 'sonarqube_rule', 'arguments': {'rule_key': 'dart:S100'}}
+        })
+        
+        assert 'result' in response
+        assert 'Budget de latence dépassé pour sonarqube_rule' in caplog.text
+
+
+class TestToolsRegistryCache:
+    """Tests de l'artefact compilé des descriptions d'outils."""
+    
+    @pytest.fixture
+    def descriptions(self, tmp_path):
+        from pathlib import Path
+        
+        source = Path(__file__).resolve().parents[2] / 'src' / 'mcp' / 'tools_descriptions.yaml'
+        target = tmp_path / 'tools_descriptions.yaml'
+        target.write_bytes(source.read_bytes())
+        return target
+    
+    @staticmethod
+    def _registry(descriptions, yaml_allowed=True):
+        from unittest.mock import patch
+        from src.mcp.tools_registry import MCPToolsRegistry
+        
+        if yaml_allowed:
+            return MCPToolsRegistry(descriptions)
+        with patch('yaml.safe_load', side_effect=AssertionError("YAML relu")):
+            return MCPToolsRegistry(descriptions)
+    
+    def test_compiled_then_reused(self, descriptions):
+        """Test premier chargement compilé dans __pycache__, puis relu sans PyYAML."""
+        first = self._registry(descriptions)
+        assert first.cache_file == descriptions.parent / '__pycache__' / 'tools_descriptions.json'
+        assert first.cache_file.exists()
+        
+        second = self._registry(descriptions, yaml_allowed=False)
+        assert second.descriptions == first.descriptions
+        assert second.get_tools_list_json() == first.get_tools_list_json()
+    
+    def test_stale_after_yaml_change(self, descriptions):
+        """Test YAML modifié : artefact périmé, descriptions recompilées."""
+        self._registry(descriptions)
+        descriptions.write_text(
+            descriptions.read_text(encoding='utf-8').replace('sonarqube_ping:', 'sonarqube_pong:', 1)
+            .replace('name: "sonarqube_ping"', 'name: "sonarqube_pong"', 1),
+            encoding='utf-8'
+        )
+        
+        registry = self._registry(descriptions)
+        assert registry.tool_exists('sonarqube_pong')
+        assert not registry.tool_exists('sonarqube_ping')
+        assert registry.get_tool_schema('sonarqube_pong')['name'] == 'sonarqube_pong'
+        assert self._registry(descriptions, yaml_allowed=False).tool_exists('sonarqube_pong')
+    
+    def test_touched_yaml_matched_by_hash(self, descriptions):
+        """Test YAML touché sans modification : reconnu par son empreinte, pas de recompilation."""
+        registry = self._registry(descriptions)
+        stat = descriptions.stat()
+        os.utime(descriptions, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        
+        self._registry(descriptions, yaml_allowed=False)
+        cached = json.loads(registry.cache_file.read_text(encoding='utf-8'))
+        assert cached['source']['mtime_ns'] == descriptions.stat().st_mtime_ns
+    
+    def test_other_version_recompiled(self, descriptions):
+        """Test artefact d'une autre version ou illisible ignoré."""
+        registry = self._registry(descriptions)
+        cached = json.loads(registry.cache_file.read_text(encoding='utf-8'))
+        cached['version'] = registry.CACHE_VERSION + 1
+        cached['descriptions'] = {}
+        registry.cache_file.write_text(json.dumps(cached), encoding='utf-8')
+        
+        assert len(self._registry(descriptions).get_tool_names()) == 15
+        
+        registry.cache_file.write_text('{tronqué', encoding='utf-8')
+        assert len(self._registry(descriptions).get_tool_names()) == 15
+    
+    def test_read_only_cache_directory(self, descriptions):
+        """Test artefact non inscriptible : descriptions chargées depuis le YAML."""
+        from src.mcp.tools_registry import MCPToolsRegistry
+        
+        blocker = descriptions.parent / 'fichier'
+        blocker.write_text('')
+        registry = MCPToolsRegistry(descriptions, cache_file=blocker / 'tools.json')
+        
+        assert len(registry.get_tool_names()) == 15
+        assert sorted(descriptions.parent.iterdir()) == sorted([blocker, descriptions])
+
+
+class TestResultPagination:
+    """Tests du découpage des résultats via tools/call."""
+    
+    def _call(self, mcp_server, arguments):
+        return mcp_server.handle_request({
+            'jsonrpc': '2.0', 'id': 1, 'method': 'tools/call',
+            'params': {'name': 'sonarqube_search_issues', 'arguments': arguments}
+        })
+    
+    def test_cursor_round_trip(self, mcp_server):
+        """Test première page avec next_cursor puis page suivante via l'argument cursor."""
+        mcp_server.command_handler.execute = Mock(return_value=CommandResult(
+            success=True, data={'issues': [{'key': f'AX{i}'} for i in range(150)], 'total': 150}
+        ))
+        
+        first = json.loads(self._call(mcp_server, {'project_key': 'P'})['result']['content'][0]['text'])
+        assert len(first['data']['issues']) == 100
+        
+        second = json.loads(self._call(
+            mcp_server, {'project_key': 'P', 'cursor': first['metadata']['next_cursor']}
+        )['result']['content'][0]['text'])
+        assert [i['key'] for i in second['data']['issues']] == [f'AX{i}' for i in range(100, 150)]
+        assert 'next_cursor' not in second['metadata']
+        mcp_server.command_handler.execute.assert_called_once()
+    
+    def test_unknown_cursor(self, mcp_server):
+        """Test curseur inconnu : erreur de paramètre."""
+        response = self._call(mcp_server, {'project_key': 'P', 'cursor': 'eDox'})
+        assert response['error']['code'] == -32602
+    
+    def test_cursor_only_in_paginated_schemas(self):
+        """Test le paramètre cursor n'est déclaré que pour les outils dont le résultat est découpé."""
+        from src.mcp.tools_registry import MCPToolsRegistry
+        
+        with_cursor = {
+            tool['name'] for tool in MCPToolsRegistry().list_all_tools()
+            if 'cursor' in tool['inputSchema']['properties']
+        }
+        assert {'sonarqube_issues', 'sonarqube_search_issues', 'sonarqube_projects'} <= with_cursor
+        assert not with_cursor & {'sonarqube_ping', 'sonarqube_server_stats', 'sonarqube_quality_gate',
+                                  'sonarqube_rule', 'sonarqube_measures'}
+    
+    def test_unpaginated_tool_not_split(self, mcp_server):
+        """Test outil sans pagination : résultat complet, sans next_cursor."""
+        mcp_server.command_handler.execute = Mock(return_value=CommandResult(
+            success=True, data={'rule': {'key': 'dart:S100'}, 'params': [{'key': f'p{i}'} for i in range(150)]}
+        ))
+        response = mcp_server.handle_request({
+            'jsonrpc': '2.0', 'id': 1, 'method': 'tools/call',
+            'params': {'name': 'sonarqube_rule', 'arguments': {'rule_key': 'dart:S100'}}
+        })
+        result = json.loads(response['result']['content'][0]['text'])
+        assert len(result['data']['params']) == 150
+        assert 'next_cursor' not in (result.get('metadata') or {})
+
+
+class TestToolResultMemoization:
+    """Tests de la mémoïsation des résultats d'outils."""
+    
+    def _call(self, mcp_server, name, arguments):
+        return mcp_server.handle_request({
+            'jsonrpc': '2.0', 'id': 1, 'method': 'tools/call',
+            'params': {'name': name, 'arguments': arguments}
+        })
+    
+    def test_normalized_arguments_share_result(self, mcp_server):
+        """Test ordre des arguments, ordre des listes et valeurs par défaut : un seul appel."""
+        mcp_server.command_handler.execute = Mock(return_value=CommandResult(success=True, data={'total': 3}))
+        
+        first = self._call(mcp_server, 'sonarqube_search_issues', {'project_key': 'P', 'statuses': ['OPEN', 'FIXED']})
+        second = self._call(mcp_server, 'sonarqube_search_issues',
+                            {'statuses': ['FIXED', 'OPEN'], 'all_pages': False, 'project_key': 'P'})
+        
+        assert second == first
+        mcp_server.command_handler.execute.assert_called_once()
+        assert mcp_server.tool_cache.stats()['hits'] == 1
+        
+        self._call(mcp_server, 'sonarqube_search_issues', {'project_key': 'P', 'statuses': ['OPEN']})
+        assert mcp_server.command_handler.execute.call_count == 2
+    
+    def test_new_analysis_invalidates_project(self, mcp_server):
+        """Test nouvelle analyse : résultats du projet recalculés, autres projets conservés."""
+        from src.api.cache import AnalysisTracker
+        
+        tracker = AnalysisTracker()
+        tracker.add_listener(mcp_server.tool_cache.invalidate_project)
+        mcp_server.command_handler.execute = Mock(return_value=CommandResult(success=True, data={}))
+        
+        for key in ('A', 'B', 'A', 'B'):
+            self._call(mcp_server, 'sonarqube_measures', {'project_key': key})
+        assert mcp_server.command_handler.execute.call_count == 2
+        
+        tracker.observe('A', 'AN1')
+        tracker.observe('A', 'AN2')
+        self._call(mcp_server, 'sonarqube_measures', {'project_key': 'A'})
+        self._call(mcp_server, 'sonarqube_measures', {'project_key': 'B'})
+        assert mcp_server.command_handler.execute.call_count == 3
+    
+    def test_quality_gate_not_memoized(self, mcp_server):
+        """Test Quality Gate jamais mémoïsé : l'âge du cache stale-while-revalidate reste exact."""
+        ages = iter([1.0, 7.5])
+        mcp_server.command_handler.execute = Mock(side_effect=lambda command, args: CommandResult(
+            success=True, data={'projectStatus': {'status': 'OK'}, 'cache': {'age_seconds': next(ages), 'stale': False}}
+        ))
+        
+        texts = [self._call(mcp_server, 'sonarqube_quality_gate', {'project_key': 'P'})['result']['content'][0]['text']
+                 for _ in range(2)]
+        
+        assert [json.loads(t)['data']['cache']['age_seconds'] for t in texts] == [1.0, 7.5]
+        assert mcp_server.tool_cache.stats()['hits'] == 0
+    
+    def test_ttl_and_excluded_results(self, mcp_server):
+        """Test durée par outil (configuration), ping et erreurs jamais mémoïsés."""
+        mcp_server.config.tool_cache_ttls = {'sonarqube_rule': 0}
+        mcp_server.command_handler.execute = Mock(side_effect=lambda command, args: CommandResult(
+            success=command == 'rule', data={}, error=None if command == 'rule' else 'KO'
+        ))
+        
+        for _ in range(2):
+            self._call(mcp_server, 'sonarqube_rule', {'rule_key': 'dart:S100'})
+            self._call(mcp_server, 'sonarqube_measures', {'project_key': 'P'})
+            self._call(mcp_server, 'sonarqube_ping', {})
+        
+        assert mcp_server.command_handler.execute.call_count == 4
+        assert mcp_server.tool_cache.stats()['entries'] == 0
+
+
+class TestServerStats:
+    """Tests de l'outil sonarqube_server_stats."""
+    
+    @pytest.fixture
+    def server(self, mock_config):
+        """Serveur avec le vrai client API (sans réseau) : caches et métriques réels."""
+        from unittest.mock import patch
+        from src.mcp.server import MCPServer
+        
+        with patch('src.mcp.server.CommandHandler'):
+            server = MCPServer(mock_config)
+        yield server
+        server.tool_executor.shutdown(wait=False)
+    
+    def _stats(self, server):
+        response = server.handle_request({
+            'jsonrpc': '2.0', 'id': 1, 'method': 'tools/call',
+            'params': {'name': 'sonarqube_server_stats', 'arguments': {}}
+        })
+        text = response['result']['content'][0]['text']
+        assert '\n' not in text
+        return json.loads(text)['data']
+    
+    def test_tool_and_upstream_metrics(self, server):
+        """Test appels par outil, requêtes par endpoint, caches et processus."""
+        server.command_handler.execute = Mock(side_effect=[
+            CommandResult(success=True, data={}), CommandResult(success=False, data=None, error='KO')
+        ])
+        for project_key in ('A', 'B'):
+            server.handle_request({
+                'jsonrpc': '2.0', 'id': 1, 'method': 'tools/call',
+                'params': {'name': 'sonarqube_measures', 'arguments': {'project_key': project_key}}
+            })
+        server.api.request_metrics.record('/api/issues/search', 0.2)
+        server.api.request_metrics.record('/api/issues/search', 0.4, error=True)
+        
+        stats = self._stats(server)
+        
+        measures = stats['tools']['sonarqube_measures']
+        assert measures['calls'] == 2 and measures['errors'] == 1
+        assert measures['p50_ms'] <= measures['p95_ms'] <= measures['max_ms']
+        assert stats['upstream']['/api/issues/search'] == {
+            'calls': 2, 'errors': 1, 'error_rate': 0.5,
+            'p50_ms': 200.0, 'p95_ms': 400.0, 'p99_ms': 400.0, 'max_ms': 400.0
+        }
+        assert stats['caches']['tool_results']['misses'] == 2
+        assert 'negative' in stats['caches'] and 'source_lines' not in stats['caches']
+        assert stats['requests']['in_flight'] == 0
+        assert stats['process']['threads'] >= 1
+    
+    def test_served_when_pool_saturated(self, server):
+        """Test statistiques servies sans passer par le pool d'outils."""
+        server.tool_executor.submit = Mock(side_effect=AssertionError("pool utilisé"))
+        assert self._stats(server)['requests']['queued'] == 0
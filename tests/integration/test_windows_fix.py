@@ -31,11 +31,12 @@ class TestWindowsCompatibility:
         assert "signal.alarm" not in content, "signal.alarm trouvé dans server.py"
     
     def test_threading_used_for_timeout(self):
-        """Test que threading.Thread est utilisé pour gérer les timeouts."""
+        """Test que les timeouts reposent sur le pool de threads (pas sur les signaux)."""
         project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
         server_path = os.path.join(project_root, "src", "mcp", "server.py")
         
         with open(server_path, "r", encoding="utf-8") as f:
             content = f.read()
         
-        assert "threading.Thread" in content, "threading.Thread non trouvé dans server.py"
+        assert "tool_executor.submit" in content, "pool de threads non utilisé dans server.py"
+        assert "future.result(timeout=" in content, "timeout non géré par le pool dans server.py"
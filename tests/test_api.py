@@ -69,6 +69,79 @@ class TestSonarQubeAPI:
         
         assert exc_info.value.status_code == 404
     
+    @patch('requests.Session.request')
+    def test_request_404_negative_cached(self, mock_request, api):
+        """Test un 404 répété est servi par le cache négatif."""
+        mock_response = Mock()
+        mock_response.status_code = 404
+        mock_response.text = 'Not Found'
+        mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            response=mock_response
+        )
+        mock_request.return_value = mock_response
+        
+        for _ in range(3):
+            with pytest.raises(SonarQubeAPIError) as exc_info:
+                api.rules._request('GET', '/api/rules/show', params={'key': 'dart:S999'})
+            assert exc_info.value.status_code == 404
+        
+        mock_request.assert_called_once()
+        # Le cache est partagé entre les sous-API
+        with pytest.raises(SonarQubeAPIError):
+            api.projects._request('GET', '/api/rules/show', params={'key': 'dart:S999'})
+        mock_request.assert_called_once()
+    
+    @patch('requests.Session.request')
+    def test_request_empty_result_negative_cached(self, mock_request, api):
+        """Test un résultat vide est mis en cache puis invalidé par une nouvelle analyse."""
+        mock_response = Mock()
+        mock_response.json.return_value = {'sources': []}
+        mock_response.raise_for_status = Mock()
+        mock_request.return_value = mock_response
+        params = {'key': 'proj:src/missing.dart'}
+        
+        assert api.projects._request('GET', '/api/sources/lines', params=params) == {'sources': []}
+        assert api.projects._request('GET', '/api/sources/lines', params=params) == {'sources': []}
+        assert mock_request.call_count == 1
+        
+        api.analysis_tracker.observe('proj', 'AN-1')
+        api.analysis_tracker.observe('proj', 'AN-2')
+        api.projects._request('GET', '/api/sources/lines', params=params)
+        assert mock_request.call_count == 2
+    
+    @patch('requests.Session.request')
+    def test_empty_line_range_not_cached_for_whole_file(self, mock_request, config):
+        """Test plage de lignes vide (au-delà de la fin) : les autres plages restent demandées."""
+        config.source_cache_max_lines = 0
+        api = SonarQubeAPI(config)
+        empty, lines = Mock(), Mock()
+        empty.json.return_value = {'sources': []}
+        lines.json.return_value = {'sources': [{'line': 1, 'code': 'a = 1'}]}
+        mock_request.side_effect = [empty, lines]
+        
+        assert api.projects.get_source_lines('proj:a.py', 50, 60) == {'sources': []}
+        assert api.projects.get_source_lines('proj:a.py', 1, 5)['sources'] == [{'line': 1, 'code': 'a = 1'}]
+        assert mock_request.call_count == 2
+        
+        # La même plage vide est servie par le cache négatif
+        assert api.projects.get_source_lines('proj:a.py', 50, 60) == {'sources': []}
+        assert mock_request.call_count == 2
+    
+    @patch('requests.Session.request')
+    def test_request_not_eligible_not_cached(self, mock_request, api):
+        """Test endpoints hors cache négatif et pages suivantes non mis en cache."""
+        mock_response = Mock()
+        mock_response.json.return_value = {'users': []}
+        mock_response.raise_for_status = Mock()
+        mock_request.return_value = mock_response
+        
+        api.users._request('GET', '/api/users/search', params={'q': 'x', 'p': 2})
+        api.users._request('GET', '/api/users/search', params={'q': 'x', 'p': 2})
+        api.users._request('POST', '/api/users/search', params={'q': 'x'})
+        api.users._request('POST', '/api/users/search', params={'q': 'x'})
+        
+        assert mock_request.call_count == 4
+    
     @patch('requests.Session.request')
     def test_search_issues(self, mock_request, api):
         """Test la recherche d'issues."""
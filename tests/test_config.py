@@ -88,6 +88,34 @@ class TestSonarQubeConfig:
         assert config.default_project is not None
         assert config.default_project.key == "test-project"
     
+    def test_config_tool_limits_from_env(self, monkeypatch):
+        """Test les surcharges de limites par outil depuis l'environnement."""
+        monkeypatch.setenv('SONARQUBE_URL', 'https://test.com')
+        monkeypatch.setenv('SONARQUBE_TOOL_TIMEOUTS', 'sonarqube_issues=120, sonarqube_ping=2.5')
+        monkeypatch.setenv('SONARQUBE_TOOL_LATENCY_BUDGETS', 'sonarqube_issues=8')
+        monkeypatch.setenv('SONARQUBE_TOKEN', 'test-token')
+        
+        config = SonarQubeConfig.from_env()
+        
+        assert config.tool_timeouts == {'sonarqube_issues': 120.0, 'sonarqube_ping': 2.5}
+        assert config.tool_latency_budgets == {'sonarqube_issues': 8.0}
+        
+        monkeypatch.setenv('SONARQUBE_TOOL_TIMEOUTS', 'sonarqube_issues')
+        with pytest.raises(ValueError, match="outil=secondes"):
+            SonarQubeConfig.from_env()
+    
+    def test_config_result_format(self, monkeypatch):
+        """Test le choix du format de résultat."""
+        monkeypatch.setenv('SONARQUBE_URL', 'https://test.com')
+        monkeypatch.setenv('SONARQUBE_TOKEN', 'test-token')
+        monkeypatch.setenv('SONARQUBE_RESULT_FORMAT', 'Compact')
+        
+        assert SonarQubeConfig.from_env().result_format == 'compact'
+        
+        monkeypatch.setenv('SONARQUBE_RESULT_FORMAT', 'xml')
+        with pytest.raises(ValueError, match="SONARQUBE_RESULT_FORMAT"):
+            SonarQubeConfig.from_env()
+    
     def test_config_from_yaml_file(self, monkeypatch):
         """Test la création depuis un fichier YAML."""
         monkeypatch.setenv('SONARQUBE_URL', 'https://test.com')
@@ -0,0 +1,237 @@
+"""Tests unitaires pour les caches de l'API."""
+
+import time
+import threading
+import pytest
+from unittest.mock import Mock
+from src.api.cache import (
+    AnalysisTracker, NegativeCache, SourceLinesCache, StaleWhileRevalidateCache,
+    strip_code_markup, compact_source_line
+)
+
+
+def _lines(count):
+    """Génère des lignes de source factices."""
+    return [{'line': i, 'code': f'l{i}'} for i in range(1, count + 1)]
+
+
+class TestStripCodeMarkup:
+    """Tests pour strip_code_markup()."""
+
+    def test_strip_tags_and_entities(self):
+        """Test suppression des balises et décodage des entités."""
+        code = '<span class="k">return</span> a &amp;&amp; <span class="s">"&gt;"</span>;'
+        assert strip_code_markup(code) == 'return a && ">";'
+
+    def test_empty_code(self):
+        """Test code vide ou None."""
+        assert strip_code_markup('') == ''
+        assert strip_code_markup(None) == ''
+
+    def test_compact_line_drops_nulls(self):
+        """Test compactage : valeurs nulles retirées, colonnes conservées."""
+        line = compact_source_line({'line': 3, 'code': '<b>x</b>', 'scmDate': None, 'lineHits': 0})
+        assert line == {'line': 3, 'code': 'x', 'lineHits': 0}
+
+
+class TestSourceLinesCache:
+    """Tests pour SourceLinesCache."""
+
+    def test_get_put(self):
+        """Test ajout et lecture."""
+        cache = SourceLinesCache(max_lines=100)
+        assert cache.get('p:a', 'AN') is None
+        cache.put('p:a', 'AN', _lines(10))
+        assert len(cache.get('p:a', 'AN')) == 10
+        assert cache.get('p:a', 'OTHER') is None
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 2
+
+    def test_lru_eviction_by_total_lines(self):
+        """Test éviction LRU selon le nombre total de lignes."""
+        cache = SourceLinesCache(max_lines=100)
+        cache.put('p:a', None, _lines(40))
+        cache.put('p:b', None, _lines(40))
+        cache.get('p:a', None)
+        cache.put('p:c', None, _lines(40))
+
+        assert cache.get('p:b', None) is None
+        assert cache.get('p:a', None) is not None
+        assert cache.stats()['lines'] == 80
+        assert cache.stats()['evictions'] == 1
+
+    def test_file_larger_than_cache_not_stored(self):
+        """Test fichier plus grand que la capacité."""
+        cache = SourceLinesCache(max_lines=10)
+        cache.put('p:a', None, _lines(11))
+        assert cache.stats()['files'] == 0
+
+    def test_invalidate_project(self):
+        """Test invalidation des fichiers d'un projet."""
+        cache = SourceLinesCache(max_lines=100)
+        cache.put('p1:a', 'AN', _lines(5))
+        cache.put('p2:a', 'AN', _lines(5))
+        cache.invalidate_project('p1')
+        assert cache.get('p1:a', 'AN') is None
+        assert cache.get('p2:a', 'AN') is not None
+        assert cache.stats()['lines'] == 5
+
+
+class TestAnalysisTracker:
+    """Tests pour AnalysisTracker."""
+
+    def test_first_observation_does_not_notify(self):
+        """Test première observation sans notification."""
+        tracker = AnalysisTracker()
+        listener = Mock()
+        tracker.add_listener(listener)
+
+        assert tracker.observe('p', 'AN-1') is False
+        assert tracker.revision('p') == 'AN-1'
+        listener.assert_not_called()
+
+    def test_new_analysis_notifies(self):
+        """Test nouvelle analyse : listeners notifiés."""
+        tracker = AnalysisTracker()
+        listener = Mock()
+        tracker.add_listener(listener)
+        tracker.observe('p', 'AN-1')
+
+        assert tracker.observe('p', 'AN-2') is True
+        listener.assert_called_once_with('p')
+
+    def test_needs_check(self):
+        """Test intervalle de vérification."""
+        tracker = AnalysisTracker(check_interval=3600)
+        assert tracker.needs_check('p') is True
+        tracker.observe('p', 'AN-1')
+        assert tracker.needs_check('p') is False
+        tracker.check_interval = 0
+        assert tracker.needs_check('p') is True
+
+
+class TestStaleWhileRevalidateCache:
+    """Tests pour StaleWhileRevalidateCache."""
+
+    def test_first_call_blocks(self):
+        """Test premier appel : chargement bloquant, âge nul."""
+        cache = StaleWhileRevalidateCache(refresh_after=10, max_staleness=300)
+        loader = Mock(return_value='OK')
+
+        value, age = cache.get('p', loader)
+
+        assert value == 'OK'
+        assert age == 0.0
+        loader.assert_called_once()
+
+    def test_fresh_value_served_without_refresh(self):
+        """Test valeur récente servie sans appel."""
+        cache = StaleWhileRevalidateCache(refresh_after=10, max_staleness=300)
+        cache.get('p', Mock(return_value='OK'))
+        loader = Mock(return_value='NEW')
+
+        value, age = cache.get('p', loader)
+
+        assert value == 'OK'
+        assert age < 10
+        loader.assert_not_called()
+
+    def test_stale_value_served_and_refreshed_in_background(self):
+        """Test valeur ancienne servie immédiatement puis rafraîchie."""
+        cache = StaleWhileRevalidateCache(refresh_after=0, max_staleness=300)
+        cache.get('p', Mock(return_value='OLD'))
+        release = threading.Event()
+
+        def slow_loader():
+            release.wait(2)
+            return 'NEW'
+
+        start = time.monotonic()
+        value, _ = cache.get('p', slow_loader)
+        assert value == 'OLD'
+        assert time.monotonic() - start < 0.5
+
+        release.set()
+        for _ in range(100):
+            if cache.stats()['refreshing'] == 0:
+                break
+            time.sleep(0.01)
+        assert cache.get('p', Mock(return_value='NEWER'))[0] == 'NEW'
+        assert cache.stats()['background_refreshes'] >= 1
+
+    def test_max_staleness_forces_blocking_refresh(self):
+        """Test au-delà de max_staleness : rafraîchissement bloquant."""
+        cache = StaleWhileRevalidateCache(refresh_after=0, max_staleness=0.01)
+        cache.get('p', Mock(return_value='OLD'))
+        time.sleep(0.02)
+
+        value, age = cache.get('p', Mock(return_value='NEW'))
+
+        assert value == 'NEW'
+        assert age == 0.0
+
+    def test_background_error_keeps_previous_value(self):
+        """Test erreur de rafraîchissement : ancienne valeur conservée."""
+        cache = StaleWhileRevalidateCache(refresh_after=0, max_staleness=300)
+        cache.get('p', Mock(return_value='OLD'))
+        cache._refresh('p', Mock(side_effect=RuntimeError('boom')))
+
+        assert cache.get('p', Mock(return_value='X'))[0] == 'OLD'
+
+    def test_blocking_error_propagates(self):
+        """Test erreur au premier chargement propagée."""
+        cache = StaleWhileRevalidateCache()
+        with pytest.raises(RuntimeError):
+            cache.get('p', Mock(side_effect=RuntimeError('boom')))
+
+    def test_invalidate(self):
+        """Test invalidation : prochain accès bloquant."""
+        cache = StaleWhileRevalidateCache()
+        cache.get('p', Mock(return_value='OLD'))
+        cache.invalidate('p')
+        assert cache.get('p', Mock(return_value='NEW'))[0] == 'NEW'
+
+
+class TestNegativeCache:
+    """Tests pour NegativeCache."""
+
+    def test_get_put(self):
+        """Test ajout et lecture par endpoint et identifiant."""
+        cache = NegativeCache(ttl=30)
+        cache.put('/api/rules/show', 'dart:S1', 'missing')
+        assert cache.get('/api/rules/show', 'dart:S1') == 'missing'
+        assert cache.get('/api/sources/lines', 'dart:S1') is None
+        assert cache.stats() == {'entries': 1, 'hits': 1, 'misses': 1}
+
+    def test_expiration(self):
+        """Test expiration après le TTL."""
+        cache = NegativeCache(ttl=0.01)
+        cache.put('/api/rules/show', 'dart:S1', 'missing')
+        time.sleep(0.02)
+        assert cache.get('/api/rules/show', 'dart:S1') is None
+        assert cache.stats()['entries'] == 0
+
+    def test_disabled(self):
+        """Test TTL nul : rien n'est conservé."""
+        cache = NegativeCache(ttl=0)
+        cache.put('/api/rules/show', 'dart:S1', 'missing')
+        assert cache.get('/api/rules/show', 'dart:S1') is None
+
+    def test_max_entries(self):
+        """Test borne du nombre d'entrées."""
+        cache = NegativeCache(ttl=30, max_entries=2)
+        for key in ('a', 'b', 'c'):
+            cache.put('/api/rules/show', key, 'missing')
+        assert cache.get('/api/rules/show', 'a') is None
+        assert cache.get('/api/rules/show', 'c') == 'missing'
+
+    def test_invalidate_project(self):
+        """Test invalidation du projet et de ses fichiers."""
+        cache = NegativeCache(ttl=30)
+        cache.put('/api/sources/lines', 'p1:a.dart', 'missing')
+        cache.put('/api/qualitygates/project_status', 'p1', 'missing')
+        cache.put('/api/project_analyses/search', 'p1?ps=1', 'missing')
+        cache.put('/api/sources/lines', 'p10:a.dart', 'missing')
+        cache.invalidate_project('p1')
+        assert cache.stats()['entries'] == 1
+        assert cache.get('/api/sources/lines', 'p10:a.dart') == 'missing'
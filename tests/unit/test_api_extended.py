@@ -58,6 +58,22 @@ class TestIssuesAPIExtended:
             assert params['p'] == 2
             assert params['ps'] == 100
     
+    def test_get(self, config):
+        """Test get par clé (None si introuvable)."""
+        api = IssuesAPI(config)
+
+        with patch.object(api, '_get') as mock_get:
+            mock_get.return_value = {'issues': [{
+                'key': 'ISSUE-123', 'rule': 'dart:S100', 'severity': 'MAJOR', 'component': 'P:a.dart',
+                'message': 'm', 'type': 'BUG', 'status': 'OPEN'
+            }]}
+
+            assert api.get('ISSUE-123').rule == 'dart:S100'
+            assert mock_get.call_args[0][1]['issues'] == 'ISSUE-123'
+
+            mock_get.return_value = {'issues': []}
+            assert api.get('ISSUE-404') is None
+
     def test_assign(self, config):
         """Test assign issue."""
         api = IssuesAPI(config)
@@ -185,11 +201,12 @@ class TestProjectsAPIExtended:
         api = ProjectsAPI(config)
         
         with patch.object(api, '_get') as mock_get:
-            mock_get.return_value = {'sources': []}
+            mock_get.return_value = {'sources': [{'line': i, 'code': ''} for i in range(1, 21)]}
             
             api.get_component_sources('proj1:file.dart', from_line=10, to_line=20)
             
-            mock_get.assert_called_once()
+            sources_calls = [c for c in mock_get.call_args_list if c[0][0] == '/api/sources/lines']
+            assert len(sources_calls) == 1
     
     def test_health_check(self, config):
         """Test health_check."""
@@ -0,0 +1,34 @@
+"""Tests unitaires pour les métriques d'exécution."""
+
+from src.api.metrics import RequestMetrics, process_stats
+
+
+class TestRequestMetrics:
+    """Tests pour RequestMetrics."""
+
+    def test_percentiles(self):
+        """Test percentiles au rang le plus proche, en millisecondes."""
+        metrics = RequestMetrics()
+        for ms in range(1, 101):
+            metrics.record('/api/rules/show', ms / 1000)
+
+        stats = metrics.snapshot()['/api/rules/show']
+        assert (stats['p50_ms'], stats['p95_ms'], stats['p99_ms'], stats['max_ms']) == (50.0, 95.0, 99.0, 100.0)
+        assert stats['error_rate'] == 0
+
+    def test_window_bounds_latencies_not_counts(self):
+        """Test fenêtre de latences bornée, compteurs complets."""
+        metrics = RequestMetrics(window=10)
+        for i in range(100):
+            metrics.record('outil', 1.0 if i < 90 else 0.001, error=i % 2 == 0)
+
+        stats = metrics.snapshot()['outil']
+        assert stats['calls'] == 100
+        assert stats['errors'] == 50
+        assert stats['max_ms'] == 1.0
+
+    def test_process_stats(self):
+        """Test occupation du processus (mémoire mesurée sous Linux)."""
+        stats = process_stats()
+        assert stats['threads'] >= 1
+        assert stats['rss_bytes'] is None or stats['rss_bytes'] > 0
@@ -0,0 +1,148 @@
+"""Tests unitaires pour le suivi d'avancement des appels API."""
+
+import pytest
+from unittest.mock import Mock, patch
+
+from src.api.issues import IssuesAPI
+from src.api.progress import (
+    ProgressReporter, extract_paging, progress_scope, current_reporter,
+    CancellationToken, RequestCancelledError, cancellation_scope
+)
+from src.config import SonarQubeConfig
+
+
+def _issues_page(page, page_size, total):
+    """Page factice de /api/issues/search."""
+    start = (page - 1) * page_size
+    count = max(min(page_size, total - start), 0)
+    return {
+        'total': total, 'p': page, 'ps': page_size,
+        'paging': {'pageIndex': page, 'pageSize': page_size, 'total': total},
+        'issues': [
+            {'key': f'AX{start + i}', 'rule': 'dart:S1', 'severity': 'MAJOR', 'component': 'p:a.dart',
+             'message': 'm', 'type': 'CODE_SMELL', 'status': 'OPEN'}
+            for i in range(count)
+        ],
+    }
+
+
+@pytest.fixture
+def issues_api():
+    config = SonarQubeConfig(url="https://test.sonarqube.com", token="t", page_size=2, negative_cache_ttl=0)
+    return IssuesAPI(config)
+
+
+def _paged_responses(total, page_size=2):
+    def request(method, url, params=None, **kwargs):
+        response = Mock()
+        response.json.return_value = _issues_page(params['p'], params['ps'], total)
+        return response
+    return request
+
+
+class TestExtractPaging:
+    """Tests pour extract_paging()."""
+
+    def test_paging_object(self):
+        """Test format paging."""
+        assert extract_paging({'paging': {'pageIndex': 2, 'pageSize': 100, 'total': 250}}) == (2, 100, 250)
+
+    def test_flat_format(self):
+        """Test ancien format à plat."""
+        assert extract_paging({'p': 1, 'ps': 500, 'total': 3}) == (1, 500, 3)
+
+    def test_not_paginated(self):
+        """Test réponse non paginée."""
+        assert extract_paging({'rule': {}}) is None
+        assert extract_paging([]) is None
+
+
+class TestProgressReporter:
+    """Tests pour ProgressReporter."""
+
+    def test_pages_against_total(self):
+        """Test pages récupérées rapportées au total attendu."""
+        on_progress = Mock()
+        reporter = ProgressReporter(on_progress)
+        reporter.page_fetched('/api/issues/search', (1, 100, 250))
+        reporter.page_fetched('/api/issues/search', (2, 100, 250))
+
+        assert [c.args[:2] for c in on_progress.call_args_list] == [(1, 3), (2, 3)]
+
+    def test_total_capped(self):
+        """Test total plafonné à la limite d'éléments accessibles."""
+        on_progress = Mock()
+        ProgressReporter(on_progress).page_fetched('/api/issues/search', (1, 500, 50000), max_items=10000)
+        assert on_progress.call_args.args[1] == 20
+
+    def test_callback_error_swallowed(self):
+        """Test une erreur d'envoi n'interrompt pas l'appel."""
+        reporter = ProgressReporter(Mock(side_effect=BrokenPipeError()), Mock(side_effect=OSError()))
+        reporter.page_fetched('/api/issues/search', (1, 10, 5))
+        reporter.partial('issues', [1], 0)
+
+    def test_scope_restored(self):
+        """Test le suivi n'est actif que dans son contexte."""
+        reporter = ProgressReporter(Mock())
+        with progress_scope(reporter):
+            assert current_reporter() is reporter
+        assert current_reporter() is None
+
+
+class TestAllPages:
+    """Tests de la récupération de toutes les pages."""
+
+    @patch('requests.Session.request')
+    def test_all_pages_with_progress_and_partials(self, mock_request, issues_api):
+        """Test toutes les pages récupérées, avancement et lots partiels signalés."""
+        mock_request.side_effect = _paged_responses(total=5)
+        progress, partials = [], []
+        reporter = ProgressReporter(
+            lambda done, total, message: progress.append((done, total)),
+            lambda key, items, offset: partials.append((key, len(items), offset))
+        )
+
+        with progress_scope(reporter):
+            result = issues_api.search(project_keys=['p'], all_pages=True)
+
+        assert [issue.key for issue in result['issues']] == [f'AX{i}' for i in range(5)]
+        assert result['total'] == 5
+        assert result['paging'] == {'pageIndex': 1, 'pageSize': 5, 'total': 5}
+        assert mock_request.call_count == 3
+        assert progress == [(1, 3), (2, 3), (3, 3)]
+        assert partials == [('issues', 2, 0), ('issues', 2, 2), ('issues', 1, 4)]
+
+    @patch('requests.Session.request')
+    def test_single_page_by_default(self, mock_request, issues_api):
+        """Test sans all_pages : une seule page."""
+        mock_request.side_effect = _paged_responses(total=5)
+        result = issues_api.search(project_keys=['p'])
+        assert len(result['issues']) == 2
+        mock_request.assert_called_once()
+
+
+class TestCancellation:
+    """Tests de l'annulation des appels."""
+
+    @patch('requests.Session.request')
+    def test_cancelled_between_pages(self, mock_request, issues_api):
+        """Test annulation pendant la pagination : aucune page suivante demandée."""
+        mock_request.side_effect = _paged_responses(total=5)
+        token = CancellationToken()
+        reporter = ProgressReporter(lambda done, total, message: token.cancel('stop'))
+
+        with progress_scope(reporter), cancellation_scope(token):
+            with pytest.raises(RequestCancelledError, match='stop'):
+                issues_api.search(project_keys=['p'], all_pages=True)
+
+        mock_request.assert_called_once()
+
+    def test_cancel_callbacks(self):
+        """Test rappels exécutés une seule fois, immédiatement si déjà annulé."""
+        calls = []
+        token = CancellationToken()
+        token.add_callback(lambda: calls.append(1))
+        token.cancel()
+        token.cancel()
+        token.add_callback(lambda: calls.append(2))
+        assert calls == [1, 2]
@@ -94,6 +94,23 @@ class TestAnalysesHistory:
             
             assert result['analyses'] == []
     
+    def test_get_analyses_history_filtered_not_observed(self, api):
+        """Test historique filtré ou vide : la dernière analyse connue est conservée."""
+        listener = Mock()
+        api.analysis_tracker.add_listener(listener)
+        with patch.object(api, '_get') as mock_get:
+            mock_get.return_value = {'analyses': [{'key': 'A2'}, {'key': 'A1'}]}
+            api.get_analyses_history('P', page_size=1)
+            mock_get.return_value = {'analyses': []}
+            api.get_analyses_history('P', from_date='2099-01-01')
+            mock_get.return_value = {'analyses': [{'key': 'A1'}]}
+            api.get_analyses_history('P', from_date='2025-01-01', to_date='2025-01-02')
+            mock_get.return_value = {'analyses': [{'key': 'A2'}, {'key': 'A1'}]}
+            api.get_analyses_history('P', page_size=1)
+        
+        listener.assert_not_called()
+        assert api.analysis_tracker.revision('P') == 'A2'
+    
     def test_get_analyses_history_api_error(self, api):
         """Test erreur API."""
         with patch.object(api, '_get') as mock_get:
@@ -167,67 +184,196 @@ class TestDuplications:
                 api.get_duplications('project:src/main.dart')
 
 
+class TestQualityGateStatus:
+    """Tests pour get_quality_gate_status() (stale-while-revalidate)."""
+    
+    def test_quality_gate_first_call(self, api):
+        """Test premier appel : requête bloquante."""
+        with patch.object(api, '_get') as mock_get:
+            mock_get.return_value = {'projectStatus': {'status': 'OK'}}
+            
+            result = api.get_quality_gate_status('test-project')
+            
+            assert result['projectStatus']['status'] == 'OK'
+            assert result['cache'] == {'age_seconds': 0.0, 'stale': False}
+            mock_get.assert_called_once_with(
+                '/api/qualitygates/project_status',
+                {'projectKey': 'test-project'}
+            )
+    
+    def test_quality_gate_served_from_cache(self, api):
+        """Test appels répétés servis depuis le cache."""
+        with patch.object(api, '_get') as mock_get:
+            mock_get.return_value = {'projectStatus': {'status': 'OK'}}
+            
+            api.get_quality_gate_status('test-project')
+            result = api.get_quality_gate_status('test-project')
+            
+            assert result['projectStatus']['status'] == 'OK'
+            mock_get.assert_called_once()
+    
+    def test_quality_gate_invalidated_by_new_analysis(self, api):
+        """Test une nouvelle analyse force un rechargement."""
+        with patch.object(api, '_get') as mock_get:
+            mock_get.return_value = {'projectStatus': {'status': 'OK'}}
+            api.analysis_tracker.observe('test-project', 'AN-1')
+            api.get_quality_gate_status('test-project')
+            
+            mock_get.return_value = {'projectStatus': {'status': 'ERROR'}}
+            api.analysis_tracker.observe('test-project', 'AN-2')
+            result = api.get_quality_gate_status('test-project')
+            
+            assert result['projectStatus']['status'] == 'ERROR'
+            assert mock_get.call_count == 2
+    
+    def test_quality_gate_cache_disabled(self, config):
+        """Test cache désactivé (max_staleness=0)."""
+        config.quality_gate_max_staleness = 0
+        api = ProjectsAPI(config)
+        with patch.object(api, '_get') as mock_get:
+            mock_get.return_value = {'projectStatus': {'status': 'OK'}}
+            
+            api.get_quality_gate_status('test-project')
+            result = api.get_quality_gate_status('test-project')
+            
+            assert 'cache' not in result
+            assert mock_get.call_count == 2
+
+
+def _fake_get(sources, analysis_key='AN-1'):
+    """Simule _get pour /api/sources/lines et /api/project_analyses/search."""
+    def fake_get(endpoint, params=None):
+        if endpoint == '/api/project_analyses/search':
+            return {'analyses': [{'key': analysis_key}] if analysis_key else []}
+        return {'sources': sources}
+    return fake_get
+
+
+def _source_calls(mock_get):
+    """Retourne les appels à /api/sources/lines."""
+    return [c for c in mock_get.call_args_list if c[0][0] == '/api/sources/lines']
+
+
 class TestSourceLines:
     """Tests pour get_source_lines()."""
     
     def test_get_source_lines_success(self, api):
-        """Test succès récupération code source."""
+        """Test succès récupération code source (fichier complet téléchargé)."""
         with patch.object(api, '_get') as mock_get:
-            mock_get.return_value = {
-                'sources': [
-                    {'line': 1, 'code': 'import foo;'}
-                ]
-            }
+            mock_get.side_effect = _fake_get([{'line': 1, 'code': 'import foo;'}])
             
             result = api.get_source_lines('project:src/main.dart')
             
-            assert 'sources' in result
-            mock_get.assert_called_once_with(
-                '/api/sources/lines',
-                {'key': 'project:src/main.dart', 'from': 1}
-            )
+            assert result == {'sources': [{'line': 1, 'code': 'import foo;'}]}
+            calls = _source_calls(mock_get)
+            assert len(calls) == 1
+            assert calls[0][0][1] == {'key': 'project:src/main.dart'}
     
     def test_get_source_lines_with_range(self, api):
-        """Test avec range de lignes."""
+        """Test avec range de lignes (découpe locale)."""
+        sources = [{'line': i, 'code': f'l{i}'} for i in range(1, 31)]
         with patch.object(api, '_get') as mock_get:
-            mock_get.return_value = {'sources': []}
+            mock_get.side_effect = _fake_get(sources)
             
-            api.get_source_lines('project:src/main.dart', from_line=10, to_line=20)
+            result = api.get_source_lines('project:src/main.dart', from_line=10, to_line=20)
             
-            mock_get.assert_called_once_with(
-                '/api/sources/lines',
-                {'key': 'project:src/main.dart', 'from': 10, 'to': 20}
-            )
+            assert [line['line'] for line in result['sources']] == list(range(10, 21))
     
     def test_get_source_lines_from_line_only(self, api):
         """Test avec seulement from_line."""
+        sources = [{'line': i, 'code': f'l{i}'} for i in range(1, 61)]
         with patch.object(api, '_get') as mock_get:
-            mock_get.return_value = {'sources': []}
+            mock_get.side_effect = _fake_get(sources)
             
-            api.get_source_lines('project:src/main.dart', from_line=50)
+            result = api.get_source_lines('project:src/main.dart', from_line=50)
             
-            call_args = mock_get.call_args[0][1]
-            assert call_args['from'] == 50
-            assert 'to' not in call_args
+            assert [line['line'] for line in result['sources']] == list(range(50, 61))
     
-    def test_get_source_lines_default_from_line(self, api):
-        """Test valeur par défaut from_line=1."""
+    def test_get_source_lines_overlapping_ranges_single_download(self, api):
+        """Test plusieurs plages d'un même fichier : un seul téléchargement."""
+        sources = [{'line': i, 'code': f'l{i}'} for i in range(1, 101)]
         with patch.object(api, '_get') as mock_get:
-            mock_get.return_value = {'sources': []}
+            mock_get.side_effect = _fake_get(sources)
+            
+            api.get_source_lines('project:src/main.dart', 1, 40)
+            api.get_source_lines('project:src/main.dart', 30, 70)
+            result = api.get_source_lines('project:src/main.dart', 90)
+            
+            assert len(_source_calls(mock_get)) == 1
+            assert len(result['sources']) == 11
+            assert api.source_cache.stats()['hits'] == 2
+    
+    def test_get_source_lines_invalid_range(self, api):
+        """Test from_line après to_line ou au-delà de la fin du fichier : erreur 400."""
+        sources = [{'line': i, 'code': f'l{i}'} for i in range(1, 11)]
+        with patch.object(api, '_get') as mock_get:
+            mock_get.side_effect = _fake_get(sources)
             
+            with pytest.raises(SonarQubeAPIError) as reversed_range:
+                api.get_source_lines('project:src/main.dart', 8, 3)
+            with pytest.raises(SonarQubeAPIError) as past_end:
+                api.get_source_lines('project:src/main.dart', 11, 20)
+            
+            assert reversed_range.value.status_code == 400
+            assert past_end.value.status_code == 400
+            assert len(api.get_source_lines('project:src/main.dart', 10, 20)['sources']) == 1
+    
+    def test_get_source_lines_strips_markup(self, api):
+        """Test suppression du HTML en conservant couverture et SCM."""
+        sources = [{
+            'line': 1,
+            'code': '<span class="k">if</span> (a &lt; b) {',
+            'scmAuthor': 'john',
+            'scmRevision': 'abc123',
+            'lineHits': 3,
+            'conditions': 2,
+            'coveredConditions': 1
+        }]
+        with patch.object(api, '_get') as mock_get:
+            mock_get.side_effect = _fake_get(sources)
+            
+            line = api.get_source_lines('project:src/main.dart')['sources'][0]
+            
+            assert line['code'] == 'if (a < b) {'
+            assert line['scmAuthor'] == 'john'
+            assert line['scmRevision'] == 'abc123'
+            assert line['lineHits'] == 3
+            assert line['coveredConditions'] == 1
+    
+    def test_get_source_lines_new_analysis_refetches(self, api):
+        """Test une nouvelle analyse invalide le fichier en cache."""
+        api.analysis_tracker.check_interval = 0
+        sources = [{'line': 1, 'code': 'a'}]
+        with patch.object(api, '_get') as mock_get:
+            mock_get.side_effect = _fake_get(sources, 'AN-1')
+            api.get_source_lines('project:src/main.dart')
             api.get_source_lines('project:src/main.dart')
+            assert len(_source_calls(mock_get)) == 1
             
-            call_args = mock_get.call_args[0][1]
-            assert call_args['from'] == 1
+            mock_get.side_effect = _fake_get(sources, 'AN-2')
+            api.get_source_lines('project:src/main.dart')
+            assert len(_source_calls(mock_get)) == 2
+    
+    def test_get_source_lines_cache_disabled(self, config):
+        """Test cache désactivé : requête par plage comme avant."""
+        config.source_cache_max_lines = 0
+        api = ProjectsAPI(config)
+        with patch.object(api, '_get') as mock_get:
+            mock_get.return_value = {'sources': []}
+            
+            api.get_source_lines('project:src/main.dart', from_line=10, to_line=20)
+            
+            mock_get.assert_called_once_with(
+                '/api/sources/lines',
+                {'key': 'project:src/main.dart', 'from': 10, 'to': 20}
+            )
     
     def test_get_source_lines_with_issues(self, api):
         """Test code source avec issues annotées."""
         with patch.object(api, '_get') as mock_get:
-            mock_get.return_value = {
-                'sources': [
-                    {'line': 10, 'code': 'var x = 1;', 'issues': ['issue-1']}
-                ]
-            }
+            mock_get.side_effect = _fake_get([
+                {'line': i, 'code': 'var x = 1;', 'issues': ['issue-1']} for i in range(1, 11)
+            ])
             
             result = api.get_source_lines('project:src/main.dart', 10, 10)
             
@@ -243,12 +389,3 @@ class TestSourceLines:
                 api.get_source_lines('project:src/unknown.dart')
             
             assert exc_info.value.status_code == 404
-    
-    def test_get_source_lines_invalid_range(self, api):
-        """Test range invalide."""
-        with patch.object(api, '_get') as mock_get:
-            mock_get.side_effect = SonarQubeAPIError(400, "Invalid range")
-            
-            with pytest.raises(SonarQubeAPIError):
-                api.get_source_lines('project:src/main.dart', 100, 50)
-
@@ -0,0 +1,166 @@
+"""Tests unitaires pour l'ordonnancement des requêtes SonarQube."""
+
+import time
+import threading
+from collections import deque
+from unittest.mock import Mock
+
+import pytest
+
+from src.api.base import SonarQubeAPIBase
+from src.api.scheduler import (
+    PriorityScheduler, priority_scope, current_priority, INTERACTIVE, BACKGROUND
+)
+from src.config import SonarQubeConfig
+
+
+def _wait_until(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert condition()
+
+
+class TestPriorityScheduler:
+    """Tests pour PriorityScheduler."""
+
+    def test_priority_scope(self):
+        """Test classe du thread : interactive par défaut, restaurée en sortie."""
+        assert current_priority() == INTERACTIVE
+        with priority_scope(BACKGROUND):
+            assert current_priority() == BACKGROUND
+        assert current_priority() == INTERACTIVE
+
+    def test_interactive_preempts_queued_background(self):
+        """Test place libérée : l'appel interactif passe devant le fond arrivé avant lui."""
+        scheduler = PriorityScheduler(interactive_limit=1, background_limit=1)
+        release = threading.Event()
+        order = []
+
+        def run(priority, label, hold=None):
+            with scheduler.slot(priority):
+                order.append(label)
+                if hold:
+                    hold.wait(2)
+
+        holder = threading.Thread(target=run, args=(INTERACTIVE, 'holder', release))
+        holder.start()
+        _wait_until(lambda: scheduler.stats()[INTERACTIVE]['active'] == 1)
+        background = threading.Thread(target=run, args=(BACKGROUND, 'background'))
+        background.start()
+        _wait_until(lambda: scheduler.stats()[BACKGROUND]['waiting'] == 1)
+        interactive = threading.Thread(target=run, args=(INTERACTIVE, 'interactive'))
+        interactive.start()
+        _wait_until(lambda: scheduler.stats()[INTERACTIVE]['waiting'] == 1)
+
+        release.set()
+        for thread in (holder, background, interactive):
+            thread.join(2)
+
+        assert order == ['holder', 'interactive', 'background']
+        assert scheduler.stats()[BACKGROUND]['delayed'] == 1
+
+    def test_separate_limits(self):
+        """Test limite du fond indépendante ; le fond ne prend que la capacité inoccupée."""
+        scheduler = PriorityScheduler(interactive_limit=3, background_limit=1)
+        release = threading.Event()
+
+        def hold(priority):
+            with scheduler.slot(priority):
+                release.wait(2)
+
+        threads = [threading.Thread(target=hold, args=(BACKGROUND,)) for _ in range(2)]
+        threads += [threading.Thread(target=hold, args=(INTERACTIVE,)) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        _wait_until(lambda: scheduler.stats()[INTERACTIVE]['active'] == 3)
+
+        stats = scheduler.stats()
+        assert stats[BACKGROUND]['active'] == 1
+        assert stats[BACKGROUND]['waiting'] == 1
+        release.set()
+        for thread in threads:
+            thread.join(2)
+
+    def test_request_uses_thread_priority(self):
+        """Test les requêtes HTTP prennent la place de la classe du thread."""
+        config = SonarQubeConfig(url="https://test.sonarqube.com", token="t", negative_cache_ttl=0)
+        api = SonarQubeAPIBase(config)
+        api._session = Mock()
+        api._session.request.return_value.json.return_value = {}
+
+        api._get('/api/system/status')
+        with priority_scope(BACKGROUND):
+            api._get('/api/system/status')
+
+        stats = api.scheduler.stats()
+        assert stats[INTERACTIVE]['started'] == 1
+        assert stats[BACKGROUND]['started'] == 1
+
+
+class _QueuedSonarQube:
+    """Session factice : latence fixe, capacity requêtes traitées à la fois, les autres en file."""
+
+    def __init__(self, latency, capacity):
+        self.latency = latency
+        self._free = capacity
+        self._waiters = deque()
+        self._lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        with self._lock:
+            turn = None
+            if self._free and not self._waiters:
+                self._free -= 1
+            else:
+                turn = threading.Event()
+                self._waiters.append(turn)
+        if turn is not None:
+            turn.wait()
+        time.sleep(self.latency)
+        with self._lock:
+            if self._waiters:
+                self._waiters.popleft().set()
+            else:
+                self._free += 1
+        response = Mock()
+        response.json.return_value = {}
+        return response
+
+
+@pytest.mark.slow
+class TestInteractiveLatency:
+    """Mesure du p95 interactif sans puis avec charge de fond."""
+
+    def _interactive_p95(self, background_threads, latency=0.01, capacity=2, calls=40):
+        config = SonarQubeConfig(url="https://test.sonarqube.com", token="t", negative_cache_ttl=0)
+        api = SonarQubeAPIBase(config, scheduler=PriorityScheduler(capacity, 2))
+        api._session = _QueuedSonarQube(latency, capacity)
+        stop = threading.Event()
+
+        def background():
+            with priority_scope(BACKGROUND):
+                while not stop.is_set():
+                    api._get('/api/project_analyses/search')
+
+        workers = [threading.Thread(target=background) for _ in range(background_threads)]
+        for thread in workers:
+            thread.start()
+        time.sleep(latency * 2)
+        latencies = []
+        for _ in range(calls):
+            start = time.perf_counter()
+            api._get('/api/measures/component')
+            latencies.append(time.perf_counter() - start)
+        stop.set()
+        for thread in workers:
+            thread.join(2)
+        return sorted(latencies)[int(calls * 0.95) - 1]
+
+    def test_p95_under_background_load(self):
+        """Test le fond ne dégrade pas le p95 interactif au-delà d'une requête de fond en cours."""
+        idle = self._interactive_p95(background_threads=0)
+        loaded = self._interactive_p95(background_threads=6)
+
+        # Au pire, les requêtes de fond déjà envoyées terminent avant l'appel interactif
+        assert loaded < idle + 0.02
@@ -0,0 +1,84 @@
+"""Tests unitaires pour le format de sortie compact."""
+
+import json
+from datetime import datetime
+
+from src.commands.base import CommandResult
+from src.commands.compact import to_plain, encode_compact, decode_compact
+from src.models import Issue, Severity
+
+
+def _issue(key, component, rule, line=None):
+    return Issue.from_api_response({
+        'key': key, 'rule': rule, 'severity': 'MAJOR', 'component': component,
+        'project': 'P', 'line': line, 'message': 'Littéral dupliqué « défaut »',
+        'type': 'CODE_SMELL', 'status': 'OPEN', 'tags': [],
+        'creationDate': '2025-10-01T10:00:00+0200',
+    })
+
+
+class TestToPlain:
+    """Tests pour to_plain."""
+
+    def test_dataclass_enum_datetime(self):
+        """Test conversion des dataclasses, Enum et dates."""
+        plain = to_plain({'issue': _issue('A', 'P:a.dart', 'dart:S1', 3), 'at': datetime(2025, 1, 2)})
+
+        assert plain['issue']['severity'] == 'MAJOR'
+        assert plain['issue']['creation_date'].startswith('2025-10-01T10:00:00')
+        assert plain['at'] == '2025-01-02T00:00:00'
+        assert to_plain(Severity.BLOCKER) == 'BLOCKER'
+
+    def test_nulls_and_empty_lists_dropped(self):
+        """Test suppression des valeurs nulles et listes vides."""
+        plain = to_plain({'a': None, 'b': [], 'c': {}, 'd': 0, 'e': False, 'f': ''})
+        assert plain == {'d': 0, 'e': False, 'f': ''}
+
+
+class TestCompactEncoding:
+    """Tests pour encode_compact / decode_compact."""
+
+    def test_columnar_with_shared_tables(self):
+        """Test liste d'issues en colonnes avec composants et règles partagés."""
+        result = CommandResult(success=True, data={'issues': [
+            _issue('A', 'P:a.dart', 'dart:S1', 3),
+            _issue('B', 'P:a.dart', 'dart:S2'),
+            _issue('C', 'P:b.dart', 'dart:S1', 7),
+        ]})
+
+        encoded = encode_compact(result.to_dict())
+        block = encoded['data']['issues']
+
+        assert encoded['tables'] == {'components': ['P:a.dart', 'P:b.dart'], 'rules': ['dart:S1', 'dart:S2']}
+        assert block['refs'] == {'component': 'components', 'rule': 'rules'}
+        component = block['columns'].index('component')
+        line = block['columns'].index('line')
+        assert [row[component] for row in block['rows']] == [0, 0, 1]
+        assert [row[line] for row in block['rows']] == [3, None, 7]
+
+    def test_round_trip(self):
+        """Test décodage vers la liste de dictionnaires d'origine."""
+        result = CommandResult(success=True, data={
+            'measures': [{'metric': 'coverage', 'value': '81.5'}, {'metric': 'bugs', 'value': '2'}],
+            'issues': [_issue('A', 'P:a.dart', 'dart:S1', 3), _issue('B', 'P:b.dart', 'dart:S2')],
+            'total': 2,
+        }, metadata={'project': 'P'})
+
+        decoded = decode_compact(encode_compact(result.to_dict()))
+
+        assert decoded == to_plain(result.to_dict())
+        assert decoded['data']['issues'][1]['component'] == 'P:b.dart'
+        assert 'line' not in decoded['data']['issues'][1]
+
+    def test_to_json_compact(self):
+        """Test to_json(compact=True) : sans indentation, non ASCII conservé, plus petit."""
+        result = CommandResult(success=True, data={
+            'issues': [_issue(f'K{i}', f'P:f{i % 3}.dart', 'dart:S1', i) for i in range(50)]
+        })
+
+        text = result.to_json(compact=True)
+
+        assert '\n' not in text
+        assert '« défaut »' in text
+        assert len(text) < len(result.to_json()) / 2
+        assert json.loads(text)['tables']['rules'] == ['dart:S1']
@@ -384,7 +384,8 @@ class TestSearchIssuesCommand:
         mock_api.search_issues.assert_called_once_with(
             project_keys=['project-x'],
             assignees=None,
-            statuses=None
+            statuses=None,
+            all_pages=False
         )
     
     def test_search_issues_with_assignee(self, issues_commands, mock_api):
@@ -404,7 +405,8 @@ class TestSearchIssuesCommand:
         mock_api.search_issues.assert_called_once_with(
             project_keys=['project-x'],
             assignees=['john.doe'],
-            statuses=None
+            statuses=None,
+            all_pages=False
         )
     
     def test_search_issues_unassigned(self, issues_commands, mock_api):
@@ -423,7 +425,8 @@ class TestSearchIssuesCommand:
         mock_api.search_issues.assert_called_once_with(
             project_keys=['project-x'],
             assignees=[''],
-            statuses=None
+            statuses=None,
+            all_pages=False
         )
     
     def test_search_issues_no_args(self, issues_commands):
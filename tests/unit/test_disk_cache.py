@@ -0,0 +1,226 @@
+"""Tests unitaires pour le cache disque compressé."""
+
+import os
+import time
+import pytest
+from unittest.mock import Mock, patch
+
+from src.api.disk_cache import DiskCache, create_disk_cache, make_cache_key
+from src.api.issues import IssuesAPI
+from src.api.projects import ProjectsAPI
+from src.config import SonarQubeConfig
+
+
+def _page(count):
+    """Génère une page d'issues factice, très répétitive comme les vraies réponses."""
+    return {
+        'issues': [
+            {'key': f'AX{i}', 'component': 'proj:lib/src/main.dart', 'rule': 'dart:S1192',
+             'severity': 'MAJOR', 'type': 'CODE_SMELL', 'status': 'OPEN', 'message': 'Définir une constante'}
+            for i in range(count)
+        ]
+    }
+
+
+class TestMakeCacheKey:
+    """Tests pour make_cache_key()."""
+
+    def test_token_fingerprint(self):
+        """Test clé propre au token, sans le token en clair."""
+        a = make_cache_key('https://sq', '/api/issues/search', {'p': 1}, token='secret-a')
+        b = make_cache_key('https://sq', '/api/issues/search', {'p': 1}, token='secret-b')
+        assert a != b
+        assert 'secret' not in a
+
+    def test_params_order_and_none_ignored(self):
+        """Test normalisation de l'ordre des paramètres et des valeurs None."""
+        a = make_cache_key('https://sq', '/api/issues/search', {'p': 1, 'ps': 500, 'x': None})
+        b = make_cache_key('https://sq/', 'api/issues/search/', {'ps': '500', 'p': '1'})
+        assert a == b
+
+    def test_server_and_revision_part_of_key(self):
+        """Test le serveur et l'analyse distinguent les entrées."""
+        base = make_cache_key('https://a', '/api/sources/lines', {'key': 'k'})
+        assert base != make_cache_key('https://b', '/api/sources/lines', {'key': 'k'})
+        assert base != make_cache_key('https://a', '/api/sources/lines', {'key': 'k'}, 'AN-1')
+
+
+class TestDiskCache:
+    """Tests pour DiskCache."""
+
+    @pytest.mark.parametrize('compression', ['zlib', 'lzma'])
+    def test_roundtrip_and_compression(self, tmp_path, compression):
+        """Test écriture/lecture et taux de compression."""
+        cache = DiskCache(str(tmp_path), max_bytes=10_000_000, compression=compression)
+        cache.put('k1', _page(200))
+
+        assert cache.get('k1') == _page(200)
+        assert cache.get('absent') is None
+        stats = cache.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['hit_ratio'] == 0.5
+        assert stats['compression_ratio'] > 5
+
+    def test_unknown_compression(self, tmp_path):
+        """Test algorithme de compression inconnu."""
+        with pytest.raises(ValueError):
+            DiskCache(str(tmp_path), max_bytes=1000, compression='brotli')
+
+    def test_lru_eviction_by_bytes(self, tmp_path):
+        """Test éviction LRU selon la taille totale."""
+        probe = DiskCache(str(tmp_path / 'probe'), max_bytes=10_000_000)
+        probe.put('x', _page(50))
+        entry_size = probe.stats()['bytes']
+
+        cache = DiskCache(str(tmp_path / 'cache'), max_bytes=int(entry_size * 2.5))
+        cache.put('a', _page(50))
+        cache.put('b', _page(50))
+        old = time.time() - 100
+        os.utime(cache._path('a'), (old, old))
+        os.utime(cache._path('b'), (old + 1, old + 1))
+        cache.get('a')
+        cache.put('c', _page(50))
+
+        assert cache.get('b') is None
+        assert cache.get('a') is not None
+        assert cache.get('c') is not None
+        assert cache.stats()['evictions'] == 1
+        assert cache.stats()['bytes'] <= cache.max_bytes
+
+    def test_overwrite_counts_entry_once(self, tmp_path):
+        """Test réécriture d'une clé : taille remplacée, pas ajoutée."""
+        cache = DiskCache(str(tmp_path), max_bytes=1_000_000)
+        cache.put('k', _page(50))
+        size = cache.stats()['bytes']
+        cache.put('k', _page(50))
+        cache.put('k', _page(50))
+
+        assert cache.stats()['bytes'] == size == cache._path('k').stat().st_size
+        assert cache.stats()['evictions'] == 0
+
+    def test_expired_entry(self, tmp_path):
+        """Test entrée expirée supprimée."""
+        cache = DiskCache(str(tmp_path), max_bytes=1_000_000, ttl=0)
+        cache.put('k', {'a': 1})
+        time.sleep(0.01)
+        assert cache.get('k') is None
+        assert not cache._path('k').exists()
+
+    def test_corrupted_entry(self, tmp_path):
+        """Test entrée corrompue ignorée puis supprimée."""
+        cache = DiskCache(str(tmp_path), max_bytes=1_000_000)
+        cache._path('k').write_bytes(b'garbage')
+        assert cache.get('k') is None
+        assert not cache._path('k').exists()
+
+    def test_atomic_write_leaves_no_temp_file(self, tmp_path):
+        """Test aucune trace de fichier temporaire après écriture."""
+        cache = DiskCache(str(tmp_path), max_bytes=1_000_000)
+        cache.put('k', {'a': 1})
+        assert [p.name for p in tmp_path.iterdir()] == ['k.sqc']
+
+    def test_shared_between_instances(self, tmp_path):
+        """Test deux instances (processus) partagent le même dossier."""
+        DiskCache(str(tmp_path), max_bytes=1_000_000).put('k', {'a': 1})
+        other = DiskCache(str(tmp_path), max_bytes=1_000_000)
+        assert other.get('k') == {'a': 1}
+        assert other.stats()['bytes'] > 0
+
+
+class TestDiskCacheIntegration:
+    """Tests de l'intégration dans la couche API."""
+
+    def test_disabled_by_default(self):
+        """Test cache disque désactivé par défaut."""
+        config = SonarQubeConfig(url="https://test.sonarqube.com", token="t")
+        assert create_disk_cache(config) is None
+        assert ProjectsAPI(config).disk_cache is None
+
+    @staticmethod
+    def _config(tmp_path, token="t"):
+        return SonarQubeConfig(
+            url="https://test.sonarqube.com", token=token,
+            disk_cache_max_bytes=1_000_000, disk_cache_dir=str(tmp_path)
+        )
+
+    @staticmethod
+    def _sonarqube(mock_request, analysis='AN-1'):
+        """Réponses factices : dernière analyse du projet, arbre des composants, issues."""
+        def respond(method, url, **kwargs):
+            response = Mock()
+            if url.endswith('/api/project_analyses/search'):
+                response.json.return_value = {'analyses': [{'key': analysis}] if analysis else []}
+            elif url.endswith('/api/components/tree'):
+                response.json.return_value = {'components': [{'key': 'proj:a.dart'}]}
+            else:
+                response.json.return_value = _page(2)
+            return response
+        mock_request.side_effect = respond
+
+    @staticmethod
+    def _calls(mock_request, endpoint):
+        return sum(1 for call in mock_request.call_args_list if call.kwargs['url'].endswith(endpoint))
+
+    @patch('requests.Session.request')
+    def test_component_tree_served_from_disk(self, mock_request, tmp_path):
+        """Test une réponse volumineuse est relue depuis le disque par un autre client."""
+        self._sonarqube(mock_request)
+
+        ProjectsAPI(self._config(tmp_path)).get_component_tree('proj')
+        result = ProjectsAPI(self._config(tmp_path)).get_component_tree('proj')
+
+        assert result == {'components': [{'key': 'proj:a.dart'}]}
+        assert self._calls(mock_request, '/api/components/tree') == 1
+
+    @patch('requests.Session.request')
+    def test_new_analysis_invalidates_entries(self, mock_request, tmp_path):
+        """Test arbre du projet relu après une nouvelle analyse (dernière analyse revérifiée)."""
+        self._sonarqube(mock_request, 'AN-1')
+        ProjectsAPI(self._config(tmp_path)).get_component_tree('proj')
+        ProjectsAPI(self._config(tmp_path)).get_component_tree('proj')
+        assert self._calls(mock_request, '/api/components/tree') == 1
+
+        self._sonarqube(mock_request, 'AN-2')
+        ProjectsAPI(self._config(tmp_path)).get_component_tree('proj')
+        assert self._calls(mock_request, '/api/components/tree') == 2
+
+    @patch('requests.Session.request')
+    def test_issue_search_not_cached(self, mock_request, tmp_path):
+        """Test recherche d'issues toujours relue (modifiable sans nouvelle analyse)."""
+        self._sonarqube(mock_request)
+
+        for _ in range(2):
+            IssuesAPI(self._config(tmp_path)).search(project_keys=['proj'])
+
+        assert self._calls(mock_request, '/api/issues/search') == 2
+        assert list(tmp_path.iterdir()) == []
+
+    @patch('requests.Session.request')
+    def test_without_revision_not_cached(self, mock_request, tmp_path):
+        """Test requêtes sans projet (issues=) ou sans analyse connue : pas de cache disque."""
+        self._sonarqube(mock_request, analysis=None)
+        config = self._config(tmp_path)
+
+        for _ in range(2):
+            IssuesAPI(config).get('AX1')
+            ProjectsAPI(config).get_component_tree('proj')
+
+        assert self._calls(mock_request, '/api/issues/search') == 2
+        assert self._calls(mock_request, '/api/components/tree') == 2
+        assert list(tmp_path.iterdir()) == []
+
+    @patch('requests.Session.request')
+    def test_tokens_isolated(self, mock_request, tmp_path):
+        """Test dossier partagé : un autre token ne relit pas les réponses mises en cache."""
+        self._sonarqube(mock_request)
+
+        ProjectsAPI(self._config(tmp_path, token="a")).get_component_tree('proj')
+        ProjectsAPI(self._config(tmp_path, token="b")).get_component_tree('proj')
+
+        assert self._calls(mock_request, '/api/components/tree') == 2
+
+    def test_invalid_compression_config(self):
+        """Test configuration de compression invalide."""
+        with pytest.raises(ValueError, match="DISK_CACHE_COMPRESSION"):
+            SonarQubeConfig(url="https://test.sonarqube.com", token="t", disk_cache_compression="gzip")
@@ -0,0 +1,43 @@
+"""Tests unitaires pour l'admission des requêtes entrantes."""
+
+from src.mcp.admission import AdmissionController
+
+
+class TestAdmissionController:
+    """Tests pour AdmissionController."""
+
+    def test_method_limit(self):
+        """Test limite par méthode : les autres méthodes restent admises."""
+        admission = AdmissionController(max_pending=10, limits={'tools/call': 2})
+
+        assert admission.try_acquire('tools/call')
+        assert admission.try_acquire('tools/call')
+        assert not admission.try_acquire('tools/call')
+        assert admission.try_acquire('resources/read')
+
+        admission.release('tools/call')
+        assert admission.try_acquire('tools/call')
+
+        stats = admission.stats()
+        assert stats['pending'] == 3
+        assert stats['rejected'] == 1
+        assert stats['methods']['tools/call'] == {'pending': 2, 'limit': 2, 'admitted': 3, 'rejected': 1}
+
+    def test_global_bound(self):
+        """Test file pleine : refus quelle que soit la méthode."""
+        admission = AdmissionController(max_pending=2)
+        assert admission.try_acquire('tools/call')
+        assert admission.try_acquire('resources/read')
+
+        assert not admission.try_acquire('batch')
+        assert admission.limit_data('batch') == {'method': 'batch', 'pending': 0, 'limit': 8, 'max_pending': 2}
+
+    def test_exempt_and_unknown_methods(self):
+        """Test méthodes exemptées non comptées ; méthodes inconnues regroupées sous '*'."""
+        admission = AdmissionController(max_pending=1, limits={'*': 1}, exempt={'ping'})
+        assert admission.try_acquire('x/1')
+        assert not admission.try_acquire('x/2')
+        assert admission.try_acquire('ping')
+        admission.release('ping')
+
+        assert list(admission.stats()['methods']) == ['*']
@@ -0,0 +1,194 @@
+"""Tests unitaires pour le pool borné d'exécution des outils."""
+
+import time
+import threading
+import tracemalloc
+import pytest
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from unittest.mock import patch
+
+from src.config import SonarQubeConfig, ProjectConfig
+from src.commands.base import CommandResult
+from src.mcp.executor import BoundedExecutor, ExecutorSaturatedError
+from src.mcp.server import MCPServer
+
+
+@pytest.fixture
+def executor():
+    """Pool de test."""
+    pool = BoundedExecutor(max_workers=2, max_queued=2, name="test-pool")
+    yield pool
+    pool.shutdown(wait=True, timeout=2)
+
+
+class TestBoundedExecutor:
+    """Tests pour BoundedExecutor."""
+    
+    def test_submit_result(self, executor):
+        """Test exécution et résultat."""
+        assert executor.submit(lambda x: x * 2, 21).result(timeout=2) == 42
+        assert executor.stats()['completed'] == 1
+    
+    def test_exception_propagated(self, executor):
+        """Test exception transmise par la future."""
+        def boom():
+            raise ValueError("boom")
+        
+        with pytest.raises(ValueError):
+            executor.submit(boom).result(timeout=2)
+    
+    def test_threads_reused(self, executor):
+        """Test les threads sont réutilisés."""
+        names = set()
+        for _ in range(20):
+            executor.submit(lambda: names.add(threading.current_thread().name)).result(timeout=2)
+        
+        assert len(names) <= 2
+        assert executor.stats()['workers'] == 2
+    
+    def test_backpressure_and_saturation(self, executor):
+        """Test file pleine : submit bloque puis lève ExecutorSaturatedError."""
+        release = threading.Event()
+        for _ in range(4):
+            executor.submit(release.wait, 5)
+        
+        time.sleep(0.05)
+        stats = executor.stats()
+        assert stats['active'] == 2
+        assert stats['queued'] == 2
+        
+        start = time.monotonic()
+        with pytest.raises(ExecutorSaturatedError):
+            executor.submit(release.wait, 5, block_timeout=0.1)
+        assert time.monotonic() - start >= 0.1
+        assert executor.stats()['rejected'] == 1
+        release.set()
+    
+    def test_abandon_running_counts_leak_and_replaces(self, executor):
+        """Test travail abandonné : compté comme leaked, capacité préservée."""
+        release = threading.Event()
+        future = executor.submit(release.wait, 5)
+        with pytest.raises(FutureTimeoutError):
+            future.result(timeout=0.05)
+        
+        executor.abandon(future)
+        stats = executor.stats()
+        assert stats['leaked'] == 1
+        assert stats['workers'] == 3
+        
+        # Capacité intacte : deux travaux peuvent encore tourner en parallèle
+        barrier = threading.Barrier(2, timeout=2)
+        futures = [executor.submit(barrier.wait) for _ in range(2)]
+        for f in futures:
+            f.result(timeout=2)
+        
+        release.set()
+        future.result(timeout=2)
+        time.sleep(0.05)
+        stats = executor.stats()
+        assert stats['leaked'] == 0
+        assert stats['workers'] == 2
+    
+    def test_abandon_queued_cancels(self, executor):
+        """Test travail encore en file : annulé."""
+        release = threading.Event()
+        executor.submit(release.wait, 5)
+        executor.submit(release.wait, 5)
+        queued = executor.submit(lambda: 'never')
+        
+        executor.abandon(queued)
+        release.set()
+        
+        assert queued.cancelled()
+        assert executor.stats()['leaked'] == 0
+    
+    def test_shutdown_with_full_queue_and_blocked_workers(self):
+        """Test arrêt sans attente : pas de blocage sur une file pleine, travaux en file annulés."""
+        pool = BoundedExecutor(max_workers=1, max_queued=1, name="test-stuck")
+        release = threading.Event()
+        pool.submit(release.wait, 5)
+        queued = pool.submit(lambda: 'never')
+        time.sleep(0.05)
+        
+        start = time.monotonic()
+        pool.shutdown(wait=False)
+        assert time.monotonic() - start < 0.5
+        assert queued.cancelled()
+        
+        release.set()
+        with pytest.raises(RuntimeError):
+            pool.submit(lambda: None)
+    
+    def test_shutdown_wait_bounded_by_timeout(self):
+        """Test arrêt avec attente : borné par timeout même si la file est pleine."""
+        pool = BoundedExecutor(max_workers=1, max_queued=1, name="test-stuck")
+        release = threading.Event()
+        pool.submit(release.wait, 5)
+        queued = pool.submit(lambda: 'never')
+        time.sleep(0.05)
+        
+        start = time.monotonic()
+        pool.shutdown(wait=True, timeout=0.1)
+        assert time.monotonic() - start < 1
+        assert queued.cancelled()
+        release.set()
+
+
+@pytest.mark.slow
+class TestToolCallStress:
+    """Test de charge des appels d'outils."""
+    
+    def test_thousand_calls_stable_threads_and_memory(self):
+        """Test 1000 appels contre un outil lent : threads et mémoire stables."""
+        config = SonarQubeConfig(
+            url="https://test.sonarqube.com",
+            token="test-token",
+            default_project=ProjectConfig(key="TestProject", assignee="test-user"),
+            tool_workers=4,
+            tool_queue_size=16,
+            tool_cache_max_bytes=0
+        )
+        with patch('src.mcp.server.SonarQubeAPI'), patch('src.mcp.server.CommandHandler'):
+            server = MCPServer(config)
+        
+        def slow_execute(command, args):
+            time.sleep(0.002)
+            return CommandResult(success=True, data={'status': 'OK'})
+        
+        # Fonction simple (un Mock conserverait l'historique de chaque appel)
+        server.command_handler.execute = slow_execute
+        request = {
+            'jsonrpc': '2.0', 'id': 1, 'method': 'tools/call',
+            'params': {'name': 'sonarqube_quality_gate', 'arguments': {'project_key': 'P'}}
+        }
+        
+        def fire(count):
+            for _ in range(count):
+                assert 'result' in server.handle_request(request)
+        
+        def run_clients(calls_per_client, clients=20):
+            threads = [threading.Thread(target=fire, args=(calls_per_client,)) for _ in range(clients)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join(30)
+        
+        # Préchauffage : démarre les threads permanents
+        run_clients(5)
+        baseline_threads = threading.active_count()
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        
+        run_clients(50)
+        
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        growth = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+        
+        stats = server.tool_executor.stats()
+        assert stats['completed'] == 1100
+        assert stats['workers'] == 4
+        assert stats['leaked'] == 0
+        assert threading.active_count() <= baseline_threads
+        assert growth < 1024 * 1024
+        server.tool_executor.shutdown(wait=True, timeout=2)
@@ -0,0 +1,51 @@
+"""Tests unitaires pour le découpage des messages stdio."""
+
+import io
+import pytest
+
+from src.mcp.framing import MessageReader, MessageWriter, MessageTooLargeError
+
+
+class TestMessageReader:
+    """Tests pour MessageReader."""
+
+    def test_lines_until_eof(self):
+        """Test lecture ligne par ligne puis None en fin de flux."""
+        reader = MessageReader(io.BytesIO(b'{"a": 1}\n{"b": "\xc3\xa9"}'))
+
+        assert reader.read_message() == b'{"a": 1}\n'
+        assert reader.read_message() == b'{"b": "\xc3\xa9"}'
+        assert reader.read_message() is None
+
+    def test_large_message_within_limit(self):
+        """Test message de plusieurs Mo lu en entier."""
+        line = b'"' + b'x' * (3 * 1024 * 1024) + b'"\n'
+        reader = MessageReader(io.BytesIO(line * 2), max_bytes=4 * 1024 * 1024)
+
+        assert list(reader) == [line, line]
+
+    def test_oversized_line_discarded(self):
+        """Test ligne trop longue consommée puis signalée, la suivante reste lisible."""
+        reader = MessageReader(io.BytesIO(b'x' * 5000 + b'\n{"ok": 1}\n'), max_bytes=1024)
+        reader.CHUNK_BYTES = 1000
+
+        with pytest.raises(MessageTooLargeError) as exc:
+            reader.read_message()
+        assert exc.value.size == 5001
+        assert reader.read_message() == b'{"ok": 1}\n'
+
+
+class TestMessageWriter:
+    """Tests pour MessageWriter."""
+
+    def test_write_text_and_bytes(self):
+        """Test encodage UTF-8 et fin de ligne ajoutée."""
+        stream = io.BytesIO()
+        writer = MessageWriter(stream)
+
+        writer.write('{"m": "é"}')
+        writer.write(b'{"n": 1}')
+
+        assert stream.getvalue() == b'{"m": "\xc3\xa9"}\n{"n": 1}\n'
+        assert writer.messages == 2
+        assert writer.bytes_written == len(stream.getvalue())
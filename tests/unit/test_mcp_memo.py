@@ -0,0 +1,44 @@
+"""Tests unitaires pour la mémoïsation des résultats d'outils."""
+
+import time
+
+from src.mcp.memo import ToolResultCache, normalize_arguments
+
+
+class TestNormalizeArguments:
+    """Tests pour normalize_arguments."""
+
+    def test_canonical_form(self):
+        """Test clés et listes triées, valeurs par défaut appliquées, valeurs nulles retirées."""
+        defaults = {'all_pages': False, 'assignee': ''}
+        first = normalize_arguments({'statuses': ['OPEN', 'FIXED', 'OPEN'], 'project_key': 'P'}, defaults)
+        second = normalize_arguments(
+            {'project_key': 'P', 'assignee': '', 'to_line': None, 'statuses': ['FIXED', 'OPEN']}, defaults
+        )
+        assert first == second
+        assert normalize_arguments({'project_key': 'P', 'all_pages': True}, defaults) != first
+
+
+class TestToolResultCache:
+    """Tests pour ToolResultCache."""
+
+    def test_expiration(self):
+        """Test résultat expiré après sa durée de validité."""
+        cache = ToolResultCache()
+        cache.put('sonarqube_rule', '{}', 'texte', ttl=0.02)
+        assert cache.get('sonarqube_rule', '{}') == 'texte'
+        time.sleep(0.03)
+        assert cache.get('sonarqube_rule', '{}') is None
+        assert cache.stats()['hit_ratio'] == 0.5
+
+    def test_max_bytes(self):
+        """Test éviction des résultats les moins récemment servis."""
+        cache = ToolResultCache(max_bytes=10)
+        cache.put('t', 'a', '12345', ttl=60)
+        cache.put('t', 'b', '12345', ttl=60)
+        cache.get('t', 'a')
+        cache.put('t', 'c', '12345', ttl=60)
+        assert cache.get('t', 'a') == '12345'
+        assert cache.get('t', 'b') is None
+        assert cache.stats()['bytes'] == 10
+        assert cache.stats()['evictions'] == 1
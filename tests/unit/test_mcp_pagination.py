@@ -0,0 +1,101 @@
+"""Tests unitaires pour le découpage des résultats en pages."""
+
+import json
+import time
+import pytest
+
+from src.commands.base import CommandResult
+from src.mcp.pagination import ResultPaginator, CursorError
+
+
+def _result(count):
+    """Résultat factice avec une liste d'issues."""
+    return CommandResult(
+        success=True,
+        data={'issues': [{'key': f'AX{i}'} for i in range(count)], 'total': count},
+        metadata={'project': 'P'}
+    )
+
+
+def _wait_prefetch(paginator):
+    """Attend la fin des encodages en arrière-plan."""
+    paginator._prefetcher.submit(lambda: None).result(2)
+
+
+class TestResultPaginator:
+    """Tests pour ResultPaginator."""
+
+    def test_small_result_unchanged(self):
+        """Test résultat sous la taille de page : texte inchangé, aucun curseur."""
+        paginator = ResultPaginator(page_items=10)
+        result = _result(10)
+        assert paginator.render('sonarqube_issues', result) == result.to_json()
+        assert paginator.stats()['cursors'] == 0
+
+    def test_walk_all_pages(self):
+        """Test parcours complet par curseurs, puis curseur libéré."""
+        paginator = ResultPaginator(page_items=10)
+        page = json.loads(paginator.render('sonarqube_issues', _result(25)))
+        keys = [i['key'] for i in page['data']['issues']]
+
+        assert page['data']['total'] == 25
+        assert page['metadata']['project'] == 'P'
+        assert page['metadata']['page'] == {'offset': 0, 'count': 10, 'total_items': 25}
+
+        while 'next_cursor' in page['metadata']:
+            page = json.loads(paginator.next_page('sonarqube_issues', page['metadata']['next_cursor']))
+            keys.extend(i['key'] for i in page['data']['issues'])
+
+        assert keys == [f'AX{i}' for i in range(25)]
+        assert page['metadata']['page'] == {'offset': 20, 'count': 5, 'total_items': 25}
+        assert paginator.stats()['cursors'] == 0
+        assert paginator.stats()['pages_served'] == 3
+
+    def test_next_page_prefetched(self):
+        """Test la page suivante est encodée pendant la lecture de la page courante."""
+        paginator = ResultPaginator(page_items=10)
+        page = json.loads(paginator.render('sonarqube_issues', _result(25)))
+        _wait_prefetch(paginator)
+
+        paginator.next_page('sonarqube_issues', page['metadata']['next_cursor'])
+
+        assert paginator.stats()['prefetch_hits'] == 1
+
+    def test_invalid_cursors(self):
+        """Test curseur mal formé, inconnu ou d'un autre outil."""
+        paginator = ResultPaginator(page_items=10)
+        cursor = json.loads(paginator.render('sonarqube_issues', _result(25)))['metadata']['next_cursor']
+
+        with pytest.raises(CursorError):
+            paginator.next_page('sonarqube_issues', 'pas-un-curseur!')
+        with pytest.raises(CursorError):
+            paginator.next_page('sonarqube_hotspots', cursor)
+        with pytest.raises(CursorError):
+            paginator.next_page('sonarqube_issues', ResultPaginator._encode_cursor('inconnu', 10))
+
+    def test_cursor_expires(self):
+        """Test expiration du curseur après le TTL."""
+        paginator = ResultPaginator(page_items=10, ttl=0.01)
+        cursor = json.loads(paginator.render('sonarqube_issues', _result(25)))['metadata']['next_cursor']
+        time.sleep(0.02)
+
+        with pytest.raises(CursorError, match="expiré"):
+            paginator.next_page('sonarqube_issues', cursor)
+        assert paginator.stats()['expired'] == 1
+
+    def test_memory_bound_evicts_oldest(self):
+        """Test borne mémoire : les curseurs les plus anciens sont évincés."""
+        paginator = ResultPaginator(page_items=10, max_bytes=3000)
+        first = json.loads(paginator.render('sonarqube_issues', _result(100)))['metadata']['next_cursor']
+        paginator.render('sonarqube_issues', _result(100))
+
+        stats = paginator.stats()
+        assert stats['cursors'] == 1
+        assert stats['evictions'] == 1
+        with pytest.raises(CursorError):
+            paginator.next_page('sonarqube_issues', first)
+
+    def test_disabled(self):
+        """Test page_items à 0 : pas de découpage."""
+        paginator = ResultPaginator(page_items=0)
+        assert 'next_cursor' not in paginator.render('sonarqube_issues', _result(500))
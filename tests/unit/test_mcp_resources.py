@@ -0,0 +1,91 @@
+"""Tests unitaires pour la lecture des ressources MCP."""
+
+import time
+import threading
+from unittest.mock import Mock
+
+from src.models import Component, Measure
+from src.mcp.resources import ResourceCache, ResourceReader, parse_uri
+
+
+class TestResourceCache:
+    """Tests pour ResourceCache."""
+
+    def test_ttl_per_type(self):
+        """Test durée de validité propre à chaque type (0 = pas de cache)."""
+        cache = ResourceCache({'project': 0.02, 'issue': 0})
+        loads = []
+
+        def loader():
+            loads.append(1)
+            return {'n': len(loads)}, 'P'
+
+        assert cache.get('project', 'sonarqube://project/P', loader) == {'n': 1}
+        assert cache.get('project', 'sonarqube://project/P', loader) == {'n': 1}
+        time.sleep(0.03)
+        assert cache.get('project', 'sonarqube://project/P', loader) == {'n': 2}
+
+        cache.get('issue', 'sonarqube://issue/I', loader)
+        cache.get('issue', 'sonarqube://issue/I', loader)
+        assert len(loads) == 4
+        assert cache.stats()['hits'] == 1
+
+    def test_invalidate_project(self):
+        """Test nouvelle analyse : seules les ressources du projet sont supprimées."""
+        cache = ResourceCache()
+        cache.get('file', 'sonarqube://file/A:x.py', lambda: ({}, 'A'))
+        cache.get('file', 'sonarqube://file/B:y.py', lambda: ({}, 'B'))
+        cache.get('rule', 'sonarqube://rule/py:S1', lambda: ({}, None))
+
+        cache.invalidate_project('A')
+
+        assert cache.project_of('sonarqube://file/A:x.py') is None
+        assert cache.project_of('sonarqube://file/B:y.py') == 'B'
+        assert cache.stats() == {'entries': 2, 'hits': 0, 'misses': 3, 'invalidations': 1}
+
+    def test_max_entries(self):
+        """Test éviction des ressources les moins récemment lues."""
+        cache = ResourceCache(max_entries=2)
+        for key in ('a', 'b', 'c'):
+            cache.get('rule', f'sonarqube://rule/{key}', lambda: ({}, None))
+        assert cache.stats()['entries'] == 2
+
+
+class TestResourceReader:
+    """Tests pour ResourceReader."""
+
+    def test_parse_uri(self):
+        """Test découpage des URI (la clé peut contenir des séparateurs)."""
+        assert parse_uri('sonarqube://file/P:src/a/b.py') == ('file', 'P:src/a/b.py')
+        assert parse_uri('sonarqube://rule/') is None
+        assert parse_uri('sonarqube://autre/x') is None
+
+    def test_file_requests_in_parallel(self):
+        """Test lecture d'un fichier : métriques, issues et code source demandés simultanément."""
+        api = Mock()
+        barrier = threading.Barrier(3, timeout=2)
+
+        def measures(key, metrics):
+            barrier.wait()
+            return Component(key=key, name='a.py', qualifier='FIL', measures=[Measure('ncloc', '10')])
+
+        def issues(**kwargs):
+            barrier.wait()
+            return {'issues': []}
+
+        def sources(key):
+            barrier.wait()
+            return {'sources': [{'line': 1, 'code': 'pass'}]}
+
+        api.measures.get_component.side_effect = measures
+        api.issues.search.side_effect = issues
+        api.projects.get_source_lines.side_effect = sources
+        reader = ResourceReader(api)
+        try:
+            data = reader.read('sonarqube://file/P:a.py')
+        finally:
+            reader.shutdown()
+
+        assert data['measures'] == [{'metric': 'ncloc', 'value': '10'}]
+        assert data['sources'][0]['code'] == 'pass'
+        assert reader.project_of('sonarqube://file/P:a.py') == 'P'
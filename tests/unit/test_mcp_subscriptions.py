@@ -0,0 +1,86 @@
+"""Tests unitaires pour les abonnements aux ressources."""
+
+import time
+import threading
+
+from src.mcp.subscriptions import SubscriptionManager
+
+
+def _wait(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return predicate()
+
+
+class TestSubscriptionManager:
+    """Tests pour SubscriptionManager."""
+
+    def test_one_poll_per_project(self):
+        """Test un seul sondage par projet et par intervalle, quel que soit le nombre d'abonnés."""
+        polled = []
+        manager = SubscriptionManager(poll=polled.append, interval=0.05)
+        try:
+            for i in range(10):
+                manager.subscribe('sonarqube://project/A', 'A', lambda m, i=i: None)
+            manager.subscribe('sonarqube://project/B', 'B', lambda m: None)
+
+            assert _wait(lambda: len(polled) >= 6)
+            assert abs(polled.count('A') - polled.count('B')) <= 1
+            assert manager.stats()['subscribers'] == 11
+        finally:
+            manager.shutdown()
+
+    def test_notify_project_subscribers_only(self):
+        """Test notification envoyée aux seuls abonnés des ressources du projet."""
+        manager = SubscriptionManager(poll=lambda key: None, interval=60)
+        received_a, received_b = [], []
+        try:
+            manager.subscribe('sonarqube://project/A', 'A', received_a.append)
+            manager.subscribe('sonarqube://project/B', 'B', received_b.append)
+
+            manager.notify_project('A')
+
+            assert received_a == [{
+                'jsonrpc': '2.0', 'method': 'notifications/resources/updated',
+                'params': {'uri': 'sonarqube://project/A'}
+            }]
+            assert received_b == []
+        finally:
+            manager.shutdown()
+
+    def test_failed_sink_removed(self):
+        """Test abonné en échec retiré ; projet sans abonné plus sondé."""
+        manager = SubscriptionManager(poll=lambda key: None, interval=60)
+
+        def closed(message):
+            raise ConnectionError("Session fermée")
+
+        try:
+            manager.subscribe('sonarqube://project/A', 'A', closed)
+            manager.notify_project('A')
+
+            assert manager.stats() == {
+                'resources': 0, 'subscribers': 0, 'projects': 0,
+                'polls': manager.polls, 'poll_errors': 0, 'notifications': 0
+            }
+        finally:
+            manager.shutdown()
+
+    def test_unsubscribe_stops_polling(self):
+        """Test désabonnement : le projet n'est plus sondé."""
+        polled = []
+        first_poll = threading.Event()
+        manager = SubscriptionManager(poll=lambda key: (polled.append(key), first_poll.set()), interval=0.02)
+        sink = lambda m: None  # noqa: E731
+        try:
+            manager.subscribe('sonarqube://project/A', 'A', sink)
+            assert first_poll.wait(2)
+            assert manager.unsubscribe('sonarqube://project/A', sink)
+            count = len(polled)
+            time.sleep(0.1)
+
+            assert len(polled) <= count + 1
+            assert not manager.unsubscribe('sonarqube://project/A', sink)
+        finally:
+            manager.shutdown()